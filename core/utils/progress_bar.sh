@@ -8,6 +8,11 @@
 # =============================================================================
 # Usage: source progress_bar.sh puis utiliser les fonctions
 # Compatible: ZSH, Bash, Fish (via sh), POSIX sh
+#
+# Mode démon (DOTFILES_PROGRESS_DAEMON=1, terminal interactif, python3) :
+# progress_init lance progress_daemon.py sur un tube nommé ; progress_update
+# n'écrit plus qu'un enregistrement par printf (builtin), sans fork.
+# Horloge, calculs et rendu sont faits par ce seul processus Python.
 # =============================================================================
 
 # Variables globales pour la progression
@@ -17,6 +22,60 @@ PROGRESS_COMPLETED=0
 PROGRESS_SUCCESSFUL=0
 PROGRESS_FAILED=0
 PROGRESS_DESCRIPTION="Traitement"
+# PID du démon de rendu (vide : rendu shell)
+PROGRESS_DAEMON_PID=""
+# Descripteur d'écriture vers le démon (un seul chiffre, pour exec N<>)
+PROGRESS_DAEMON_FD=${PROGRESS_DAEMON_FD:-9}
+
+# =============================================================================
+# Démarrer le démon de rendu Python (interne)
+# =============================================================================
+# Retourne 1 si le mode démon n'est pas demandé ou pas disponible
+# =============================================================================
+_progress_daemon_start() {
+    [ "${DOTFILES_PROGRESS_DAEMON:-0}" = "1" ] || return 1
+    [ -t 1 ] && [ "${DOTFILES_PROGRESS_PLAIN:-0}" != "1" ] || return 1
+    command -v python3 >/dev/null 2>&1 || return 1
+    _progress_script="${PROGRESS_DAEMON_SCRIPT:-${DOTFILES_DIR:-$HOME/dotfiles}/core/utils/progress_daemon.py}"
+    [ -f "$_progress_script" ] || return 1
+
+    # Répertoire privé et unique : $$ reste le PID du shell parent dans
+    # un sous-shell, deux barres lancées en parallèle partageraient le tube
+    _progress_fifo_dir=$(mktemp -d "${TMPDIR:-/tmp}/progress_bar.XXXXXX" 2>/dev/null) || return 1
+    _progress_fifo="$_progress_fifo_dir/fifo"
+    if ! mkfifo -m 600 "$_progress_fifo" 2>/dev/null; then
+        rmdir "$_progress_fifo_dir" 2>/dev/null
+        return 1
+    fi
+    # Pas de notification de tâche de fond dans un shell interactif
+    _progress_monitor=0
+    case $- in *m*) _progress_monitor=1; set +m ;; esac
+    # Lecture-écriture : l'ouverture ne bloque pas, et une écriture ne tue
+    # pas le shell (SIGPIPE) si le démon s'est arrêté. Ouvert avant le
+    # lancement et transmis en entrée standard : le tube existe dès la
+    # première écriture, quel que soit le temps de démarrage de Python.
+    eval "exec ${PROGRESS_DAEMON_FD}<>\"\$_progress_fifo\""
+    eval "python3 \"\$_progress_script\" \"\$_progress_fifo\" \"\$PROGRESS_TOTAL\" \"\$PROGRESS_DESCRIPTION\" <&${PROGRESS_DAEMON_FD} ${PROGRESS_DAEMON_FD}>&- &"
+    PROGRESS_DAEMON_PID=$!
+    [ "$_progress_monitor" = "1" ] && set -m
+    return 0
+}
+
+# =============================================================================
+# Arrêter le démon de rendu (interne)
+# =============================================================================
+# Usage: _progress_daemon_stop SHOW_SUMMARY(1/0)
+# =============================================================================
+_progress_daemon_stop() {
+    [ -n "$PROGRESS_DAEMON_PID" ] || return 0
+    printf 'f %s\n' "${1:-1}" >&"$PROGRESS_DAEMON_FD"
+    eval "exec ${PROGRESS_DAEMON_FD}>&-"
+    wait "$PROGRESS_DAEMON_PID" 2>/dev/null
+    # Tube resté en place si le démon n'a pas démarré
+    rm -f "$_progress_fifo"
+    rmdir "$_progress_fifo_dir" 2>/dev/null
+    PROGRESS_DAEMON_PID=""
+}
 
 # =============================================================================
 # Initialiser la progression
@@ -27,12 +86,15 @@ PROGRESS_DESCRIPTION="Traitement"
 #   DESCRIPTION: Description du traitement (optionnel)
 # =============================================================================
 progress_init() {
+    _progress_daemon_stop 0
     PROGRESS_TOTAL=${1:-0}
     PROGRESS_DESCRIPTION=${2:-"Traitement"}
     PROGRESS_START_TIME=$(date +%s 2>/dev/null || echo 0)
     PROGRESS_COMPLETED=0
     PROGRESS_SUCCESSFUL=0
     PROGRESS_FAILED=0
+    _progress_daemon_start
+    return 0
 }
 
 # =============================================================================
@@ -48,6 +110,12 @@ progress_update() {
     PROGRESS_COMPLETED=${1:-0}
     PROGRESS_SUCCESSFUL=${2:-$PROGRESS_COMPLETED}
     PROGRESS_FAILED=${3:-0}
+
+    # Mode démon : un seul printf (builtin), le rendu est fait par Python
+    if [ -n "$PROGRESS_DAEMON_PID" ]; then
+        printf 'u %d %d %d\n' "$PROGRESS_COMPLETED" "$PROGRESS_SUCCESSFUL" "$PROGRESS_FAILED" >&"$PROGRESS_DAEMON_FD"
+        return 0
+    fi
     
     # Calculer le pourcentage
     if [ "$PROGRESS_TOTAL" -eq 0 ]; then
@@ -95,16 +163,16 @@ progress_update() {
         FILLED=0
     fi
     
-    # Construire la barre
+    # Construire la barre (compteur préfixé : ne pas écraser le « i » de l'appelant)
     BAR=""
-    i=1
-    while [ "$i" -le "$BAR_LENGTH" ]; do
-        if [ "$i" -le "$FILLED" ]; then
+    _progress_i=1
+    while [ "$_progress_i" -le "$BAR_LENGTH" ]; do
+        if [ "$_progress_i" -le "$FILLED" ]; then
             BAR="${BAR}█"
         else
             BAR="${BAR}░"
         fi
-        i=$((i + 1))
+        _progress_i=$((_progress_i + 1))
     done
     
     # Statistiques
@@ -156,6 +224,15 @@ progress_increment() {
 # =============================================================================
 progress_finish() {
     local show_summary=${1:-true}
+
+    # Mode démon : rendu final et résumé par le démon
+    if [ -n "$PROGRESS_DAEMON_PID" ]; then
+        case "$show_summary" in
+            true|1|yes) _progress_daemon_stop 1 ;;
+            *) _progress_daemon_stop 0 ;;
+        esac
+        return 0
+    fi
     
     # Afficher la progression finale
     progress_update "$PROGRESS_COMPLETED" "$PROGRESS_SUCCESSFUL" "$PROGRESS_FAILED"
@@ -204,6 +281,7 @@ progress_finish() {
 # Usage: progress_reset
 # =============================================================================
 progress_reset() {
+    _progress_daemon_stop 0
     PROGRESS_START_TIME=0
     PROGRESS_TOTAL=0
     PROGRESS_COMPLETED=0
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# =============================================================================
+# PROGRESS_DAEMON - Rendu de progress_bar.sh dans un processus Python unique
+# =============================================================================
+# Description: Lit les mises à jour de la barre shell depuis un tube nommé
+# Author: Paul Delhomme
+# Version: 1.0
+# =============================================================================
+"""
+Processus de rendu de la barre de progression shell (mode démon)
+
+progress_init (progress_bar.sh, DOTFILES_PROGRESS_DAEMON=1) lance ce script
+sur un tube nommé ; progress_update n'y écrit qu'un enregistrement par
+printf (builtin), sans fork. Horloge, temps restant et dessin sont faits ici,
+par un BackgroundProgressBar.
+
+Enregistrements (une ligne chacun, champs séparés par des espaces) :
+    u COMPLETED SUCCESSFUL FAILED   mise à jour absolue
+    f SHOW_SUMMARY                  fin (SHOW_SUMMARY : 1/0), puis sortie
+
+La fin du tube (shell terminé sans progress_finish) termine aussi la barre,
+sans résumé.
+
+Usage: progress_daemon.py FIFO TOTAL [DESCRIPTION] <&FD_DU_TUBE
+"""
+
+import os
+import signal
+import sys
+
+def main(argv):
+    if len(argv) < 3:
+        sys.stderr.write("Usage: progress_daemon.py FIFO TOTAL [DESCRIPTION]\n")
+        return 2
+    fifo, total = argv[1], argv[2]
+    description = argv[3] if len(argv) > 3 else "Traitement"
+
+    # Ctrl-C est traité par le shell : sa sortie ferme le tube, ce qui termine la barre
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # L'entrée standard est le tube, ouvert en lecture-écriture par le shell
+    # avant le lancement : rien n'est perdu même si le shell a déjà tout écrit
+    # et refermé son extrémité. On le rouvre en lecture seule (sinon la fin
+    # du tube ne serait jamais vue) puis on lâche l'entrée héritée.
+    stream = open(fifo, "rb", buffering=65536)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    try:
+        os.unlink(fifo)
+    except OSError:
+        pass
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from progress_utils import BackgroundProgressBar
+
+    try:
+        total = int(total)
+    except ValueError:
+        total = 0
+    bar = BackgroundProgressBar(total, description).start()
+    show_summary = False
+    with stream:
+        for line in stream:
+            fields = line.split()
+            if not fields:
+                continue
+            kind = fields[0]
+            try:
+                if kind == b"u":
+                    completed = int(fields[1])
+                    successful = int(fields[2]) if len(fields) > 2 else completed
+                    failed = int(fields[3]) if len(fields) > 3 else 0
+                    bar.update(completed, successful, failed)
+                elif kind == b"f":
+                    show_summary = fields[1:2] != [b"0"]
+                    break
+            except (ValueError, IndexError):
+                # Enregistrement mal formé : ignoré
+                continue
+    bar.finish(show_summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -16,23 +16,229 @@ Usage:
     for i in range(100):
         progress.increment(successful=True)
     progress.finish()
+
+    # Itérateur instrumenté : débit, latence p50/p95 et résumé en fin de boucle
+    for path in track(paths, description="Analyse", size=os.path.getsize):
+        analyze(path)
+
+    # Rendu dans un thread dédié : increment() ne fait aucune E/S
+    with BackgroundProgressBar(100, "Traitement") as progress:
+        for i in range(100):
+            progress.increment(successful=True)
+
+    # Compteurs partagés entre threads, processus et tâches asyncio
+    with SharedProgressBar(len(items), "Installation") as progress:
+        with ProcessPoolExecutor(initializer=init_progress_worker,
+                                 initargs=(progress.counters,)) as pool:
+            list(pool.map(install, items))   # install() appelle progress_increment()
+
+    # Plusieurs barres empilées (téléchargements parallèles) + total
+    with ProgressGroup("Téléchargements") as group:
+        task = group.add_task(len(chunks), "archive.tar.gz")
+        task.increment()
 """
 
+import json
+import math
+import os
+import random
+import shutil
 import sys
+import threading
 import time
+import unicodedata
+import weakref
 from datetime import timedelta
 from typing import Optional
 
+def format_duration(seconds: float) -> str:
+    """Formate une durée comme str(timedelta(seconds=int(seconds))), sans créer de timedelta."""
+    seconds = int(seconds)
+    if seconds < 0 or seconds >= 86400:
+        return str(timedelta(seconds=seconds))
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+# =============================================================================
+# Mode machine : événements JSON-lines (logs, CI, supervision)
+# =============================================================================
+# PROGRESS_MODE=auto|text|json (auto : json si la sortie n'est pas un terminal)
+MODE_ENV = "PROGRESS_MODE"
+# Descripteur de fichier des événements (défaut : sortie standard)
+FD_ENV = "PROGRESS_FD"
+# Intervalle minimal entre deux événements "progress", en secondes
+JSON_INTERVAL_ENV = "PROGRESS_JSON_INTERVAL"
+DEFAULT_JSON_INTERVAL = 1.0
+
+def resolve_mode(mode: Optional[str] = None) -> str:
+    """'text' ou 'json' selon mode, puis $PROGRESS_MODE, puis sys.stdout.isatty()."""
+    mode = (mode or os.environ.get(MODE_ENV) or "auto").lower()
+    if mode in ("text", "json"):
+        return mode
+    try:
+        return "text" if sys.stdout.isatty() else "json"
+    except (AttributeError, ValueError):
+        return "json"
+
+class EventWriter:
+    """Écrit des événements JSON (un par ligne) sur un descripteur ou un flux, avec limite de débit."""
+    
+    __slots__ = ("fd", "interval", "stream", "_last")
+    
+    def __init__(self, fd: Optional[int] = None, interval: Optional[float] = None, stream=None):
+        if fd is None and os.environ.get(FD_ENV, "").isdigit():
+            fd = int(os.environ[FD_ENV])
+        if interval is None:
+            try:
+                interval = float(os.environ.get(JSON_INTERVAL_ENV, DEFAULT_JSON_INTERVAL))
+            except ValueError:
+                interval = DEFAULT_JSON_INTERVAL
+        self.fd = fd
+        self.interval = interval
+        # Flux utilisé sans descripteur (défaut : sys.stdout au moment de l'écriture)
+        self.stream = stream
+        self._last = None
+    
+    def write(self, event: dict):
+        event["ts"] = round(time.time(), 3)
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        if self.fd is None:
+            stream = self.stream or sys.stdout
+            stream.write(line)
+            stream.flush()
+        else:
+            os.write(self.fd, line.encode("utf-8"))
+    
+    def progress(self, event: dict, force: bool = False) -> bool:
+        """Écrit un événement "progress" si l'intervalle est écoulé (ou force) ; True si écrit."""
+        now = time.monotonic()
+        if not force and self._last is not None and now - self._last < self.interval:
+            return False
+        self._last = now
+        self.write(event)
+        return True
+
+def _rounded(value, digits=3):
+    return None if value is None else round(value, digits)
+
+def format_bytes(size: float) -> str:
+    """Taille lisible en unités binaires françaises (o, Ko, Mo, Go, To)."""
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} To"
+
+class RateMeter:
+    """
+    Débit lissé (éléments/s et octets/s) par moyenne mobile exponentielle.
+    
+    Mis à jour à chaque affichage, pas à chaque élément : le poids d'un
+    échantillon dépend du temps écoulé depuis le précédent (constante tau).
+    """
+    
+    __slots__ = ("tau", "rate", "byte_rate", "peak", "peak_bytes", "_last_time", "_last_count", "_last_bytes")
+    
+    # Échantillons plus rapprochés ignorés (débit instantané trop bruité)
+    MIN_SAMPLE = 0.05
+    
+    def __init__(self, tau: float = 3.0, now: Optional[float] = None):
+        self.tau = tau
+        self.rate = None
+        self.byte_rate = None
+        self.peak = 0.0
+        self.peak_bytes = 0.0
+        self._last_time = time.monotonic() if now is None else now
+        self._last_count = 0
+        self._last_bytes = 0
+    
+    def update(self, count: int, nbytes: int = 0, now: Optional[float] = None):
+        """Ajoute un échantillon à partir des totaux cumulés (éléments, octets)."""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_time
+        if elapsed < self.MIN_SAMPLE:
+            return
+        rate = (count - self._last_count) / elapsed
+        byte_rate = (nbytes - self._last_bytes) / elapsed
+        if self.rate is None:
+            self.rate, self.byte_rate = rate, byte_rate
+        else:
+            alpha = 1.0 - math.exp(-elapsed / self.tau)
+            self.rate += alpha * (rate - self.rate)
+            self.byte_rate += alpha * (byte_rate - self.byte_rate)
+        self.peak = max(self.peak, self.rate)
+        self.peak_bytes = max(self.peak_bytes, self.byte_rate)
+        self._last_time, self._last_count, self._last_bytes = now, count, nbytes
+    
+    def eta(self, remaining: int) -> Optional[float]:
+        """Temps restant au débit lissé ; None tant qu'il n'est pas connu."""
+        if not self.rate or self.rate <= 0:
+            return None
+        return remaining / self.rate
+
+class LatencySampler:
+    """Échantillon uniforme (réservoir, taille fixe) des durées par élément, pour p50/p95."""
+    
+    __slots__ = ("size", "count", "samples", "_random")
+    
+    def __init__(self, size: int = 2048):
+        self.size = size
+        self.count = 0
+        self.samples = []
+        self._random = random.Random(0)
+    
+    def add(self, seconds: float):
+        self.count += 1
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            index = self._random.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = seconds
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Percentile (rang le plus proche) ; None sans échantillon."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+def format_latency(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
 class ProgressBar:
     """Classe pour afficher une barre de progression avec statistiques et temps."""
     
-    def __init__(self, total: int, description: str = "Traitement"):
+    # Attributs fixes : accès plus rapides et pas de __dict__ par instance
+    __slots__ = (
+        "total", "description", "start_time", "completed", "successful", "failed",
+        "bar_length", "last_print_time", "print_interval",
+        "_start", "_countdown", "_check_every", "_last_check", "_bars", "_bars_length",
+        "processed_bytes", "meter", "latencies", "mode", "_events",
+    )
+    
+    # Bornes du nombre d'incréments entre deux lectures de l'horloge
+    MIN_CHECK_EVERY = 1
+    MAX_CHECK_EVERY = 65536
+    # L'horloge est lue environ 4 fois par intervalle d'affichage
+    CHECKS_PER_INTERVAL = 4
+    
+    def __init__(self, total: int, description: str = "Traitement", mode: Optional[str] = None,
+                 event_fd: Optional[int] = None):
         """
         Initialise la barre de progression.
         
         Args:
             total: Nombre total d'éléments à traiter
             description: Description du traitement (optionnel)
+            mode: 'text', 'json' ou 'auto' (défaut: $PROGRESS_MODE, sinon auto)
+            event_fd: Descripteur des événements JSON (défaut: $PROGRESS_FD, sinon stdout)
         """
         self.total = total
         self.description = description
@@ -41,8 +247,23 @@ class ProgressBar:
         self.successful = 0
         self.failed = 0
         self.bar_length = 40
-        self.last_print_time = time.time()
         self.print_interval = 0.3  # Afficher toutes les 0.3 secondes minimum
+        # Horloge monotone pour les intervalles et le temps écoulé
+        self._start = time.monotonic()
+        self.last_print_time = self._start
+        self._last_check = self._start
+        # Lecture de l'horloge tous les _check_every incréments (ajusté au débit observé)
+        self._check_every = self.MIN_CHECK_EVERY
+        self._countdown = self.MIN_CHECK_EVERY
+        self._bars = None
+        self._bars_length = 0
+        # Instrumentation : octets traités, débit lissé, latences (record_latency / track)
+        self.processed_bytes = 0
+        self.meter = RateMeter(now=self._start)
+        self.latencies = None
+        # Mode machine : événements JSON-lines au lieu de la barre
+        self.mode = resolve_mode(mode)
+        self._events = EventWriter(event_fd) if self.mode == "json" else None
         
     def update(self, completed: int, successful: Optional[int] = None, failed: Optional[int] = None, force: bool = False):
         """
@@ -68,63 +289,156 @@ class ProgressBar:
             self.failed = 0
         
         # Afficher seulement si l'intervalle est atteint ou si on force
-        current_time = time.time()
-        if force or (current_time - self.last_print_time >= self.print_interval) or (completed == self.total):
+        if force or completed == self.total:
             self._print_progress()
-            self.last_print_time = current_time
+            self.last_print_time = time.monotonic()
+            return
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._check_clock()
     
-    def increment(self, successful: bool = True, count: int = 1):
+    def increment(self, successful: bool = True, count: int = 1, size: int = 0):
         """
         Incrémente la progression.
         
+        Chemin rapide : l'horloge n'est lue que tous les _check_every appels,
+        nombre ajusté au débit pour rester proche de print_interval.
+        
         Args:
             successful: True si réussi, False si échoué
             count: Nombre d'éléments à incrémenter (défaut: 1)
+            size: Octets traités par ces éléments (débit en octets/s)
         """
         self.completed += count
         if successful:
             self.successful += count
         else:
             self.failed += count
+        if size:
+            self.processed_bytes += size
+        
+        self._countdown -= 1
+        if self._countdown <= 0 or self.completed == self.total:
+            self._check_clock()
+    
+    def _check_clock(self):
+        """Lit l'horloge, affiche si l'intervalle est atteint et ajuste _check_every."""
+        now = time.monotonic()
+        calls = self._check_every
+        elapsed = now - self._last_check
+        self._last_check = now
         
-        # Afficher seulement si l'intervalle est atteint
-        current_time = time.time()
-        if (current_time - self.last_print_time >= self.print_interval) or (self.completed == self.total):
+        # Viser CHECKS_PER_INTERVAL lectures par intervalle d'affichage ; la
+        # hausse est limitée à x2 par lecture (un début rapide ne doit pas
+        # masquer un ralentissement), la baisse est immédiate
+        target = self.print_interval / self.CHECKS_PER_INTERVAL
+        if elapsed > 0:
+            calls = min(calls * 2, int(calls * target / elapsed))
+        else:
+            calls *= 2
+        calls = max(self.MIN_CHECK_EVERY, min(self.MAX_CHECK_EVERY, calls))
+        self._check_every = calls
+        self._countdown = calls
+        
+        if (now - self.last_print_time >= self.print_interval) or (self.completed == self.total):
             self._print_progress()
-            self.last_print_time = current_time
+            self.last_print_time = now
+    
+    def record_latency(self, seconds: float):
+        """Enregistre la durée de traitement d'un élément (percentiles du résumé)."""
+        if self.latencies is None:
+            self.latencies = LatencySampler()
+        self.latencies.add(seconds)
+    
+    def _bar(self, filled: int) -> str:
+        # Segments de barre pré-calculés (recalculés si bar_length change)
+        if self._bars_length != self.bar_length or self._bars is None:
+            length = self.bar_length
+            self._bars = ['█' * i + '░' * (length - i) for i in range(length + 1)]
+            self._bars_length = length
+        return self._bars[filled]
+    
+    def _event(self, kind: str) -> dict:
+        """Événement JSON décrivant l'état courant (kind : 'progress' ou 'summary')."""
+        now = time.monotonic()
+        elapsed = now - self._start
+        meter = self.meter
+        meter.update(self.completed, self.processed_bytes, now)
+        remaining = max(0, self.total - self.completed)
+        eta = meter.eta(remaining)
+        if eta is None and self.completed > 0:
+            eta = elapsed / self.completed * remaining
+        event = {
+            "event": kind,
+            "description": self.description,
+            "completed": self.completed,
+            "total": self.total,
+            "successful": self.successful,
+            "failed": self.failed,
+            "elapsed": _rounded(elapsed),
+            "rate": _rounded(meter.rate),
+            "eta": _rounded(eta) if kind == "progress" else None,
+        }
+        if self.processed_bytes:
+            event["bytes"] = self.processed_bytes
+            event["byte_rate"] = _rounded(meter.byte_rate)
+        if kind == "summary":
+            del event["eta"]
+            average = self.completed / elapsed if elapsed > 0 else None
+            event["average_rate"] = _rounded(average)
+            event["peak_rate"] = _rounded(max(meter.peak, average or 0.0))
+            if self.latencies is not None and self.latencies.count:
+                event["latency_p50"] = _rounded(self.latencies.percentile(50), 6)
+                event["latency_p95"] = _rounded(self.latencies.percentile(95), 6)
+        return event
     
     def _print_progress(self):
         """Affiche la barre de progression."""
+        if self._events is not None:
+            self._events.progress(self._event("progress"))
+            return
         if self.total == 0:
             percentage = 0
+            filled = 0
         else:
             percentage = (self.completed / self.total) * 100
-        
-        # Créer la barre
-        filled = int(self.bar_length * self.completed / self.total)
+            # Créer la barre
+            filled = int(self.bar_length * self.completed / self.total)
         if filled > self.bar_length:
             filled = self.bar_length
-        bar = '█' * filled + '░' * (self.bar_length - filled)
+        elif filled < 0:
+            filled = 0
+        bar = self._bar(filled)
         
         # Calculer le temps écoulé
-        elapsed_time = time.time() - self.start_time
-        elapsed_str = str(timedelta(seconds=int(elapsed_time)))
+        now = time.monotonic()
+        elapsed_time = now - self._start
+        elapsed_str = format_duration(elapsed_time)
+        meter = self.meter
+        meter.update(self.completed, self.processed_bytes, now)
         
-        # Estimation du temps restant
+        # Estimation du temps restant : débit lissé, sinon moyenne depuis le début
         if self.completed > 0:
-            avg_time_per_item = elapsed_time / self.completed
-            remaining = self.total - self.completed
-            estimated_remaining = avg_time_per_item * remaining
-            eta = str(timedelta(seconds=int(estimated_remaining)))
+            remaining = max(0, self.total - self.completed)
+            estimated_remaining = meter.eta(remaining)
+            if estimated_remaining is None:
+                estimated_remaining = elapsed_time / self.completed * remaining
+            eta = format_duration(estimated_remaining)
             time_info = f"⏱️  {elapsed_str} écoulé | ~{eta} restant"
         else:
             time_info = "⏱️  Calcul en cours..."
         
         # Statistiques
         stats = f"✅ {self.successful} | ❌ {self.failed}"
+        if meter.rate is not None:
+            stats += f" | ⚡ {meter.rate:.1f}/s"
+            if self.processed_bytes:
+                stats += f" {format_bytes(meter.byte_rate)}/s"
         
         # Afficher la barre de progression (retour chariot pour écraser la ligne précédente)
-        sys.stdout.write(f"\r[{self.completed}/{self.total}] {percentage:.1f}% |{bar}| {stats} | {time_info}")
+        # Total inconnu (track sur un générateur) : « ? »
+        total = self.total if self.total else "?"
+        sys.stdout.write(f"\r[{self.completed}/{total}] {percentage:.1f}% |{bar}| {stats} | {time_info}")
         sys.stdout.flush()
     
     def finish(self, show_summary: bool = True):
@@ -134,6 +448,11 @@ class ProgressBar:
         Args:
             show_summary: Afficher le résumé final (défaut: True)
         """
+        if self._events is not None:
+            # Mode machine : l'événement "summary" clôt le flux
+            self._events.write(self._event("summary"))
+            return
+        
         # Afficher la progression finale
         self._print_progress()
         print()  # Nouvelle ligne après la barre de progression
@@ -143,8 +462,8 @@ class ProgressBar:
     
     def _print_summary(self):
         """Affiche le résumé final."""
-        total_time = time.time() - self.start_time
-        total_time_str = str(timedelta(seconds=int(total_time)))
+        total_time = time.monotonic() - self._start
+        total_time_str = format_duration(total_time)
         
         print(f"\n{'='*60}")
         print(f"📊 RÉSUMÉ - {self.description}")
@@ -160,11 +479,784 @@ class ProgressBar:
             print(f"✅ Réussis: {self.successful}")
             print(f"❌ Échoués: {self.failed}")
         
+        # Débit moyen et pic (débit lissé le plus haut observé)
+        if total_time > 0 and self.completed > 0:
+            average = self.completed / total_time
+            print(f"⚡ Débit: {average:.1f} éléments/s en moyenne | pic {max(self.meter.peak, average):.1f}/s")
+            if self.processed_bytes:
+                average_bytes = self.processed_bytes / total_time
+                print(f"📦 Volume: {format_bytes(self.processed_bytes)} | "
+                      f"{format_bytes(average_bytes)}/s en moyenne | "
+                      f"pic {format_bytes(max(self.meter.peak_bytes, average_bytes))}/s")
+        if self.latencies is not None and self.latencies.count:
+            print(f"⏱️  Latence par élément: p50 {format_latency(self.latencies.percentile(50))} | "
+                  f"p95 {format_latency(self.latencies.percentile(95))}")
+        
         print(f"{'='*60}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Rendu final et résumé garantis, y compris sur exception (non masquée)
+        self.finish()
+        return False
+
+class BackgroundProgressBar(ProgressBar):
+    """
+    Barre de progression redessinée par un thread dédié.
+    
+    increment() se limite à des additions d'entiers : un terminal lent ou une
+    sortie bloquée ne ralentit plus la boucle de travail. Le thread relit les
+    compteurs toutes les refresh_interval secondes et redessine la barre.
+    
+    Les compteurs ne sont pas protégés par un verrou : un seul thread doit
+    appeler increment()/update().
+    """
+    
+    __slots__ = ("refresh_interval", "_thread", "_stop_event", "_render_lock")
+    
+    def __init__(self, total: int, description: str = "Traitement", refresh_interval: Optional[float] = None,
+                 mode: Optional[str] = None, event_fd: Optional[int] = None):
+        """
+        Args:
+            total: Nombre total d'éléments à traiter
+            description: Description du traitement (optionnel)
+            refresh_interval: Période de rafraîchissement en secondes (défaut: print_interval)
+            mode, event_fd: Voir ProgressBar
+        """
+        super().__init__(total, description, mode, event_fd)
+        self.refresh_interval = self.print_interval if refresh_interval is None else refresh_interval
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._render_lock = threading.Lock()
+    
+    def start(self):
+        """Démarre le thread de rendu (appelé par __enter__)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="progress-render", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        """Arrête le thread de rendu sans dessin final."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self._render()
+            except (OSError, ValueError):
+                # Sortie fermée ou inutilisable : arrêter de dessiner
+                return
+    
+    def _render(self):
+        with self._render_lock:
+            self._print_progress()
+            self.last_print_time = time.monotonic()
+    
+    def update(self, completed: int, successful: Optional[int] = None, failed: Optional[int] = None, force: bool = False):
+        """Met à jour les compteurs ; force dessine immédiatement (sinon au prochain tic)."""
+        self.completed = completed
+        if successful is not None:
+            self.successful = successful
+        if failed is not None:
+            self.failed = failed
+        if successful is None and failed is None:
+            self.successful = completed
+            self.failed = 0
+        if force:
+            self._render()
+    
+    def increment(self, successful: bool = True, count: int = 1, size: int = 0):
+        """Incrémente les compteurs, sans lecture d'horloge ni affichage."""
+        self.completed += count
+        if successful:
+            self.successful += count
+        else:
+            self.failed += count
+        if size:
+            self.processed_bytes += size
+    
+    def finish(self, show_summary: bool = True):
+        """Arrête le thread puis dessine l'état final (et le résumé)."""
+        self.stop()
+        with self._render_lock:
+            super().finish(show_summary)
+    
+    def __enter__(self):
+        return self.start()
+
+def track(iterable, total: Optional[int] = None, description: str = "Traitement",
+          size=None, show_summary: bool = True, mode: Optional[str] = None):
+    """
+    Itère sur iterable en affichant une ProgressBar, et mesure au passage
+    débit lissé, latence par élément (p50/p95) et octets/s si size est donné.
+    
+    Args:
+        iterable: Éléments à parcourir
+        total: Nombre d'éléments (défaut: len(iterable) si disponible, sinon 0)
+        description: Description du traitement
+        size: Fonction élément -> octets (ex. len, os.path.getsize), optionnelle
+        show_summary: Afficher le résumé en fin de boucle (défaut: True)
+        mode: 'text', 'json' ou 'auto' (voir ProgressBar)
+    
+    La latence d'un élément couvre sa production et son traitement par le
+    corps de la boucle. Le résumé est affiché même si la boucle est
+    interrompue (break, exception).
+    """
+    if total is None:
+        try:
+            total = len(iterable)
+        except TypeError:
+            total = 0
+    bar = ProgressBar(total, description, mode)
+    clock = time.perf_counter
+    record = bar.record_latency
+    increment = bar.increment
+    try:
+        last = clock()
+        for item in iterable:
+            yield item
+            now = clock()
+            record(now - last)
+            last = now
+            increment(size=size(item) if size is not None else 0)
+    finally:
+        bar.finish(show_summary)
+
+# =============================================================================
+# Compteurs partagés (threads, processus, asyncio)
+# =============================================================================
+# Entiers 64 bits par emplacement, espacés d'une ligne de cache (8 × 8 octets)
+_SLOT_STRIDE = 8
+_COMPLETED, _SUCCESSFUL, _FAILED, _BYTES = 0, 1, 2, 3
+
+# Compteurs vivants dans ce processus (réinitialisés dans un fils après fork)
+_live_counters = weakref.WeakSet()
+
+def _reset_after_fork():
+    for counters in list(_live_counters):
+        counters._forget_locals()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+class LocalCounter:
+    """
+    Compteurs locaux d'un thread (ou d'un processus), reportés par lots dans
+    son emplacement de mémoire partagée.
+    
+    Un emplacement n'a qu'un écrivain : aucun verrou, sauf pour l'emplacement
+    de débordement (0) quand tous les autres sont pris. La taille des lots
+    s'ajuste au débit pour reporter environ toutes les flush_interval secondes.
+    """
+    
+    __slots__ = ("_values", "_base", "_lock", "completed", "successful", "failed", "nbytes",
+                 "flush_interval", "_batch", "_pending", "_last_flush")
+    
+    MAX_BATCH = 65536
+    
+    def __init__(self, values, base, lock=None, flush_interval=0.05):
+        self._values = values
+        self._base = base
+        self._lock = lock
+        self.completed = 0
+        self.successful = 0
+        self.failed = 0
+        self.nbytes = 0
+        self.flush_interval = flush_interval
+        self._batch = 1
+        self._pending = 1
+        self._last_flush = time.monotonic()
+    
+    def increment(self, successful: bool = True, count: int = 1, size: int = 0):
+        self.completed += count
+        if successful:
+            self.successful += count
+        else:
+            self.failed += count
+        if size:
+            self.nbytes += size
+        self._pending -= 1
+        if self._pending <= 0:
+            self._flush_batch()
+    
+    def add(self, completed: int, successful: int, failed: int):
+        """Ajoute des écarts quelconques (éventuellement négatifs) et les reporte aussitôt."""
+        self.completed += completed
+        self.successful += successful
+        self.failed += failed
+        self.flush()
+    
+    def _flush_batch(self):
+        # Même ajustement que ProgressBar._check_clock : hausse x2 au plus, baisse immédiate
+        now = time.monotonic()
+        elapsed = now - self._last_flush
+        self._last_flush = now
+        batch = self._batch
+        if elapsed > 0:
+            batch = min(batch * 2, int(batch * self.flush_interval / elapsed))
+        else:
+            batch *= 2
+        batch = max(1, min(self.MAX_BATCH, batch))
+        self._batch = batch
+        self._pending = batch
+        self.flush()
+    
+    def flush(self):
+        """Reporte les compteurs locaux dans la mémoire partagée."""
+        completed, successful, failed, nbytes = self.completed, self.successful, self.failed, self.nbytes
+        if not (completed or successful or failed or nbytes):
+            return
+        self.completed = self.successful = self.failed = self.nbytes = 0
+        values, base = self._values, self._base
+        if self._lock is None:
+            values[base + _COMPLETED] += completed
+            values[base + _SUCCESSFUL] += successful
+            values[base + _FAILED] += failed
+            values[base + _BYTES] += nbytes
+        else:
+            with self._lock:
+                values[base + _COMPLETED] += completed
+                values[base + _SUCCESSFUL] += successful
+                values[base + _FAILED] += failed
+                values[base + _BYTES] += nbytes
+
+class SharedCounters:
+    """
+    Compteurs (réussis, échoués, complétés) en mémoire partagée.
+    
+    Chaque thread ou processus écrivain reçoit son propre emplacement à son
+    premier incrément ; le lecteur (le thread de rendu) fait la somme des
+    emplacements. L'objet se transmet aux processus du pool au démarrage
+    (initializer/initargs de ProcessPoolExecutor ou multiprocessing.Pool).
+    """
+    
+    def __init__(self, slots: Optional[int] = None, flush_interval: float = 0.05, mp_context=None):
+        """
+        Args:
+            slots: Nombre d'emplacements (défaut: max(64, 4 × CPU))
+            flush_interval: Délai visé entre deux reports d'un compteur local
+            mp_context: Contexte multiprocessing du pool (défaut: contexte par défaut)
+        """
+        # Import local : inutile pour les barres non partagées
+        import multiprocessing
+        
+        if mp_context is None or isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self.slots = slots or max(64, 4 * (os.cpu_count() or 1))
+        self.flush_interval = flush_interval
+        self._values = mp_context.RawArray('q', self.slots * _SLOT_STRIDE)
+        # Prochain emplacement libre (0 : débordement, protégé par _lock)
+        self._next_slot = mp_context.RawValue('i', 1)
+        self._lock = mp_context.Lock()
+        self._init_locals()
+    
+    def _init_locals(self):
+        self._thread_local = threading.local()
+        self._locals = []
+        self._locals_lock = threading.Lock()
+        _live_counters.add(self)
+    
+    def _forget_locals(self):
+        # Fils après fork : ne pas réutiliser les emplacements du parent
+        self._thread_local = threading.local()
+        self._locals = []
+        self._locals_lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Seuls les objets partagés traversent la frontière du processus
+        return (self.slots, self.flush_interval, self._values, self._next_slot, self._lock)
+    
+    def __setstate__(self, state):
+        self.slots, self.flush_interval, self._values, self._next_slot, self._lock = state
+        self._init_locals()
+    
+    def local(self) -> LocalCounter:
+        """Compteur local du thread appelant (créé au premier appel)."""
+        try:
+            return self._thread_local.counter
+        except AttributeError:
+            pass
+        with self._lock:
+            slot = self._next_slot.value
+            if slot < self.slots:
+                self._next_slot.value = slot + 1
+        if slot < self.slots:
+            counter = LocalCounter(self._values, slot * _SLOT_STRIDE, None, self.flush_interval)
+        else:
+            counter = LocalCounter(self._values, 0, self._lock, self.flush_interval)
+        self._thread_local.counter = counter
+        with self._locals_lock:
+            self._locals.append(counter)
+        if multiprocessing_child():
+            # Processus du pool : reporter le reliquat à la sortie du processus
+            from multiprocessing.util import Finalize
+            Finalize(self, counter.flush, exitpriority=10)
+        return counter
+    
+    def flush_all(self):
+        """
+        Reporte les compteurs locaux de tous les threads de ce processus.
+        
+        Sans verrou : à n'appeler qu'une fois les threads écrivains terminés
+        (un incrément concurrent pourrait être perdu).
+        """
+        with self._locals_lock:
+            counters = list(self._locals)
+        for counter in counters:
+            counter.flush()
+    
+    def totals(self):
+        """(complétés, réussis, échoués, octets), somme de tous les emplacements."""
+        used = min(self._next_slot.value, self.slots) * _SLOT_STRIDE
+        values = self._values[:used]
+        return (sum(values[_COMPLETED::_SLOT_STRIDE]),
+                sum(values[_SUCCESSFUL::_SLOT_STRIDE]),
+                sum(values[_FAILED::_SLOT_STRIDE]),
+                sum(values[_BYTES::_SLOT_STRIDE]))
+
+def multiprocessing_child() -> bool:
+    """True dans un processus lancé par multiprocessing (sans l'importer s'il ne l'est pas)."""
+    mp = sys.modules.get("multiprocessing")
+    return mp is not None and mp.parent_process() is not None
+
+# Compteurs du processus courant, fixés par init_progress_worker
+_worker_counters = None
+
+def init_progress_worker(counters: SharedCounters):
+    """initializer des pools de processus : rend progress_increment() utilisable."""
+    global _worker_counters
+    _worker_counters = counters
+
+def progress_increment(successful: bool = True, count: int = 1, size: int = 0):
+    """Incrément depuis un processus du pool (voir init_progress_worker)."""
+    _worker_counters.local().increment(successful, count, size)
+
+class SharedProgressBar(BackgroundProgressBar):
+    """
+    Barre de progression alimentée par plusieurs threads, processus ou
+    tâches asyncio, avec un seul thread de rendu.
+    
+    - threads / asyncio : appeler increment() directement (les tâches d'une
+      même boucle asyncio partagent le compteur local de son thread)
+    - processus : initializer=init_progress_worker, initargs=(bar.counters,)
+      puis progress_increment() dans les tâches ; mp_context doit être celui
+      du pool s'il n'utilise pas le contexte par défaut
+    
+    Les incréments restent locaux et sont reportés par lots : pas de verrou
+    par incrément. Les reliquats sont reportés à la fin de chaque processus du
+    pool et, pour les threads, par finish().
+    """
+    
+    __slots__ = ("counters",)
+    
+    def __init__(self, total: int, description: str = "Traitement", refresh_interval: Optional[float] = None,
+                 slots: Optional[int] = None, mp_context=None, mode: Optional[str] = None,
+                 event_fd: Optional[int] = None):
+        super().__init__(total, description, refresh_interval, mode, event_fd)
+        self.counters = SharedCounters(slots, mp_context=mp_context)
+    
+    def increment(self, successful: bool = True, count: int = 1, size: int = 0):
+        """Incrémente le compteur local du thread appelant."""
+        try:
+            counter = self.counters._thread_local.counter
+        except AttributeError:
+            counter = self.counters.local()
+        counter.increment(successful, count, size)
+    
+    def update(self, completed: int, successful: Optional[int] = None, failed: Optional[int] = None, force: bool = False):
+        """
+        Ramène les totaux aux valeurs données, par un écart reporté dans le
+        compteur du thread appelant. Seul ce compteur est vidé : les incréments
+        pas encore reportés par les autres threads s'ajoutent ensuite aux totaux.
+        """
+        self.counters.local().flush()
+        current_completed, current_successful, current_failed, _bytes = self.counters.totals()
+        if successful is None and failed is None:
+            successful, failed = completed, 0
+        if successful is None:
+            successful = current_successful
+        if failed is None:
+            failed = current_failed
+        self.counters.local().add(completed - current_completed, successful - current_successful,
+                                  failed - current_failed)
+        if force:
+            self._render()
+    
+    def _print_progress(self):
+        self.completed, self.successful, self.failed, self.processed_bytes = self.counters.totals()
+        super()._print_progress()
+    
+    def _event(self, kind: str) -> dict:
+        self.completed, self.successful, self.failed, self.processed_bytes = self.counters.totals()
+        return super()._event(kind)
+    
+    def finish(self, show_summary: bool = True):
+        self.stop()
+        self.counters.flush_all()
+        with self._render_lock:
+            ProgressBar.finish(self, show_summary)
+
+# =============================================================================
+# Barres multiples (tâches concurrentes)
+# =============================================================================
+def display_width(text: str) -> int:
+    """Largeur affichée (caractères larges = 2 colonnes, combinants = 0)."""
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char) or char == '\ufe0f':
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+class ProgressTask:
+    """Tâche d'un ProgressGroup : compteurs seuls, dessinés par le thread du groupe."""
+    
+    __slots__ = ("total", "description", "completed", "successful", "failed", "_done_reported")
+    
+    def __init__(self, total: int, description: str):
+        self.total = total
+        self.description = description
+        self.completed = 0
+        self.successful = 0
+        self.failed = 0
+        self._done_reported = False
+    
+    def increment(self, successful: bool = True, count: int = 1):
+        self.completed += count
+        if successful:
+            self.successful += count
+        else:
+            self.failed += count
+    
+    def update(self, completed: int, successful: Optional[int] = None, failed: Optional[int] = None):
+        self.completed = completed
+        if successful is None and failed is None:
+            successful, failed = completed, 0
+        if successful is not None:
+            self.successful = successful
+        if failed is not None:
+            self.failed = failed
+    
+    @property
+    def done(self) -> bool:
+        return self.completed >= self.total
+
+class ProgressGroup:
+    """
+    Plusieurs barres empilées (une par tâche) et une ligne de total.
+    
+    Sur un terminal, un thread redessine le bloc toutes les refresh_interval
+    secondes en ne réécrivant que les cellules modifiées de chaque ligne
+    changée (déplacements de curseur ANSI). Hors terminal (redirection, CI),
+    aucune séquence ANSI : événements JSON-lines (mode 'json', défaut hors
+    terminal) ou, en mode 'text', une ligne par tâche terminée puis le total.
+    """
+    
+    BAR_LENGTH = 30
+    
+    def __init__(self, description: str = "Total", refresh_interval: float = 0.3, stream=None,
+                 mode: Optional[str] = None, event_fd: Optional[int] = None):
+        """
+        Args:
+            description: Libellé de la ligne de total et du résumé
+            refresh_interval: Période de rafraîchissement en secondes
+            stream: Flux de sortie (défaut: sys.stdout au moment du rendu)
+            mode, event_fd: Voir ProgressBar ('auto' : json si stream n'est pas un terminal)
+        """
+        self.description = description
+        self.refresh_interval = refresh_interval
+        self.tasks = []
+        self.bytes_written = 0
+        self._stream = stream
+        self._start = time.monotonic()
+        self._meter = RateMeter(now=self._start)
+        self._frame = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._bars = ['█' * i + '░' * (self.BAR_LENGTH - i) for i in range(self.BAR_LENGTH + 1)]
+        mode = (mode or os.environ.get(MODE_ENV) or "auto").lower()
+        if mode not in ("text", "json"):
+            mode = "text" if self.is_terminal() else "json"
+        self.mode = mode
+        self._events = EventWriter(event_fd, stream=stream) if mode == "json" else None
+    
+    @property
+    def stream(self):
+        return self._stream or sys.stdout
+    
+    def is_terminal(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+    
+    def add_task(self, total: int, description: str) -> ProgressTask:
+        task = ProgressTask(total, description)
+        with self._lock:
+            self.tasks.append(task)
+        return task
+    
+    def totals(self):
+        """(total, complétés, réussis, échoués) sur l'ensemble des tâches."""
+        tasks = list(self.tasks)
+        return (sum(t.total for t in tasks), sum(t.completed for t in tasks),
+                sum(t.successful for t in tasks), sum(t.failed for t in tasks))
+    
+    def _line(self, label, width, total, completed, successful, failed, suffix=""):
+        percentage = completed / total * 100 if total else 0.0
+        filled = int(self.BAR_LENGTH * completed / total) if total else 0
+        bar = self._bars[max(0, min(self.BAR_LENGTH, filled))]
+        pad = " " * (width - display_width(label))
+        return (f"{label}{pad} [{completed}/{total}] {percentage:5.1f}% |{bar}| "
+                f"✅ {successful} | ❌ {failed}{suffix}")
+    
+    def _fit(self, line, columns):
+        # Une ligne repliée par le terminal fausserait les déplacements de curseur
+        if display_width(line) < columns:
+            return line
+        out = []
+        width = 0
+        for char in line:
+            char_width = display_width(char)
+            if width + char_width >= columns:
+                break
+            out.append(char)
+            width += char_width
+        return "".join(out)
+    
+    def render_frame(self, columns: Optional[int] = None):
+        """Lignes du bloc : une par tâche puis le total."""
+        tasks = list(self.tasks)
+        label_width = max([display_width(t.description) for t in tasks] + [display_width(self.description)])
+        lines = [self._line(t.description, label_width, t.total, t.completed, t.successful, t.failed)
+                 for t in tasks]
+        total, completed, successful, failed = self.totals()
+        now = time.monotonic()
+        elapsed = now - self._start
+        self._meter.update(completed, 0, now)
+        suffix = f" | {format_duration(elapsed)} écoulé"
+        if 0 < completed < total:
+            remaining = self._meter.eta(total - completed)
+            if remaining is None:
+                remaining = elapsed / completed * (total - completed)
+            suffix += f" | ~{format_duration(remaining)} restant"
+        lines.append(self._line(self.description, label_width, total, completed, successful, failed, suffix))
+        if columns:
+            lines = [self._fit(line, columns) for line in lines]
+        return lines
+    
+    def diff_frame(self, previous, lines):
+        """
+        Séquence qui transforme le bloc affiché (previous) en lines. Le curseur
+        est supposé (et laissé) en colonne 0 de la ligne qui suit le bloc.
+        """
+        out = []
+        row = len(previous)
+        for index, line in enumerate(lines):
+            if index < len(previous):
+                old = previous[index]
+                if line == old:
+                    continue
+                if row > index:
+                    out.append(f"\033[{row - index}A")
+                elif row < index:
+                    out.append(f"\033[{index - row}B")
+                row = index
+                out.append(self._line_update(old, line))
+            else:
+                # Nouvelle ligne (tâche ajoutée) : la ligne sous le bloc existe déjà
+                if row < index:
+                    out.append(f"\033[{index - row}B")
+                out.append(f"\r{line}\n")
+                row = index + 1
+        if row < len(lines):
+            out.append(f"\033[{len(lines) - row}B")
+        if out:
+            out.append("\r")
+        return "".join(out)
+    
+    # En deçà de cet écart, réécrire les cellules inchangées coûte moins qu'un déplacement
+    MIN_SKIP = 6
+    
+    def _line_update(self, old, line):
+        """Séquence qui transforme la ligne old (affichée) en line, curseur sur la ligne."""
+        if len(line) == len(old) and display_width(line) == display_width(old):
+            # Même longueur : ne réécrire que les plages modifiées
+            runs = []
+            for position, (new_char, old_char) in enumerate(zip(line, old)):
+                if new_char != old_char:
+                    if runs and position - runs[-1][1] < self.MIN_SKIP:
+                        runs[-1][1] = position + 1
+                    else:
+                        runs.append([position, position + 1])
+            if all(display_width(line[a:b]) == display_width(old[a:b]) for a, b in runs):
+                out = []
+                cursor = None
+                for start, end in runs:
+                    column = display_width(line[:start])
+                    if cursor is None:
+                        out.append(f"\r\033[{column}C" if column else "\r")
+                    elif column > cursor:
+                        out.append(f"\033[{column - cursor}C")
+                    out.append(line[start:end])
+                    cursor = column + display_width(line[start:end])
+                return "".join(out)
+        # Sinon : réécrire à partir du premier caractère modifié
+        prefix = 0
+        limit = min(len(line), len(old))
+        while prefix < limit and line[prefix] == old[prefix]:
+            prefix += 1
+        column = display_width(line[:prefix])
+        out = f"\r\033[{column}C" if column else "\r"
+        out += line[prefix:]
+        if display_width(line) < display_width(old):
+            out += "\033[K"
+        return out
+    
+    def _event(self, kind: str) -> dict:
+        total, completed, successful, failed = self.totals()
+        now = time.monotonic()
+        elapsed = now - self._start
+        self._meter.update(completed, 0, now)
+        event = {
+            "event": kind,
+            "description": self.description,
+            "completed": completed,
+            "total": total,
+            "successful": successful,
+            "failed": failed,
+            "elapsed": _rounded(elapsed),
+            "rate": _rounded(self._meter.rate),
+        }
+        if kind == "progress":
+            eta = self._meter.eta(max(0, total - completed))
+            if eta is None and completed > 0:
+                eta = elapsed / completed * max(0, total - completed)
+            event["eta"] = _rounded(eta)
+        else:
+            event["average_rate"] = _rounded(completed / elapsed) if elapsed > 0 else None
+        event["tasks"] = [
+            {"description": t.description, "completed": t.completed, "total": t.total,
+             "successful": t.successful, "failed": t.failed}
+            for t in list(self.tasks)
+        ]
+        return event
+    
+    def refresh(self):
+        """Redessine le bloc (terminal) ; hors terminal, signale les tâches terminées."""
+        if self._events is not None:
+            with self._lock:
+                self._events.progress(self._event("progress"))
+            return
+        with self._lock:
+            if self.is_terminal():
+                lines = self.render_frame(shutil.get_terminal_size().columns)
+                data = self.diff_frame(self._frame, lines)
+                self._frame = lines
+            else:
+                data = self._log_finished()
+            if data:
+                self.stream.write(data)
+                self.stream.flush()
+                self.bytes_written += len(data.encode('utf-8'))
+    
+    def _log_finished(self):
+        out = []
+        for task in list(self.tasks):
+            if task.done and not task._done_reported:
+                task._done_reported = True
+                out.append(f"✅ {task.description} : {task.completed}/{task.total} "
+                           f"(✅ {task.successful} | ❌ {task.failed})\n")
+        return "".join(out)
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="progress-group", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except (OSError, ValueError):
+                return
+    
+    def finish(self, show_summary: bool = True):
+        """Arrête le rendu, dessine l'état final et le résumé."""
+        self.stop()
+        if self._events is not None:
+            self._events.write(self._event("summary"))
+            return
+        self.refresh()
+        stream = self.stream
+        if not self.is_terminal():
+            total, completed, successful, failed = self.totals()
+            stream.write(f"{self._line(self.description, 0, total, completed, successful, failed)}\n")
+        if show_summary:
+            self._print_summary()
+        stream.flush()
+    
+    def _print_summary(self):
+        total, _completed, successful, failed = self.totals()
+        write = self.stream.write
+        write(f"\n{'='*60}\n")
+        write(f"📊 RÉSUMÉ - {self.description}\n")
+        write(f"{'='*60}\n")
+        write(f"⏱️  Temps total: {format_duration(time.monotonic() - self._start)}\n")
+        if total > 0:
+            write(f"✅ Réussis: {successful} ({successful / total * 100:.1f}%)\n")
+            write(f"❌ Échoués: {failed} ({failed / total * 100:.1f}%)\n")
+        else:
+            write(f"✅ Réussis: {successful}\n")
+            write(f"❌ Échoués: {failed}\n")
+        write(f"{'='*60}\n")
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+        return False
 
 # =============================================================================
 # Fonction standalone pour compatibilité
 # =============================================================================
+# Événements de print_progress (limite de débit partagée entre les appels)
+_standalone_events = None
+# Débit lissé de print_progress, repris à zéro quand completed recule (nouvelle série)
+_standalone_meter = None
+_standalone_completed = 0
+
+def _standalone_eta(completed: int, total: int, elapsed_time: float) -> Optional[float]:
+    """Temps restant au débit lissé, sinon à la moyenne depuis le début."""
+    global _standalone_meter, _standalone_completed
+    now = time.monotonic()
+    if _standalone_meter is None or completed < _standalone_completed:
+        _standalone_meter = RateMeter(now=now - elapsed_time)
+    _standalone_completed = completed
+    _standalone_meter.update(completed, 0, now)
+    if completed <= 0:
+        return None
+    remaining = max(0, total - completed)
+    eta = _standalone_meter.eta(remaining)
+    if eta is None:
+        eta = elapsed_time / completed * remaining
+    return eta
+
 def print_progress(completed: int, total: int, successful: int, failed: int, elapsed_time: float):
     """
     Affiche une barre de progression (fonction standalone pour compatibilité).
@@ -175,26 +1267,42 @@ def print_progress(completed: int, total: int, successful: int, failed: int, ela
         successful: Nombre d'éléments réussis
         failed: Nombre d'éléments échoués
         elapsed_time: Temps écoulé en secondes
+    
+    Hors terminal (ou PROGRESS_MODE=json) : événement JSON "progress", au plus
+    un par PROGRESS_JSON_INTERVAL secondes, sauf le dernier (completed == total).
     """
+    global _standalone_events
+    eta = _standalone_eta(completed, total, elapsed_time)
+    if resolve_mode() == "json":
+        if _standalone_events is None:
+            _standalone_events = EventWriter()
+        _standalone_events.progress({
+            "event": "progress",
+            "completed": completed,
+            "total": total,
+            "successful": successful,
+            "failed": failed,
+            "elapsed": _rounded(elapsed_time),
+            "rate": _rounded(_standalone_meter.rate),
+            "eta": _rounded(eta),
+        }, force=completed >= total)
+        return
+    
     if total == 0:
         percentage = 0
     else:
         percentage = (completed / total) * 100
     
     bar_length = 40
-    filled = int(bar_length * completed / total)
+    filled = int(bar_length * completed / total) if total else 0
     if filled > bar_length:
         filled = bar_length
     bar = '█' * filled + '░' * (bar_length - filled)
     
-    # Estimation du temps restant
-    if completed > 0:
-        avg_time_per_item = elapsed_time / completed
-        remaining = total - completed
-        estimated_remaining = avg_time_per_item * remaining
-        eta = str(timedelta(seconds=int(estimated_remaining)))
+    # Estimation du temps restant (débit lissé)
+    if eta is not None:
         elapsed_str = str(timedelta(seconds=int(elapsed_time)))
-        time_info = f"⏱️  {elapsed_str} écoulé | ~{eta} restant"
+        time_info = f"⏱️  {elapsed_str} écoulé | ~{timedelta(seconds=int(eta))} restant"
     else:
         time_info = "⏱️  Calcul en cours..."
     
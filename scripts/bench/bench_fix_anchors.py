@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de scripts/fix_links.py : appariement indexé vs par paires
+
+Génère (tirage déterministe) un arbre de fichiers Markdown : titres de tous
+niveaux, sommaire en tête et liens « voir aussi » dont une partie des ancres
+est périmée (accents, ponctuation, mots en trop). Compare :
+- l'ancien appariement (chaque lien comparé à chaque titre, titre
+  renormalisé à chaque paire), fichier par fichier
+- fix_text (titres normalisés une fois, index mot → titres), séquentiel
+- run (index global puis tous les fichiers en processus parallèles, --check)
+
+Usage: python3 scripts/bench/bench_fix_anchors.py [--files N] [--headings N] [--links N]
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "scripts"))
+
+from fix_links import fix_text, run  # noqa: E402
+
+WORDS = ("installation configuration réseau sécurité dépôt paquets système git ssh docker "
+         "machine virtuelle sauvegarde restauration thème terminal alias fonctions zsh bash "
+         "fish gestionnaire mise à jour désinstallation journal tests outils éditeur clés").split()
+EMOJIS = ("", "", "🚀 ", "🔧 ", "📦 ")
+LINK_RE = re.compile(r'\[([^\]]+)\]\(#([^\)]+)\)')
+
+def legacy_anchor(text):
+    text = text.lower().replace(' ', '-')
+    text = re.sub(r'[^a-z0-9\-]', '', text)
+    return re.sub(r'-+', '-', text).strip('-')
+
+def legacy_normalize(text):
+    text = re.sub(r'[^a-z0-9\s]', '', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+def legacy_fix(text):
+    """Appariement d'origine (par paires), étendu à tous les niveaux de titre."""
+    headings_map = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            heading = line.lstrip('#').strip()
+            headings_map[heading] = legacy_anchor(heading)
+
+    def replace_link(match):
+        link_text = match.group(1)
+        link_normalized = legacy_normalize(link_text)
+        best_match, best_score = None, 0
+        for heading, correct_anchor in headings_map.items():
+            heading_normalized = legacy_normalize(heading)
+            score = 0
+            if heading_normalized == link_normalized:
+                score = 100
+            elif link_normalized in heading_normalized:
+                ratio = len(link_normalized) / len(heading_normalized) if heading_normalized else 0
+                if ratio >= 0.7:
+                    score = ratio * 90
+            elif heading_normalized in link_normalized:
+                ratio = len(heading_normalized) / len(link_normalized) if link_normalized else 0
+                if ratio >= 0.7:
+                    score = ratio * 90
+            else:
+                link_words = set(link_normalized.split())
+                heading_words = set(heading_normalized.split())
+                if link_words and heading_words:
+                    common_words = link_words & heading_words
+                    if common_words:
+                        score = (len(common_words) / max(len(link_words), len(heading_words))) * 70
+                        if link_words.issubset(heading_words):
+                            score = 85
+            if score > best_score:
+                best_score, best_match = score, correct_anchor
+        if best_match and best_score > 60:
+            return f"[{link_text}](#{best_match})"
+        return f"[{link_text}](#{legacy_anchor(link_text)})"
+
+    return LINK_RE.sub(replace_link, text)
+
+def make_document(rng, headings, links):
+    titles = []
+    for i in range(headings):
+        words = rng.sample(WORDS, rng.randint(2, 5))
+        titles.append(f"{rng.choice(EMOJIS)}{' '.join(words).capitalize()} {i}")
+    lines = ["# Documentation", "", "## Sommaire", ""]
+    for i in range(links):
+        title = rng.choice(titles)
+        anchor = legacy_anchor(title) if rng.random() < 0.5 else f"ancienne-{i}"
+        text = title.split(" ", 1)[1] if title[0] not in "ABCDEFGHIJKLMNOPQRSTUVWXYZÀÉ" else title
+        lines.append(f"- [{text}](#{anchor})")
+    for title in titles:
+        lines += ["", f"{'#' * rng.randint(2, 4)} {title}", "", "Texte de la section.", ""]
+    return "\n".join(lines) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de fix_links.py")
+    parser.add_argument("--files", type=int, default=10, help="fichiers Markdown générés (défaut: 10)")
+    parser.add_argument("--headings", type=int, default=300, help="titres par fichier (défaut: 300)")
+    parser.add_argument("--links", type=int, default=300, help="liens internes par fichier (défaut: 300)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    documents = [make_document(rng, args.headings, args.links) for _ in range(args.files)]
+
+    start = time.perf_counter()
+    for text in documents:
+        legacy_fix(text)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fixed = unresolved = 0
+    for text in documents:
+        _content, n_fixed, missing, _deps = fix_text(text)
+        fixed += n_fixed
+        unresolved += len(missing)
+    indexed_time = time.perf_counter() - start
+
+    tmp = tempfile.mkdtemp(prefix="bench_anchors_")
+    try:
+        for i, text in enumerate(documents):
+            with open(os.path.join(tmp, f"doc_{i:03d}.md"), "w", encoding="utf-8") as f:
+                f.write(text)
+        start = time.perf_counter()
+        run(tmp, check=True, use_cache=False)
+        parallel_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"📦 {args.files} fichiers × {args.headings} titres × {args.links} liens "
+          f"({fixed} corrigés, {unresolved} non résolus)")
+    print(f"⏱️  Appariement par paires : {legacy_time * 1000:8.0f} ms")
+    print(f"⏱️  Index mot → titres     : {indexed_time * 1000:8.0f} ms")
+    print(f"⏱️  Index + processus ({os.cpu_count()}) : {parallel_time * 1000:8.0f} ms (lecture des fichiers comprise)")
+    print(f"🚀 Accélération            : x{legacy_time / indexed_time:.1f} (x{legacy_time / parallel_time:.1f} en parallèle)")
+
+if __name__ == "__main__":
+    main()
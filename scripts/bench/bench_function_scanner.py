@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du scanner de fonctions helpman (function_scanner.py)
+
+Génère un corpus synthétique de fichiers de fonctions shell puis compare :
+- l'ancienne boucle de list_functions.py (re.match par ligne + recherche
+  arrière de 20 lignes pour # DESC:)
+- le scanner en une passe (function_scanner.scan_file)
+
+Usage: python3 scripts/bench/bench_function_scanner.py [--files N] [--funcs N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "zsh", "functions", "helpman", "utils"))
+
+from function_scanner import scan_file  # noqa: E402
+
+def legacy_parse(file_path):
+    """Copie conforme de l'ancienne boucle de list_functions.py (référence)."""
+    functions = []
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.read().split('\n')
+    for i, line in enumerate(lines):
+        func_match = re.match(r'^(function\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', line)
+        if func_match:
+            func_name = func_match.group(2)
+            if func_name in ['if', 'for', 'while', 'case', 'function']:
+                continue
+            desc = ""
+            for j in range(max(0, i-20), i):
+                desc_match = re.match(r'^#\s*DESC:\s*(.*)', lines[j])
+                if desc_match:
+                    desc = desc_match.group(1).strip()
+                    break
+            functions.append((func_name, desc))
+    return functions
+
+BODY_LINES = (
+    '    local target="${1:-.}"',
+    '    if [ -z "$target" ]; then',
+    '        echo "❌ Usage: {name} <cible>"',
+    '        return 1',
+    '    fi',
+    '    for item in "$target"/*; do',
+    '        [ -f "$item" ] && printf \'%s\\n\' "$item"',
+    '    done',
+    '    # commentaire libre dans le corps',
+    '    case "$2" in',
+    '        -v|--verbose) set -x ;;',
+    '    esac',
+)
+
+def generate_corpus(root, n_files, funcs_per_file, seed=42):
+    """Crée n_files fichiers .sh/.zsh répartis en catégories, de façon déterministe."""
+    rng = random.Random(seed)
+    categories = ["misc/system", "misc/files", "dev", "cyber/scanning", "git", "utils"]
+    for i in range(n_files):
+        category = categories[i % len(categories)]
+        directory = os.path.join(root, category)
+        os.makedirs(directory, exist_ok=True)
+        ext = ".zsh" if i % 3 == 0 else ".sh"
+        out = ["#!/bin/sh", "# " + "=" * 60, f"# Module synthétique {i}", "# " + "=" * 60, ""]
+        for j in range(funcs_per_file):
+            name = f"bench_{i}_{j}"
+            out.append(f"# DESC: Fonction synthétique {name} numéro {rng.randint(0, 10**6)}")
+            out.append(f"# USAGE: {name} <cible> [--verbose]")
+            out.append(f"# EXAMPLE: {name} /tmp")
+            out.append(f"{name}() {{")
+            for line in rng.sample(BODY_LINES, rng.randint(4, len(BODY_LINES))):
+                out.append(line.replace("{name}", name))
+            out.append("}")
+            out.append("")
+        with open(os.path.join(directory, f"module_{i}{ext}"), "w", encoding="utf-8") as f:
+            f.write("\n".join(out))
+
+def list_files(root):
+    paths = []
+    for current, _dirs, files in os.walk(root):
+        for filename in files:
+            paths.append(os.path.join(current, filename))
+    paths.sort()
+    return paths
+
+def time_pass(parse, paths, repeat):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = 0
+        for path in paths:
+            count += len(parse(path))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scanner de fonctions helpman")
+    parser.add_argument("--files", type=int, default=10000, help="nombre de fichiers (défaut: 10000)")
+    parser.add_argument("--funcs", type=int, default=8, help="fonctions par fichier (défaut: 8)")
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions, meilleur temps retenu (défaut: 3)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="helpman-bench-")
+    try:
+        print(f"📦 Génération du corpus : {args.files} fichiers × {args.funcs} fonctions ({root})")
+        generate_corpus(root, args.files, args.funcs)
+        paths = list_files(root)
+
+        # Les deux implémentations doivent trouver les mêmes fonctions
+        legacy_time, legacy_count = time_pass(legacy_parse, paths, args.repeat)
+        scanner_time, scanner_count = time_pass(scan_file, paths, args.repeat)
+        if legacy_count != scanner_count:
+            print(f"❌ Résultats divergents : {legacy_count} vs {scanner_count} fonctions")
+            sys.exit(1)
+
+        print(f"   {scanner_count} fonctions détectées")
+        print(f"⏱️  Ancienne boucle : {legacy_time * 1000:8.1f} ms")
+        print(f"⏱️  Scanner 1 passe : {scanner_time * 1000:8.1f} ms")
+        print(f"🚀 Accélération    : x{legacy_time / scanner_time:.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
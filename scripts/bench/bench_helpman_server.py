@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de latence helpman : mode ponctuel vs serveur résident
+
+Mesure p50/p99 du temps de bout en bout (processus lancé → sortie complète)
+pour chaque requête, telle qu'un shell la lancerait :
+- ponctuel : python3 list_functions.py ...      (cache disque déjà chaud)
+- serveur  : python3 -S helpman_client.py ...   (serveur déjà démarré)
+
+Le serveur utilise une socket et un cache temporaires : aucune interaction
+avec un serveur déjà lancé par l'utilisateur.
+
+Usage: python3 scripts/bench/bench_helpman_server.py [--runs N]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UTILS_DIR = os.path.join(DOTFILES_DIR, "zsh", "functions", "helpman", "utils")
+
+QUERIES = [
+    ("help", []),
+    ("help extract", ["lookup", "extract"]),
+    ("help --search archive", ["--search", "archive"]),
+]
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure(cmd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def wait_for_socket(path, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence helpman : ponctuel vs serveur résident")
+    parser.add_argument("--runs", type=int, default=50, help="exécutions par requête (défaut: 50)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="helpman-server-bench-")
+    env = dict(os.environ, DOTFILES_DIR=DOTFILES_DIR, COLUMNS="100",
+               XDG_CACHE_HOME=os.path.join(tmp, "cache"),
+               HELPMAN_SOCKET=os.path.join(tmp, "helpman.sock"),
+               HELPMAN_SERVER="1")
+    oneshot = [sys.executable, os.path.join(UTILS_DIR, "list_functions.py")]
+    client = [sys.executable, "-S", os.path.join(UTILS_DIR, "helpman_client.py")]
+    server = subprocess.Popen([sys.executable, os.path.join(UTILS_DIR, "helpman_server.py"), "serve"],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_socket(env["HELPMAN_SOCKET"]):
+            print("❌ Le serveur helpman n'a pas démarré")
+            sys.exit(1)
+        # Chauffe : cache disque pour le mode ponctuel, mémoire pour le serveur
+        for _label, argv in QUERIES:
+            measure(oneshot + argv, env, 2)
+            measure(client + argv, env, 2)
+
+        print(f"{'requête':<24} {'mode':<10} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+        print("─" * 58)
+        for label, argv in QUERIES:
+            for mode, cmd in (("ponctuel", oneshot), ("serveur", client)):
+                samples = measure(cmd + argv, env, args.runs)
+                print(f"{label:<24} {mode:<10} {percentile(samples, 50):>10.1f} {percentile(samples, 99):>10.1f}")
+    finally:
+        server.terminate()
+        server.wait(timeout=5)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du rendu Markdown helpman (markdown_viewer.py)
+
+Charge les docs/**/*.md du dépôt en mémoire puis compare le débit (lignes/s) :
+- l'ancien rendu (plusieurs re.sub par ligne : puces, gras, code inline)
+- le tokenizer en une passe (markdown_viewer.render_lines), qui gère en plus
+  liens, italique, barré, tableaux et titres de niveau 1 à 6
+
+Aucune lecture disque ni écriture pendant la mesure : seul le rendu est chronométré.
+
+Usage: python3 scripts/bench/bench_markdown_viewer.py [--repeat N] [--scale N]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "zsh", "functions", "helpman", "utils"))
+
+from markdown_viewer import render_lines  # noqa: E402
+
+HEADER = '\033[1;36m'
+TITLE = '\033[1;33m'
+SUBTITLE = '\033[1;35m'
+BOLD = '\033[1m'
+CODE = '\033[0;32m'
+RESET = '\033[0m'
+
+def legacy_render(lines):
+    """Copie conforme de l'ancienne boucle de markdown_viewer.py (référence)."""
+    in_code = False
+    for line in lines:
+        if line.strip().startswith('```'):
+            in_code = not in_code
+            yield f"{CODE}{line}{RESET}"
+            continue
+        if in_code:
+            yield f"{CODE}{line}{RESET}"
+            continue
+        if line.startswith('# '):
+            yield f"\n{HEADER}{line}{RESET}"
+        elif line.startswith('## '):
+            yield f"\n{TITLE}{line}{RESET}"
+        elif line.startswith('### '):
+            yield f"\n{SUBTITLE}{line}{RESET}"
+        elif line.startswith('#### '):
+            yield f"\n{BOLD}{line}{RESET}"
+        elif line.strip().startswith('- ') or line.strip().startswith('* '):
+            line = re.sub(r'^(\s*)[-*] ', r'\1• ', line)
+            line = re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
+            yield f"  {line}"
+        elif '`' in line:
+            line = re.sub(r'`([^`]+)`', f'{CODE}\\1{RESET}', line)
+            line = re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
+            yield line
+        elif '**' in line:
+            yield re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
+        elif line.strip() == '':
+            yield ''
+        else:
+            yield line
+
+def load_docs():
+    documents = []
+    for path in sorted(glob.glob(os.path.join(DOTFILES_DIR, "docs", "**", "*.md"), recursive=True)):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            documents.append(f.read().split("\n"))
+    return documents
+
+def time_render(render, documents, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for lines in documents:
+            for _line in render(lines):
+                pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du rendu Markdown helpman")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions, meilleur temps retenu (défaut: 5)")
+    parser.add_argument("--scale", type=int, default=10, help="nombre de copies du corpus docs/ (défaut: 10)")
+    args = parser.parse_args()
+
+    documents = load_docs() * args.scale
+    n_lines = sum(len(lines) for lines in documents)
+    print(f"📦 Corpus : {len(documents) // args.scale} fichiers docs/**/*.md × {args.scale} = {n_lines} lignes")
+
+    # Les tableaux ne sont pas mis en forme par l'ancien rendu : mesure
+    # séparée sans eux pour comparer le seul coût du rendu en ligne
+    no_tables = [[line for line in lines if not line.lstrip().startswith('|')] for lines in documents]
+    for label, corpus in (("corpus complet", documents), ("hors tableaux", no_tables)):
+        n_lines = sum(len(lines) for lines in corpus)
+        legacy_time = time_render(legacy_render, corpus, args.repeat)
+        new_time = time_render(lambda lines: render_lines(lines, 100), corpus, args.repeat)
+        print(f"— {label} ({n_lines} lignes)")
+        print(f"⏱️  Ancien rendu (re.sub)  : {legacy_time * 1000:8.1f} ms  {n_lines / legacy_time:12,.0f} lignes/s")
+        print(f"⏱️  Tokenizer 1 passe      : {new_time * 1000:8.1f} ms  {n_lines / new_time:12,.0f} lignes/s")
+        print(f"🚀 Rapport               : x{legacy_time / new_time:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark de ProgressBar.increment (core/utils/progress_utils.py)
+
+Mesure le coût par appel (ns/increment) sur une boucle sans travail :
+- l'ancienne implémentation (time.time() et comparaison à chaque appel,
+  barre et timedelta reconstruits à chaque affichage)
+- le chemin rapide actuel (__slots__, horloge monotone lue tous les N
+  appels avec N adaptatif, segments de barre en cache)
+- BackgroundProgressBar (rendu dans un thread, increment() sans E/S)
+- SharedProgressBar (compteur local du thread, reporté par lots en mémoire partagée)
+
+La sortie de la barre est redirigée vers /dev/null pendant la mesure.
+
+Usage: python3 scripts/bench/bench_progress_bar.py [--items N] [--repeat N]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+from datetime import timedelta
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "core", "utils"))
+
+from progress_utils import BackgroundProgressBar, ProgressBar, SharedProgressBar  # noqa: E402
+
+class LegacyProgressBar:
+    """Copie conforme du chemin increment/_print_progress d'origine (référence)."""
+
+    def __init__(self, total, description="Traitement"):
+        self.total = total
+        self.description = description
+        self.start_time = time.time()
+        self.completed = 0
+        self.successful = 0
+        self.failed = 0
+        self.bar_length = 40
+        self.last_print_time = time.time()
+        self.print_interval = 0.3
+
+    def increment(self, successful=True, count=1):
+        self.completed += count
+        if successful:
+            self.successful += count
+        else:
+            self.failed += count
+        current_time = time.time()
+        if (current_time - self.last_print_time >= self.print_interval) or (self.completed == self.total):
+            self._print_progress()
+            self.last_print_time = current_time
+
+    def _print_progress(self):
+        percentage = (self.completed / self.total) * 100
+        filled = int(self.bar_length * self.completed / self.total)
+        if filled > self.bar_length:
+            filled = self.bar_length
+        bar = '█' * filled + '░' * (self.bar_length - filled)
+        elapsed_time = time.time() - self.start_time
+        elapsed_str = str(timedelta(seconds=int(elapsed_time)))
+        if self.completed > 0:
+            eta = str(timedelta(seconds=int(elapsed_time / self.completed * (self.total - self.completed))))
+            time_info = f"⏱️  {elapsed_str} écoulé | ~{eta} restant"
+        else:
+            time_info = "⏱️  Calcul en cours..."
+        stats = f"✅ {self.successful} | ❌ {self.failed}"
+        sys.stdout.write(f"\r[{self.completed}/{self.total}] {percentage:.1f}% |{bar}| {stats} | {time_info}")
+        sys.stdout.flush()
+
+class NoopBar:
+    """Méthode vide : coût fixe de la boucle et de l'appel, soustrait des mesures."""
+
+    def __init__(self, total, description="Traitement"):
+        pass
+
+    def increment(self, successful=True, count=1):
+        pass
+
+def time_increments(cls, items, repeat):
+    best = None
+    for _ in range(repeat):
+        bar = cls(items, "bench")
+        increment = bar.increment
+        start = time.perf_counter_ns()
+        for _i in range(items):
+            increment()
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / items
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark de ProgressBar.increment")
+    parser.add_argument("--items", type=int, default=2000000, help="appels à increment par mesure (défaut: 2000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="répétitions, meilleur temps retenu (défaut: 3)")
+    args = parser.parse_args()
+
+    # Sortie redirigée : forcer le rendu texte (sinon mode JSON-lines hors terminal)
+    os.environ["PROGRESS_MODE"] = "text"
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        noop_ns = time_increments(NoopBar, args.items, args.repeat)
+        legacy_ns = time_increments(LegacyProgressBar, args.items, args.repeat)
+        fast_ns = time_increments(ProgressBar, args.items, args.repeat)
+        background_ns = time_increments(BackgroundProgressBar, args.items, args.repeat)
+        shared_ns = time_increments(SharedProgressBar, args.items, args.repeat)
+
+    # Coût propre à increment() : boucle et appel de méthode vide déduits
+    legacy_own = legacy_ns - noop_ns
+    fast_own = fast_ns - noop_ns
+    background_own = background_ns - noop_ns
+    shared_own = shared_ns - noop_ns
+    print(f"📦 {args.items} appels à increment() (meilleur de {args.repeat})")
+    print(f"⏱️  Appel vide (référence)  : {noop_ns:7.1f} ns/appel")
+    print(f"⏱️  Ancienne implémentation : {legacy_ns:7.1f} ns/increment  ({legacy_own:6.1f} ns hors appel)")
+    print(f"⏱️  Chemin rapide           : {fast_ns:7.1f} ns/increment  ({fast_own:6.1f} ns hors appel)")
+    print(f"⏱️  Thread de rendu         : {background_ns:7.1f} ns/increment  ({background_own:6.1f} ns hors appel)")
+    print(f"⏱️  Compteurs partagés      : {shared_ns:7.1f} ns/increment  ({shared_own:6.1f} ns hors appel)")
+    print(f"🚀 Accélération            : x{legacy_ns / fast_ns:.2f} (x{legacy_own / fast_own:.2f} hors appel)")
+
+if __name__ == "__main__":
+    main()
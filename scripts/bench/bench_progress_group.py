@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Octets écrits par rafraîchissement de ProgressGroup (core/utils/progress_utils.py)
+
+Simule N tâches concurrentes (débits différents, tirage déterministe) et
+compare, image par image :
+- le redessin complet du bloc (remonter le curseur, réécrire chaque ligne)
+- le redessin différentiel de ProgressGroup.diff_frame (seules les
+  cellules modifiées des lignes changées)
+
+Aucune écriture sur le terminal : seules les séquences produites sont mesurées.
+
+Usage: python3 scripts/bench/bench_progress_group.py [--tasks N] [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "core", "utils"))
+
+from progress_utils import ProgressGroup  # noqa: E402
+
+def full_redraw(previous, lines):
+    """Redessin complet de référence (un \\033[K par ligne)."""
+    up = f"\033[{len(previous)}A" if previous else ""
+    return up + "".join(f"\r{line}\033[K\n" for line in lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Octets par rafraîchissement de ProgressGroup")
+    parser.add_argument("--tasks", type=int, default=8, help="nombre de tâches (défaut: 8)")
+    parser.add_argument("--frames", type=int, default=2000, help="images simulées (défaut: 2000)")
+    parser.add_argument("--columns", type=int, default=120, help="largeur du terminal (défaut: 120)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    group = ProgressGroup("Total")
+    tasks = [group.add_task(rng.randint(200, 5000), f"paquet-{i:02d}") for i in range(args.tasks)]
+    # Probabilité d'avancer entre deux images : certaines tâches sont lentes
+    speeds = [rng.choice((0.05, 0.2, 0.6, 1.0)) for _ in tasks]
+
+    previous_full = []
+    previous_diff = []
+    full_bytes = 0
+    diff_bytes = 0
+    diff_time = 0.0
+    for _ in range(args.frames):
+        for task, speed in zip(tasks, speeds):
+            if not task.done and rng.random() < speed:
+                task.increment(successful=rng.random() < 0.95, count=rng.randint(1, 5))
+        lines = group.render_frame(args.columns)
+        full_bytes += len(full_redraw(previous_full, lines).encode("utf-8"))
+        previous_full = lines
+        start = time.perf_counter()
+        data = group.diff_frame(previous_diff, lines)
+        diff_time += time.perf_counter() - start
+        diff_bytes += len(data.encode("utf-8"))
+        previous_diff = lines
+
+    print(f"📦 {args.tasks} tâches + total, {args.frames} images, {args.columns} colonnes")
+    print(f"📝 Redessin complet     : {full_bytes / args.frames:8.0f} octets/image")
+    print(f"📝 Redessin différentiel: {diff_bytes / args.frames:8.0f} octets/image "
+          f"({diff_time / args.frames * 1e6:.0f} µs de calcul/image)")
+    print(f"🚀 Réduction            : x{full_bytes / diff_bytes:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de progress_bar.sh : rendu shell vs démon Python (progress_daemon.py)
+
+Exécute une boucle de N appels à progress_update dans un pseudo-terminal
+(le mode démon n'est utilisé que sur un terminal) et compare le temps total :
+- rendu shell : date, awk et printf substitués à chaque mise à jour
+- DOTFILES_PROGRESS_DAEMON=1 : un printf builtin par mise à jour vers le tube
+
+La sortie du pseudo-terminal est lue et jetée ; seul le temps de la boucle
+(démarrage et arrêt du démon compris) est mesuré.
+
+Usage: python3 scripts/bench/bench_progress_shell.py [--updates N] [--shell sh]
+"""
+import argparse
+import os
+import pty
+import select
+import shutil
+import sys
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LOOP = """
+. "$DOTFILES_DIR/core/utils/progress_bar.sh"
+progress_init "$N" "bench"
+i=1
+while [ "$i" -le "$N" ]; do
+    progress_update "$i"
+    i=$((i + 1))
+done
+progress_finish false
+"""
+
+def run_in_pty(shell, updates, daemon):
+    env = dict(os.environ, DOTFILES_DIR=DOTFILES_DIR, N=str(updates),
+               DOTFILES_PROGRESS_DAEMON="1" if daemon else "0")
+    env.pop("DOTFILES_PROGRESS_PLAIN", None)
+    start = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.execvpe(shell, [shell, "-c", LOOP], env)
+    received = 0
+    while True:
+        ready, _, _ = select.select([fd], [], [], 1.0)
+        if not ready:
+            continue
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            break
+        if not data:
+            break
+        received += len(data)
+    os.waitpid(pid, 0)
+    os.close(fd)
+    return time.perf_counter() - start, received
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de progress_bar.sh (shell vs démon)")
+    parser.add_argument("--updates", type=int, default=500, help="appels à progress_update (défaut: 500)")
+    parser.add_argument("--shell", default="sh", help="shell utilisé (défaut: sh)")
+    args = parser.parse_args()
+
+    if shutil.which(args.shell) is None:
+        sys.exit(f"❌ Shell introuvable: {args.shell}")
+
+    print(f"📦 {args.updates} appels à progress_update ({args.shell}, pseudo-terminal)")
+    results = {}
+    for label, daemon in (("Rendu shell", False), ("Démon Python", True)):
+        elapsed, received = run_in_pty(args.shell, args.updates, daemon)
+        results[daemon] = elapsed
+        print(f"⏱️  {label:<13}: {elapsed * 1000:8.0f} ms  {args.updates / elapsed:10,.0f} maj/s  "
+              f"({received / 1024:.0f} Ko affichés)")
+    print(f"🚀 Accélération : x{results[False] / results[True]:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks des utilitaires Python sur corpus synthétiques
+
+Corpus déterministes (graine fixe), générés une fois puis réutilisables
+avec --corpus-dir :
+- functions/ : N fichiers de fonctions shell documentées (10k par défaut,
+  100k avec --scale large)
+- big.md     : un document Markdown d'environ 50 Mo (titres, listes,
+  tableaux, blocs de code, liens)
+- docs/      : des README de plusieurs milliers de titres et de liens
+  internes, inter-fichiers et « Retour en haut » (une partie cassés)
+
+Chaque cas est lancé dans un processus séparé, avec ses propres caches
+($XDG_CACHE_HOME temporaire) :
+- froid : premier lancement, caches vides
+- chaud : médiane de --repeat lancements suivants (caches remplis)
+- RSS max : pic mémoire du processus (wait4), sur tous les lancements
+- codes de sortie : du lancement à froid et de chaque lancement à chaud ;
+  un cas dont un code diffère du code attendu (1 pour les --check, le
+  corpus ayant des liens cassés) est en échec : il n'a pas fait son travail
+
+Les résultats sont écrits en JSON (--output) et peuvent être comparés à une
+référence (--baseline). Code 1 si un cas est en échec, si un temps dépasse
+la référence de plus de --threshold % (et de plus de --min-delta s) ou le
+RSS de plus de --rss-threshold %, ou si un code de sortie diffère de la
+référence. Le cache de pages du noyau n'est pas vidé entre les lancements
+(pas de droits root requis).
+
+Usage: python3 scripts/bench/bench_suite.py [--scale small|standard|large] [--only CAS,...]
+                                            [--output FICHIER] [--baseline FICHIER]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UTILS_DIR = os.path.join(DOTFILES_DIR, "zsh", "functions", "helpman", "utils")
+CORE_UTILS_DIR = os.path.join(DOTFILES_DIR, "core", "utils")
+SCRIPTS_DIR = os.path.join(DOTFILES_DIR, "scripts")
+
+RESULTS_VERSION = 1
+SEED = 20240611
+
+# (fichiers de fonctions, Mo de Markdown, README, titres par README, incréments de barre)
+SCALES = {
+    "small": (1000, 5, 4, 1000, 200000),
+    "standard": (10000, 50, 8, 2500, 2000000),
+    "large": (100000, 50, 16, 5000, 2000000),
+}
+
+WORDS = (
+    "fichier réseau système archive sauvegarde docker image conteneur port "
+    "processus mémoire disque chemin alias module gestionnaire paquet "
+    "installation configuration analyse rapport journal service utilisateur"
+).split()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Corpus
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+def gen_functions(root, files, rng):
+    """Fichiers de fonctions répartis en catégories (cat_XX/sub_YY/file_N.sh), ~5 fonctions chacun."""
+    for i in range(files):
+        directory = os.path.join(root, f"cat_{i % 20:02d}", f"sub_{i % 7}")
+        os.makedirs(directory, exist_ok=True)
+        out = ["#!/bin/zsh", f"# Fichier synthétique {i}", ""]
+        names = [f"fn_{i}_{j}" for j in range(rng.randint(3, 7))]
+        for j, name in enumerate(names):
+            out.append(f"# DESC: {_sentence(rng, 8).capitalize()}")
+            out.append(f"# USAGE: {name} <{rng.choice(WORDS)}> [options]")
+            out.append(f"# EXAMPLE: {name} {rng.choice(WORDS)}")
+            out.append(f"{name}() {{")
+            out.append('    local target="${1:-.}"')
+            if j + 1 < len(names):
+                out.append(f"    {names[j + 1]} \"$target\"")
+            if rng.random() < 0.3:
+                out.append(f"    fn_{rng.randrange(files)}_0 \"$target\"")
+            out.append(f'    echo "✅ {_sentence(rng, 5)}"')
+            out.append("}")
+            out.append("")
+        ext = ".zsh" if i % 5 == 0 else ".sh"
+        with open(os.path.join(directory, f"file_{i}{ext}"), "w", encoding="utf-8") as f:
+            f.write("\n".join(out))
+
+def gen_big_markdown(path, megabytes, rng):
+    """Document Markdown d'environ megabytes Mo, par sections répétées."""
+    target = megabytes * 1024 * 1024
+    written = 0
+    section = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Document de référence\n\n")
+        while written < target:
+            section += 1
+            block = [
+                f"## Section {section} : {_sentence(rng, 3)}",
+                "",
+                f"Paragraphe avec **{rng.choice(WORDS)}**, `code_{section}` et un "
+                f"[lien](#section-{max(1, section - 1)}) vers {_sentence(rng, 10)}.",
+                "",
+                f"### Détails {section}",
+                "",
+                f"- {_sentence(rng, 6)}",
+                f"- *{_sentence(rng, 4)}* et `{rng.choice(WORDS)} --option`",
+                f"  - sous-point {_sentence(rng, 5)}",
+                "",
+                "| Colonne | Valeur |",
+                "|---------|--------|",
+                f"| {rng.choice(WORDS)} | {rng.randint(0, 9999)} |",
+                "",
+                "```bash",
+                f"fn_{section}_0 --{rng.choice(WORDS)} \"$HOME\"",
+                "```",
+                "",
+                f"> {_sentence(rng, 12)}",
+                "",
+            ]
+            text = "\n".join(block) + "\n"
+            f.write(text)
+            written += len(text.encode("utf-8"))
+
+def gen_readmes(root, count, headings, rng):
+    """README avec beaucoup de titres et de liens (ancres, autres fichiers, « Retour en haut »)."""
+    os.makedirs(root, exist_ok=True)
+    titles = {i: [f"{_sentence(rng, 2).capitalize()} {i}-{h}" for h in range(headings)] for i in range(count)}
+    for i in range(count):
+        out = [f"# Guide {i}", "", "## Table des matières", ""]
+        for h, title in enumerate(titles[i][:200]):
+            anchor = title.lower().replace(" ", "-")
+            # Une ancre sur dix est cassée (accents/majuscules perdus) pour exercer la correction
+            if h % 10 == 0:
+                anchor = anchor.replace("é", "e") + "-old"
+            out.append(f"- [{title}](#{anchor})")
+        out.append("")
+        for h, title in enumerate(titles[i]):
+            out.append(f"{'##' if h % 4 == 0 else '###'} {title}")
+            out.append("")
+            other = (i + 1) % count
+            other_title = titles[other][rng.randrange(headings)]
+            out.append(f"{_sentence(rng, 15)}. Voir [{other_title}](README_{other}.md#"
+                       f"{other_title.lower().replace(' ', '-')}) et `code {h}`.")
+            if h % 25 == 0:
+                out.append("")
+                out.append("[🔝 Retour en haut](#top)")
+            out.append("")
+        with open(os.path.join(root, f"README_{i}.md"), "w", encoding="utf-8") as f:
+            f.write("\n".join(out))
+
+def ensure_corpus(corpus_dir, scale, files):
+    """Génère le corpus s'il est absent ou d'une autre échelle ; renvoie ses paramètres."""
+    _files, megabytes, readmes, headings, _items = SCALES[scale]
+    files = files or _files
+    params = {"seed": SEED, "files": files, "markdown_mb": megabytes, "readmes": readmes, "headings": headings}
+    stamp = os.path.join(corpus_dir, "corpus.json")
+    try:
+        with open(stamp, encoding="utf-8") as f:
+            if json.load(f) == params:
+                return params
+    except (OSError, ValueError):
+        pass
+
+    print(f"🧪 Génération du corpus ({files} fichiers, {megabytes} Mo de Markdown, "
+          f"{readmes} README × {headings} titres) dans {corpus_dir}")
+    start = time.perf_counter()
+    for name in ("functions", "docs", "big.md"):
+        path = os.path.join(corpus_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.unlink(path)
+    os.makedirs(corpus_dir, exist_ok=True)
+    gen_functions(os.path.join(corpus_dir, "functions"), files, random.Random(SEED))
+    gen_big_markdown(os.path.join(corpus_dir, "big.md"), megabytes, random.Random(SEED + 1))
+    gen_readmes(os.path.join(corpus_dir, "docs"), readmes, headings, random.Random(SEED + 2))
+    with open(stamp, "w", encoding="utf-8") as f:
+        json.dump(params, f)
+    print(f"   {time.perf_counter() - start:.1f} s")
+    return params
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Cas mesurés
+# ═══════════════════════════════════════════════════════════════════════════
+
+PROGRESS_SNIPPET = (
+    "import sys; sys.path.insert(0, sys.argv[1])\n"
+    "from progress_utils import ProgressBar\n"
+    "n = int(sys.argv[2]); bar = ProgressBar(n, 'bench'); inc = bar.increment\n"
+    "for _ in range(n): inc()\n"
+    "bar.finish()\n"
+)
+
+def build_cases(corpus_dir, items):
+    """
+    {nom: (argv, env supplémentaire, code de sortie attendu)} ; chaque argv
+    est relancé tel quel.
+    """
+    py = sys.executable
+    functions = os.path.join(corpus_dir, "functions")
+    docs = os.path.join(corpus_dir, "docs")
+    big = os.path.join(corpus_dir, "big.md")
+    readme = os.path.join(docs, "README_0.md")
+    # README passés explicitement : sans chemin, les anciens scripts ne traitent que README.md
+    readmes = sorted(os.path.join(docs, name) for name in os.listdir(docs) if name.endswith(".md"))
+    return {
+        "list_functions": ([py, os.path.join(UTILS_DIR, "list_functions.py"), "--root", functions], {}, 0),
+        "list_functions_search": ([py, os.path.join(UTILS_DIR, "list_functions.py"), "--root", functions,
+                                   "--search", "archive réseau"], {}, 0),
+        "call_graph": ([py, os.path.join(UTILS_DIR, "call_graph.py"), "--root", functions], {}, 0),
+        "lazy_manifest": ([py, os.path.join(UTILS_DIR, "lazy_manifest.py"), functions], {}, 0),
+        "markdown_viewer": ([py, os.path.join(UTILS_DIR, "markdown_viewer.py"), big], {}, 0),
+        "markdown_viewer_toc": ([py, os.path.join(UTILS_DIR, "markdown_viewer.py"), "--toc", readme], {}, 0),
+        "progress_utils": ([py, "-c", PROGRESS_SNIPPET, CORE_UTILS_DIR, str(items)], {"PROGRESS_MODE": "text"}, 0),
+        # Ancres cassées volontairement dans le corpus : --check doit sortir en 1
+        "fix_readme_anchors": ([py, os.path.join(SCRIPTS_DIR, "fix_readme_anchors.py"), "--check", "-j", "1",
+                                "--root", docs] + readmes, {}, 1),
+        "fix_return_links": ([py, os.path.join(SCRIPTS_DIR, "fix_return_links.py"), "--check",
+                              "--root", docs] + readmes, {}, 1),
+    }
+
+def run_process(argv, env):
+    """Lance argv jusqu'au bout ; renvoie (secondes, RSS max en Ko, code de sortie)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, env=env, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _pid, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss : Ko sous Linux
+    return elapsed, usage.ru_maxrss, proc.returncode
+
+def run_case(argv, extra_env, corpus_dir, repeat):
+    cache = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        env = dict(os.environ, XDG_CACHE_HOME=cache, DOTFILES_DIR=corpus_dir, COLUMNS="100", **extra_env)
+        env.pop("HELPMAN_NO_CACHE", None)
+        cold, rss, code = run_process(argv, env)
+        warm = []
+        warm_exits = []
+        for _ in range(repeat):
+            elapsed, peak, warm_code = run_process(argv, env)
+            warm.append(elapsed)
+            warm_exits.append(warm_code)
+            rss = max(rss, peak)
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+    return {
+        "cold_s": round(cold, 4),
+        "warm_s": round(statistics.median(warm), 4) if warm else None,
+        "warm_min_s": round(min(warm), 4) if warm else None,
+        "peak_rss_mb": round(rss / 1024, 1),
+        "exit": code,
+        "warm_exits": warm_exits,
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Référence
+# ═══════════════════════════════════════════════════════════════════════════
+
+def compare(results, baseline, threshold, min_delta, rss_threshold):
+    """Affiche la comparaison à la référence ; renvoie le nombre de régressions."""
+    if baseline.get("corpus") != results["corpus"]:
+        print("⚠️  Corpus différent de celui de la référence : comparaison indicative")
+    regressions = 0
+    print(f"🔎 Comparaison à la référence (temps +{threshold:g} % et +{min_delta:g} s, RSS +{rss_threshold:g} %)")
+    for name, current in results["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None:
+            print(f"  ℹ️  {name:<24} absent de la référence")
+            continue
+        problems = []
+        # Un outil qui échoue (plantage, erreur d'argparse) va plus vite : jamais une amélioration
+        expected = reference.get("exit")
+        exits = [current["exit"]] + current.get("warm_exits", [])
+        if expected is not None and any(code != expected for code in exits):
+            problems.append(f"code de sortie {expected} → {', '.join(map(str, exits))}")
+        for key in ("cold_s", "warm_s"):
+            old, new = reference.get(key), current.get(key)
+            if old is not None and new is not None and new - old > min_delta and new > old * (1 + threshold / 100):
+                problems.append(f"{key} {old:.3f} → {new:.3f} s")
+        old, new = reference.get("peak_rss_mb"), current.get("peak_rss_mb")
+        if old and new > old * (1 + rss_threshold / 100):
+            problems.append(f"RSS {old:.1f} → {new:.1f} Mo")
+        if problems:
+            regressions += 1
+            print(f"  ❌ {name:<24} {', '.join(problems)}")
+        else:
+            print(f"  ✅ {name}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des utilitaires Python sur corpus synthétiques")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="standard", help="taille des corpus (défaut: standard)")
+    parser.add_argument("--files", type=int, help="nombre de fichiers de fonctions (remplace celui de --scale)")
+    parser.add_argument("--corpus-dir", help="répertoire du corpus, conservé entre deux lancements (défaut: temporaire)")
+    parser.add_argument("--only", help="cas à lancer, séparés par des virgules")
+    parser.add_argument("--repeat", type=int, default=3, help="lancements à chaud par cas (défaut: 3)")
+    parser.add_argument("--output", help="écrire les résultats JSON dans ce fichier")
+    parser.add_argument("--baseline", help="référence JSON à comparer ; code 1 si régression")
+    parser.add_argument("--threshold", type=float, default=25.0, help="hausse de temps tolérée, en %% (défaut: 25)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="hausse de temps ignorée en dessous, en s (défaut: 0.05)")
+    parser.add_argument("--rss-threshold", type=float, default=20.0, help="hausse de RSS tolérée, en %% (défaut: 20)")
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="bench_corpus_")
+    try:
+        corpus = ensure_corpus(corpus_dir, args.scale, args.files)
+        cases = build_cases(corpus_dir, SCALES[args.scale][4])
+        if args.only:
+            selected = [name.strip() for name in args.only.split(",") if name.strip()]
+            unknown = [name for name in selected if name not in cases]
+            if unknown:
+                sys.exit(f"❌ Cas inconnu(s): {', '.join(unknown)} (disponibles: {', '.join(cases)})")
+            cases = {name: cases[name] for name in selected}
+
+        results = {
+            "version": RESULTS_VERSION,
+            "corpus": corpus,
+            "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "cases": {},
+        }
+        failed = []
+        print(f"{'cas':<24} {'froid':>9} {'chaud':>9} {'RSS max':>10}  code")
+        for name, (argv, extra_env, expected) in cases.items():
+            result = run_case(argv, extra_env, corpus_dir, args.repeat)
+            results["cases"][name] = result
+            warm = f"{result['warm_s']:8.3f}s" if result["warm_s"] is not None else f"{'-':>9}"
+            codes = sorted(set([result["exit"]] + result["warm_exits"]))
+            status = "" if codes == [expected] else f"  ❌ attendu {expected}"
+            if status:
+                failed.append(name)
+            print(f"{name:<24} {result['cold_s']:8.3f}s {warm} {result['peak_rss_mb']:7.1f} Mo  "
+                  f"{'/'.join(map(str, codes))}{status}")
+    finally:
+        if not args.corpus_dir:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        print(f"💾 Résultats : {args.output}")
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta, args.rss_threshold)
+    if failed:
+        print(f"❌ Cas en échec (code de sortie inattendu) : {', '.join(failed)}")
+    if failed or regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
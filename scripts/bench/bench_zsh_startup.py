@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temps de démarrage du shell : chargement de toutes les fonctions vs manifeste
+de chargement différé (zsh/functions/helpman/utils/lazy_manifest.py)
+
+Deux mesures, chacune sans puis avec manifeste (DOTFILES_LAZY_FUNCTIONS=0/1) :
+- « zsh -i -c exit » avec un HOME temporaire dont ~/dotfiles pointe sur ce
+  dépôt (.zshrc → zsh/zshrc_custom) ; nécessite zsh
+- l'étape 4 seule (boucle « source » de zshrc_custom vs « source » du
+  manifeste) dans le shell choisi ; bash sert de substitut sans zsh
+  (globstar activé, les fichiers propres à zsh y échouent silencieusement)
+
+Le manifeste est généré une fois avant les mesures, dans un cache temporaire.
+
+Usage: python3 scripts/bench/bench_zsh_startup.py [--runs N] [--shell zsh|bash]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FUNCTIONS_DIR = os.path.join(DOTFILES_DIR, "zsh", "functions")
+MANIFEST_TOOL = os.path.join(FUNCTIONS_DIR, "helpman", "utils", "lazy_manifest.py")
+
+# Étape 4 de zshrc_custom, isolée
+STEP4_EAGER = r"""
+for func_file in "$FUNCTIONS_DIR"/**/*.sh "$FUNCTIONS_DIR"/**/*.zsh; do
+    if [[ "$func_file" != *"man.zsh" ]] && \
+       [[ "$func_file" != *"backup"* ]] && \
+       [[ "$func_file" != *"/cyber/"*.zsh ]] && \
+       [[ "$func_file" != *"alias_utils.zsh" ]] && \
+       [[ "$func_file" != *"update_system.sh" ]] && \
+       [[ "$func_file" != *"install-tool.zsh" ]] && \
+       [[ "$func_file" != *"installman.zsh" ]] && \
+       [[ "$func_file" != *"configman.zsh" ]] && \
+       [[ "$func_file" != *"/install/"* ]] && \
+       [[ "$func_file" != *"/configman/modules/"* ]] && \
+       [[ "$func_file" != *"/fileman/modules/"* ]] && \
+       [ -f "$func_file" ]; then
+        source "$func_file" >/dev/null 2>&1
+    fi
+done
+"""
+STEP4_LAZY = 'source "$DOTFILES_LAZY_MANIFEST" >/dev/null 2>&1\n'
+
+def time_runs(argv, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, timeout=120)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(label, eager, lazy):
+    eager_ms = statistics.median(eager) * 1000
+    lazy_ms = statistics.median(lazy) * 1000
+    print(f"⏱️  {label}")
+    print(f"     tout sourcer : {eager_ms:8.1f} ms (médiane, min {min(eager) * 1000:.1f})")
+    print(f"     manifeste    : {lazy_ms:8.1f} ms (médiane, min {min(lazy) * 1000:.1f})")
+    print(f"     🚀 x{eager_ms / lazy_ms:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Démarrage du shell : tout sourcer vs manifeste différé")
+    parser.add_argument("--runs", type=int, default=10, help="démarrages par mesure (défaut: 10)")
+    parser.add_argument("--shell", default=None, help="shell de la mesure « étape 4 » (défaut: zsh, sinon bash)")
+    args = parser.parse_args()
+
+    zsh = shutil.which("zsh")
+    shell = args.shell or ("zsh" if zsh else "bash")
+    if shutil.which(shell) is None:
+        sys.exit(f"❌ Shell introuvable: {shell}")
+
+    tmp = tempfile.mkdtemp(prefix="bench_zsh_")
+    try:
+        home = os.path.join(tmp, "home")
+        os.makedirs(home)
+        os.symlink(DOTFILES_DIR, os.path.join(home, "dotfiles"))
+        with open(os.path.join(home, ".zshrc"), "w", encoding="utf-8") as f:
+            f.write('source "$HOME/dotfiles/zsh/zshrc_custom"\n')
+        env = dict(os.environ, HOME=home, ZDOTDIR=home, XDG_CACHE_HOME=os.path.join(tmp, "cache"),
+                   DOTFILES_DIR=DOTFILES_DIR, FUNCTIONS_DIR=FUNCTIONS_DIR)
+        manifest = os.path.join(env["XDG_CACHE_HOME"], "dotfiles", "zsh", "functions_manifest.zsh")
+        env["DOTFILES_LAZY_MANIFEST"] = manifest
+        subprocess.run([sys.executable, MANIFEST_TOOL, FUNCTIONS_DIR], env=env, check=True)
+        with open(manifest, encoding="utf-8") as f:
+            stats = [line for line in f if line.startswith("DOTFILES_LAZY_STATS=")]
+        print(f"📦 {stats[0].strip() if stats else ''} (fichiers différés, sourcés, fonctions)")
+
+        if zsh:
+            eager = time_runs([zsh, "-i", "-c", "exit"], dict(env, DOTFILES_LAZY_FUNCTIONS="0"), args.runs)
+            lazy = time_runs([zsh, "-i", "-c", "exit"], dict(env, DOTFILES_LAZY_FUNCTIONS="1"), args.runs)
+            report("zsh -i -c exit", eager, lazy)
+        else:
+            print("⚠️  zsh introuvable : mesure « zsh -i -c exit » ignorée")
+
+        prelude = "shopt -s globstar\n" if os.path.basename(shell) == "bash" else ""
+        eager = time_runs([shell, "-c", prelude + STEP4_EAGER], env, args.runs)
+        lazy = time_runs([shell, "-c", STEP4_LAZY], env, args.runs)
+        report(f"étape 4 seule ({shell} -c)", eager, lazy)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Moteur de liens Markdown du dépôt : index global des ancres, vérification
+et correction en une passe par fichier.
+
+1. Index : les titres de chaque fichier .md (heading_index : tous niveaux,
+   blocs de code ignorés, suffixes -1/-2 des doublons) forment un index
+   global chemin → titres/ancres.
+2. Liens : chaque fichier est parcouru une seule fois ; pour chaque lien
+   - [texte](#ancre) : ancre du fichier courant ; un lien « Retour en haut »
+     cassé pointe vers le premier titre du fichier
+   - [texte](chemin.md#ancre) : le fichier doit exister, l'ancre est cherchée
+     dans l'index du fichier cible
+   - [texte](chemin) : le fichier ou répertoire doit exister
+   Une ancre inconnue est remplacée par celle du titre le plus proche du
+   texte du lien (index mot → titres) ; sans titre correspondant, le lien
+   est signalé et laissé tel quel. Les URL externes ne sont pas vérifiées.
+3. Écriture atomique (fichier temporaire + rename), seulement si l'empreinte
+   du contenu a changé.
+
+L'empreinte (sha1) de chaque fichier et celles des ancres des fichiers qu'il
+cible sont gardées dans $XDG_CACHE_HOME/dotfiles/links : un fichier sans
+problème au dernier passage, inchangé, dont les cibles n'ont pas changé
+n'est pas relu.
+
+Usage: fix_links.py [CHEMIN...] [--check] [--jobs N] [--no-cache]
+       (défaut : tous les .md du dépôt)
+       --check : lecture seule, code de sortie 1 si un lien est à corriger
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from urllib.parse import unquote
+
+DOTFILES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(DOTFILES_DIR, "zsh", "functions", "helpman", "utils"))
+
+from function_search import normalize  # noqa: E402
+from heading_index import scan_headings  # noqa: E402
+
+# Incrémenter à chaque changement du format de l'état
+STATE_VERSION = 1
+
+LINK_RE = re.compile(r'\[([^\]]*)\]\(([^)\s]+)\)')
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)')
+SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:|^//')
+BACK_TO_TOP_RE = re.compile(r'retour en haut|haut de page|back to top')
+_NON_WORD_RE = re.compile(r'[^a-z0-9\s]')
+_SPACES_RE = re.compile(r'\s+')
+
+# Répertoires jamais parcourus
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+
+# Score minimal pour retenir un titre
+MIN_SCORE = 60
+# Part minimale du titre (ou du lien) couverte par l'autre texte
+MIN_RATIO = 0.7
+
+def normalize_text(text):
+    """Normalise un texte pour comparaison (minuscules, sans accents, emojis ni ponctuation)"""
+    text = _NON_WORD_RE.sub('', normalize(text))
+    return _SPACES_RE.sub(' ', text).strip()
+
+def match_score(link_normalized, link_words, heading_normalized, heading_words):
+    """Score de correspondance lien/titre (0 à 100)"""
+    if heading_normalized == link_normalized:
+        return 100
+    if link_normalized in heading_normalized:
+        ratio = len(link_normalized) / len(heading_normalized) if heading_normalized else 0
+        if ratio >= MIN_RATIO:
+            return ratio * 90
+    elif heading_normalized in link_normalized:
+        ratio = len(heading_normalized) / len(link_normalized) if link_normalized else 0
+        if ratio >= MIN_RATIO:
+            return ratio * 90
+    # Inclusion trop partielle : on retombe sur les mots communs
+    if link_words and heading_words:
+        common_words = link_words & heading_words
+        if common_words:
+            if link_words <= heading_words:
+                return 85
+            return len(common_words) / max(len(link_words), len(heading_words)) * 70
+    return 0
+
+class AnchorIndex:
+    """Titres d'un fichier ((titre, ancre) dans l'ordre), normalisés une fois, et index mot → titres."""
+
+    def __init__(self, headings):
+        self.anchors = [anchor for _title, anchor in headings]
+        self.valid = set(self.anchors)
+        self.top = self.anchors[0] if self.anchors else None
+        self.normalized = [normalize_text(title) for title, _anchor in headings]
+        self.words = [frozenset(n.split()) for n in self.normalized]
+        self.exact = {}
+        self.by_word = {}
+        for i, (text, words) in enumerate(zip(self.normalized, self.words)):
+            self.exact.setdefault(text, i)
+            for word in words:
+                self.by_word.setdefault(word, []).append(i)
+        self._cache = {}
+
+    def best_anchor(self, link_text):
+        """Ancre du titre le plus proche de link_text ; None si aucun score suffisant."""
+        try:
+            return self._cache[link_text]
+        except KeyError:
+            pass
+        link_normalized = normalize_text(link_text)
+        index = self.exact.get(link_normalized)
+        if index is None:
+            index = self._search(link_normalized)
+        anchor = None if index is None else self.anchors[index]
+        self._cache[link_text] = anchor
+        return anchor
+
+    def _search(self, link_normalized):
+        link_words = frozenset(link_normalized.split())
+        candidates = set()
+        for word in link_words:
+            candidates.update(self.by_word.get(word, ()))
+        # Inclusion sans mot commun (« instal » dans « install ») : seuls les
+        # titres de longueur compatible avec MIN_RATIO peuvent convenir
+        length = len(link_normalized)
+        if length:
+            low, high = length * MIN_RATIO, length / MIN_RATIO
+            candidates.update(i for i, text in enumerate(self.normalized) if low <= len(text) <= high)
+
+        best, best_score = None, 0
+        # Ordre du document : à score égal, le premier titre l'emporte
+        for i in sorted(candidates):
+            score = match_score(link_normalized, link_words, self.normalized[i], self.words[i])
+            if score > best_score:
+                best, best_score = i, score
+        return best if best_score > MIN_SCORE else None
+
+def file_digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+def anchors_digest(headings):
+    """Empreinte des ancres d'un fichier (ce dont dépendent les liens qui le ciblent)."""
+    return hashlib.sha1("\n".join(anchor for _title, anchor in headings).encode("utf-8")).hexdigest()[:16]
+
+def read_headings(data):
+    return [(h.title, h.anchor) for h in scan_headings(data)]
+
+class LinkIndex:
+    """Index global : chemin relatif → titres ; AnchorIndex construit à la demande."""
+
+    def __init__(self, root, headings):
+        self.root = root
+        self.headings = headings
+        self._indexes = {}
+
+    def get(self, rel):
+        index = self._indexes.get(rel)
+        if index is None and rel in self.headings:
+            index = self._indexes[rel] = AnchorIndex(self.headings[rel])
+        return index
+
+    def digest(self, rel):
+        return anchors_digest(self.headings[rel]) if rel in self.headings else None
+
+def fix_text(text, rel="", index=None):
+    """Vérifie et corrige les liens d'un contenu Markdown en une passe.
+
+    Args:
+        text: contenu du fichier
+        rel: chemin du fichier relatif à la racine (résolution des liens relatifs)
+        index: LinkIndex global (défaut : index des seuls titres de text)
+
+    Returns:
+        (contenu, liens corrigés, problèmes [(ligne, message)], dépendances {cible: empreinte})
+    """
+    if index is None:
+        index = LinkIndex(DOTFILES_DIR, {rel: read_headings(text.encode("utf-8"))})
+    own = index.get(rel) or AnchorIndex([])
+    base_dir = os.path.dirname(rel)
+    fixed = 0
+    issues = []
+    deps = {}
+    line_no = 0
+
+    def resolve_anchor(target_index, link_text, anchor):
+        """Ancre corrigée, ou None si aucun titre ne correspond."""
+        if target_index is None:
+            return None
+        if BACK_TO_TOP_RE.search(normalize(link_text)) and target_index.top:
+            return target_index.top
+        return target_index.best_anchor(link_text)
+
+    def replace_link(match):
+        nonlocal fixed
+        link_text, target = match.group(1), match.group(2)
+        if SCHEME_RE.match(target):
+            return match.group(0)
+        path, _sep, anchor = target.partition('#')
+        anchor = unquote(anchor)
+
+        if not path:
+            if anchor in own.valid:
+                return match.group(0)
+            new_anchor = resolve_anchor(own, link_text, anchor)
+            if new_anchor is None:
+                issues.append((line_no, f"ancre introuvable: #{anchor}"))
+                return match.group(0)
+            fixed += 1
+            return f"[{link_text}](#{new_anchor})"
+
+        decoded = unquote(path)
+        if decoded.startswith('/'):
+            target_rel = os.path.normpath(decoded.lstrip('/'))
+        else:
+            target_rel = os.path.normpath(os.path.join(base_dir, decoded))
+        target_index = index.get(target_rel)
+        if target_index is None and not os.path.exists(os.path.join(index.root, target_rel)):
+            issues.append((line_no, f"fichier introuvable: {path}"))
+            return match.group(0)
+        deps[target_rel] = index.digest(target_rel)
+        if not anchor or target_index is None or anchor in target_index.valid:
+            return match.group(0)
+        new_anchor = resolve_anchor(target_index, link_text, anchor)
+        if new_anchor is None:
+            issues.append((line_no, f"ancre introuvable: {path}#{anchor}"))
+            return match.group(0)
+        fixed += 1
+        return f"[{link_text}]({path}#{new_anchor})"
+
+    out = []
+    fence = None
+    for line in text.splitlines(keepends=True):
+        line_no += 1
+        m = FENCE_RE.match(line)
+        if m:
+            if fence is None:
+                fence = m.group(1)
+            elif m.group(1) == fence:
+                fence = None
+        elif fence is None and '](' in line:
+            # Code en ligne (`...`) : segments impairs laissés tels quels
+            parts = line.split('`')
+            for i in range(0, len(parts), 2):
+                if '](' in parts[i]:
+                    parts[i] = LINK_RE.sub(replace_link, parts[i])
+            line = '`'.join(parts)
+        out.append(line)
+    return "".join(out), fixed, issues, deps
+
+def write_atomic(path, data):
+    """Remplace path par data (même répertoire, rename atomique, droits conservés)."""
+    directory = os.path.dirname(path) or "."
+    mode = os.stat(path).st_mode & 0o7777
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+# --- Exécution (processus du pool) -------------------------------------------
+
+_worker_index = None
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+def _scan_job(job):
+    """Phase 1 : empreinte et titres d'un fichier (titres repris si l'empreinte est connue)."""
+    root, rel, known_digest, known_headings = job
+    path = os.path.join(root, rel)
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = file_digest(data)
+    headings = known_headings if digest == known_digest else read_headings(data)
+    return rel, [st.st_mtime_ns, st.st_size], digest, headings
+
+def _fix_job(job):
+    """Phase 2 : liens d'un fichier ; écrit le fichier s'il a changé (hors --check)."""
+    rel, check = job
+    index = _worker_index
+    path = os.path.join(index.root, rel)
+    with open(path, "rb") as f:
+        data = f.read()
+    new_text, fixed, issues, deps = fix_text(data.decode("utf-8", "replace"), rel, index)
+    new_data = new_text.encode("utf-8")
+    digest = file_digest(data)
+    new_digest = file_digest(new_data)
+    stamp = None
+    if new_digest != digest and not check:
+        write_atomic(path, new_data)
+        digest = new_digest
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+    return rel, fixed, issues, deps, digest, stamp
+
+def _run(func, jobs, workers, index=None):
+    if len(jobs) > 1 and (workers is None or workers > 1):
+        from concurrent.futures import ProcessPoolExecutor
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+            return list(pool.map(func, jobs, chunksize=chunksize))
+    _init_worker(index)
+    return [func(job) for job in jobs]
+
+# --- État entre deux passages ------------------------------------------------
+
+def get_state_path(root):
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    key = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_home, "dotfiles", "links", f"state-{key}.json")
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state.get("files", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+def save_state(path, files):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "files": files}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+# --- Fichiers ----------------------------------------------------------------
+
+def iter_markdown_files(root, paths=None):
+    """Chemins relatifs des .md sous root (ou désignés par paths), triés"""
+    found = set()
+    for path in paths or [root]:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                for name in filenames:
+                    if name.endswith(".md"):
+                        found.add(os.path.relpath(os.path.join(dirpath, name), root))
+        elif os.path.isfile(path):
+            found.add(os.path.relpath(path, root))
+    return sorted(found)
+
+def build_index(root, files, state, workers=None):
+    """Index global des titres ; seuls les fichiers dont (mtime, taille) a changé sont relus."""
+    headings = {}
+    jobs = []
+    for rel in files:
+        entry = state.get(rel)
+        try:
+            st = os.stat(os.path.join(root, rel))
+        except OSError:
+            continue
+        if entry and entry.get("stamp") == [st.st_mtime_ns, st.st_size]:
+            headings[rel] = [tuple(h) for h in entry["headings"]]
+        else:
+            jobs.append((root, rel, entry and entry.get("digest"), entry and entry.get("headings")))
+    for rel, stamp, digest, file_headings in _run(_scan_job, jobs, workers):
+        entry = state.get(rel)
+        if entry is None or entry.get("digest") != digest:
+            # Contenu modifié : le fichier devra être revérifié
+            entry = state[rel] = {"clean": False}
+        entry.update(stamp=stamp, digest=digest, headings=[list(h) for h in file_headings])
+        headings[rel] = [tuple(h) for h in file_headings]
+    return LinkIndex(root, headings)
+
+def is_up_to_date(entry, index):
+    """Fichier sans problème au dernier passage, dont aucune cible n'a changé."""
+    if not entry or not entry.get("clean"):
+        return False
+    for target, digest in entry.get("deps", {}).items():
+        if target in index.headings:
+            if index.digest(target) != digest:
+                return False
+        elif digest is not None or not os.path.exists(os.path.join(index.root, target)):
+            return False
+    return True
+
+def run(root, targets=None, check=False, workers=None, use_cache=True):
+    """Vérifie (et corrige hors check) les liens ; renvoie (résultats, fichiers ignorés, total)."""
+    state_path = get_state_path(root)
+    state = load_state(state_path) if use_cache else {}
+    all_files = iter_markdown_files(root)
+    index = build_index(root, all_files, state, workers)
+    # Fichiers disparus : oubliés
+    for rel in set(state) - set(index.headings):
+        del state[rel]
+
+    files = iter_markdown_files(root, targets) if targets else all_files
+    files = [rel for rel in files if rel in index.headings]
+    todo = [rel for rel in files if not is_up_to_date(state.get(rel), index)]
+    results = _run(_fix_job, [(rel, check) for rel in todo], workers, index)
+
+    for rel, fixed, issues, deps, digest, stamp in results:
+        entry = state[rel]
+        entry.update(clean=not issues and (fixed == 0 or not check), deps=deps, digest=digest)
+        if stamp:
+            entry["stamp"] = stamp
+    if use_cache:
+        save_state(state_path, state)
+    return results, len(files) - len(todo), len(files)
+
+def main(argv=None, default_paths=None):
+    """
+    default_paths : chemins (relatifs à la racine) traités si ni chemin ni
+    --root ne sont donnés ; avec --root seul, tout l'arbre de la racine.
+    """
+    parser = argparse.ArgumentParser(description="Vérifie et corrige les liens internes des fichiers Markdown")
+    parser.add_argument("paths", nargs="*", help="fichiers ou répertoires à traiter (défaut: tout le dépôt)")
+    parser.add_argument("--check", action="store_true", help="lecture seule ; code 1 si un lien est à corriger")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="processus en parallèle (défaut: nombre de CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="ignorer les empreintes du passage précédent")
+    parser.add_argument("--root", help=f"racine du dépôt (défaut: {DOTFILES_DIR})")
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root or DOTFILES_DIR)
+    paths = args.paths
+    if not paths and not args.root:
+        paths = [os.path.join(root, path) for path in default_paths or []]
+    results, skipped, total = run(root, paths, args.check, args.jobs, not args.no_cache)
+    if not total:
+        print(f"❌ Aucun fichier Markdown à traiter sous {root}", file=sys.stderr)
+        return 2
+    total_fixed = total_issues = 0
+    for rel, fixed, issues, _deps, _digest, _stamp in results:
+        if fixed:
+            total_fixed += fixed
+            verb = "à corriger" if args.check else "corrigé(s)"
+            print(f"🔧 {rel} : {fixed} lien(s) {verb}")
+        for line_no, message in issues:
+            total_issues += 1
+            print(f"⚠️  {rel}:{line_no}: {message}")
+
+    verb = "à corriger" if args.check else "corrigés"
+    marker = "⚠️ " if total_fixed or total_issues else "✅"
+    print(f"{marker} {total} fichiers ({skipped} inchangés ignorés), {total_fixed} liens {verb}, "
+          f"{total_issues} non résolus")
+    if args.check and (total_fixed or total_issues):
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
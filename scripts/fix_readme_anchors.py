@@ -1,125 +1,31 @@
 #!/usr/bin/env python3
 """
-Script pour corriger les ancres GitHub dans README.md
-GitHub génère les ancres en :
-- Convertissant en minuscules
-- Remplaçant les espaces par des tirets
-- Supprimant les caractères spéciaux (accents, emojis, guillemets, etc.)
+Script pour corriger les ancres GitHub des liens internes Markdown
+
+Conservé pour compatibilité : le travail est fait par fix_links.py (index
+global des ancres, liens entre fichiers, liens « Retour en haut », --check).
+
+Usage: fix_readme_anchors.py [arguments de fix_links.py]
+       (défaut : README.md du dépôt ; avec --root seul : toute la racine)
 """
 
-import re
+import os
 import sys
 
-def github_anchor(text):
-    """Génère une ancre GitHub à partir d'un titre (règles GitHub)"""
-    # Convertir en minuscules
-    text = text.lower()
-    # Remplacer les espaces par des tirets
-    text = text.replace(' ', '-')
-    # Supprimer les emojis et caractères spéciaux (garder seulement lettres, chiffres, tirets)
-    text = re.sub(r'[^a-z0-9\-]', '', text)
-    # Supprimer les tirets multiples
-    text = re.sub(r'-+', '-', text)
-    # Supprimer les tirets en début/fin
-    text = text.strip('-')
-    return text
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def normalize_text(text):
-    """Normalise un texte pour comparaison (enlève emojis, caractères spéciaux)"""
-    text = text.lower()
-    # Enlever emojis et caractères spéciaux, garder seulement lettres et chiffres
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    # Normaliser les espaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+from fix_links import main  # noqa: E402
+from heading_index import scan_headings  # noqa: E402
 
 def fix_readme_anchors(filepath):
-    """Corrige toutes les ancres dans README.md"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # Étape 1: Extraire tous les titres et créer un mapping
-    headings_map = {}
-    for i, line in enumerate(lines):
-        if line.startswith('## '):
-            heading = line[3:].strip()
-            anchor = github_anchor(heading)
-            headings_map[heading] = anchor
-        elif line.startswith('### '):
-            heading = line[4:].strip()
-            anchor = github_anchor(heading)
-            headings_map[heading] = anchor
-    
-    # Étape 2: Reconstruire le contenu en corrigeant les liens
-    new_lines = []
-    for line in lines:
-        # Si c'est un lien dans la table des matières [texte](#ancor)
-        if re.search(r'\[([^\]]+)\]\(#([^\)]+)\)', line):
-            def replace_link(match):
-                link_text = match.group(1)
-                old_anchor = match.group(2)
-                
-                # Normaliser le texte du lien pour comparaison
-                link_normalized = normalize_text(link_text)
-                
-                # Chercher le titre correspondant dans le mapping
-                best_match = None
-                best_score = 0
-                
-                for heading, correct_anchor in headings_map.items():
-                    heading_normalized = normalize_text(heading)
-                    
-                    # Score de correspondance
-                    score = 0
-                    
-                    # Correspondance exacte
-                    if heading_normalized == link_normalized:
-                        score = 100
-                    # Le texte du lien est dans le titre (et représente au moins 70% du titre)
-                    elif link_normalized in heading_normalized:
-                        ratio = len(link_normalized) / len(heading_normalized) if heading_normalized else 0
-                        if ratio >= 0.7:
-                            score = ratio * 90
-                    # Le titre est dans le texte du lien (et représente au moins 70% du lien)
-                    elif heading_normalized in link_normalized:
-                        ratio = len(heading_normalized) / len(link_normalized) if link_normalized else 0
-                        if ratio >= 0.7:
-                            score = ratio * 90
-                    # Correspondance partielle (mots communs)
-                    else:
-                        link_words = set(link_normalized.split())
-                        heading_words = set(heading_normalized.split())
-                        if link_words and heading_words:
-                            common_words = link_words & heading_words
-                            if common_words:
-                                # Score basé sur le nombre de mots communs
-                                score = (len(common_words) / max(len(link_words), len(heading_words))) * 70
-                                # Bonus si tous les mots du lien sont dans le titre
-                                if link_words.issubset(heading_words):
-                                    score = 85
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_match = (heading, correct_anchor)
-                
-                # Si on a trouvé une bonne correspondance (score > 60)
-                if best_match and best_score > 60:
-                    return f"[{link_text}](#{best_match[1]})"
-                
-                # Sinon, générer l'ancre depuis le texte du lien
-                new_anchor = github_anchor(link_text)
-                return f"[{link_text}](#{new_anchor})"
-            
-            line = re.sub(r'\[([^\]]+)\]\(#([^\)]+)\)', replace_link, line)
-        
-        new_lines.append(line)
-    
-    # Sauvegarder
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.writelines(new_lines)
-    
-    print(f"✅ {len(headings_map)} titres trouvés, ancres corrigées dans {filepath}")
-    return len(headings_map)
+    """
+    Corrige les ancres d'un fichier (ancienne interface) ; renvoie, comme
+    avant, le nombre de titres ## et ### distincts du fichier.
+    """
+    main([filepath])
+    with open(filepath, 'rb') as f:
+        return len({h.title for h in scan_headings(f.read()) if h.level in (2, 3)})
 
 if __name__ == '__main__':
-    fix_readme_anchors('README.md')
+    # Sans chemin : README.md du dépôt seulement, comme l'ancien script
+    sys.exit(main(default_paths=['README.md']))
@@ -1,47 +1,26 @@
 #!/usr/bin/env python3
 """
-Script pour corriger tous les liens "Retour en haut" dans README.md
+Script pour corriger les liens "Retour en haut" des fichiers Markdown
+
+Conservé pour compatibilité : le travail est fait par fix_links.py, qui
+fait pointer chaque lien « Retour en haut » cassé vers le premier titre de
+son fichier, en même temps que la vérification des autres liens.
+
+Usage: fix_return_links.py [arguments de fix_links.py]
+       (défaut : README.md du dépôt ; avec --root seul : toute la racine)
 """
 
-import re
+import os
+import sys
 
-def github_anchor(text):
-    """Génère une ancre GitHub à partir d'un titre"""
-    text = text.lower()
-    text = text.replace(' ', '-')
-    text = re.sub(r'[^a-z0-9\-]', '', text)
-    text = re.sub(r'-+', '-', text)
-    text = text.strip('-')
-    return text
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fix_links import main  # noqa: E402
 
 def fix_return_links(filepath):
-    """Corrige tous les liens Retour en haut dans README.md"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Ancre pour le titre principal
-    main_title_anchor = github_anchor("Dotfiles - PavelDelhomme")
-    # Ancre pour la table des matières
-    toc_anchor = github_anchor("📑 Table des matières")
-    
-    # Remplacer tous les liens "Retour en haut" qui pointent vers des ancres incorrectes
-    # Pattern: [🔝 Retour en haut](#ancor)
-    patterns = [
-        (r'\[🔝 Retour en haut\]\(#retour-en-haut\)', f'[🔝 Retour en haut](#{main_title_anchor})'),
-        (r'\[🔝 Retour en haut\]\(#dotfiles---paveldelhomme\)', f'[🔝 Retour en haut](#{main_title_anchor})'),
-        (r'\[🔝 Retour en haut\]\(#[^\)]+\)', f'[🔝 Retour en haut](#{main_title_anchor})'),
-    ]
-    
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content)
-    
-    # Sauvegarder
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    print(f"✅ Liens 'Retour en haut' corrigés dans {filepath}")
-    print(f"   Tous pointent maintenant vers: #{main_title_anchor}")
+    """Corrige les liens d'un fichier (ancienne interface, sans valeur de retour)"""
+    main([filepath])
 
 if __name__ == '__main__':
-    fix_return_links('README.md')
-
+    # Sans chemin : README.md du dépôt seulement, comme l'ancien script
+    sys.exit(main(default_paths=['README.md']))
@@ -97,6 +97,11 @@ find "$FUNCTIONS_DIR" -type f \( -name "*.sh" -o -name "*.zsh" \) 2>/dev/null |
     done
 done
 
+# Pré-rendu ANSI + roff (seules les pages modifiées sont re-rendues)
+if command -v python3 >/dev/null 2>&1; then
+    DOTFILES_DIR="$DOTFILES_DIR" python3 "$DOTFILES_DIR/zsh/functions/helpman/utils/markdown_viewer.py" --build
+fi
+
 echo ""
 echo -e "${GREEN}✅ Génération terminée${NC}"
 echo ""
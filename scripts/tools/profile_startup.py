@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profileur du démarrage du shell, par fichier sourcé et par fonction
+
+Lance N fois « zsh -i -c exit » (et/ou « bash -i -c exit ») avec une trace
+d'exécution horodatée (xtrace, PS4 avec EPOCHREALTIME et la pile des
+fichiers/fonctions), puis attribue à chaque ligne tracée le temps écoulé
+jusqu'à la suivante :
+- exclusif : au fichier ou à la fonction qui exécute la ligne
+- inclusif : à toute la pile (zshrc → zshrc_custom → help_system.sh → …)
+
+Les commandes d'un fichier sourcé avec « 2>/dev/null » n'apparaissent pas
+dans la trace zsh (elle passe par stderr) : le temps de la ligne « source
+fichier » est alors compté au fichier sourcé, sans détail.
+
+Sorties : médiane et p95 sur les N exécutions (tableau et arbre), piles
+repliées pour flamegraph.pl / speedscope (--folded), comparaison à une
+référence enregistrée (--save-baseline / --baseline, code 1 si régression).
+
+Les temps sont mesurés sous trace : plus lents qu'un démarrage normal,
+mais comparables entre eux.
+
+Usage: profile_startup.py [--shell zsh|bash|all] [--runs N] [--folded FICHIER]
+                          [--save-baseline FICHIER | --baseline FICHIER]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+MARK = "@@"
+TRACE_RE = re.compile(r'^\++' + MARK + r'([0-9.]+)' + MARK + r'(.*?)' + MARK + r'(.*?)' + MARK + r'(.*?)> ?(.*)$')
+SOURCE_RE = re.compile(r'^(?:source|\.)\s+(\S+)')
+
+# Durée maximale d'un démarrage et taille maximale de sa trace (défauts)
+RUN_TIMEOUT = 120
+MAX_TRACE_MB = 512
+
+class ProfileError(Exception):
+    """Démarrage non profilable (délai dépassé, trace trop volumineuse)."""
+
+# zsh : fichier de démarrage appelant (funcfiletrace), pile (funcstack, la plus
+# interne en premier) et fichier courant (%x)
+ZSHENV = r"""zmodload zsh/datetime 2>/dev/null
+setopt prompt_subst
+PS4='+@@${EPOCHREALTIME}@@${funcfiletrace[-1]%:*}|${(j:|:)funcstack}@@%x@@%I> '
+ZDOTDIR="$_PROFILE_ZDOTDIR"
+[ -f "$ZDOTDIR/.zshenv" ] && source "$ZDOTDIR/.zshenv"
+ZDOTDIR="$_PROFILE_TMPDIR"
+setopt xtrace
+"""
+ZSHRC = r"""ZDOTDIR="$_PROFILE_ZDOTDIR"
+[ -f "$ZDOTDIR/.zshrc" ] && source "$ZDOTDIR/.zshrc"
+"""
+# bash : trace sur un descripteur dédié (BASH_XTRACEFD), insensible aux 2>/dev/null
+BASHRC = r"""exec {_PROFILE_FD}>>"$_PROFILE_TRACE"
+BASH_XTRACEFD=$_PROFILE_FD
+PS4='+@@${EPOCHREALTIME}@@${FUNCNAME[*]}@@${BASH_SOURCE[*]}@@${LINENO}> '
+set -x
+[ -f "$HOME/.bashrc" ] && source "$HOME/.bashrc"
+"""
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+def frame_name(path, home):
+    """Nom lisible d'un fichier : relatif à ~/dotfiles, sinon avec ~."""
+    dotfiles = os.path.join(home, "dotfiles")
+    if path.startswith(dotfiles + "/"):
+        return path[len(dotfiles) + 1:]
+    if path.startswith(home + "/"):
+        return "~" + path[len(home):]
+    return path
+
+def zsh_stack(stack_field, current_file, home):
+    root, _, funcstack = stack_field.partition("|")
+    if not funcstack:
+        return [frame_name(current_file, home)] if current_file else ["<zsh>"]
+    frames = [frame_name(root, home)] if root else []
+    for item in reversed(funcstack.split("|")):
+        frames.append(frame_name(item, home) if "/" in item else f"{item}()")
+    return frames
+
+def bash_stack(funcs_field, sources_field, home):
+    funcs = funcs_field.split()
+    sources = sources_field.split()
+    if not sources:
+        return ["<bash>"]
+    if not funcs:
+        # Hors fonction, FUNCNAME est vide : BASH_SOURCE est la pile des fichiers
+        return [frame_name(source, home) for source in reversed(sources)]
+    if len(funcs) != len(sources):
+        # Chemin avec espaces : pile inexploitable, fichier courant seul
+        return [frame_name(sources[0], home)] if sources else ["<bash>"]
+    frames = []
+    for func, source in zip(reversed(funcs), reversed(sources)):
+        if func in ("source", "main"):
+            frames.append(frame_name(source, home))
+        else:
+            frames.append(f"{func}()")
+    return frames
+
+def parse_trace(lines, shell, home, end_time=None, hidden=None):
+    """
+    Temps exclusif par pile {(cadre, …): secondes} d'une exécution.
+
+    La dernière ligne tracée dure jusqu'à end_time (fin du processus) si fourni ;
+    les cadres commençant par hidden (fichiers de trace temporaires) sont omis.
+    """
+    exclusive = defaultdict(float)
+
+    def attribute(event, next_stamp, next_stack):
+        stamp, stack, command = event
+        path = stack
+        # « source fichier » dont les lignes ne sont pas tracées : cadre ajouté
+        m = SOURCE_RE.match(command)
+        if m and not (len(next_stack) > len(stack) and next_stack[:len(stack)] == stack):
+            path = stack + (frame_name(m.group(1).strip("'\""), home),)
+        exclusive[path] += next_stamp - stamp
+
+    # Lecture en flux : seul l'événement précédent est gardé en mémoire
+    previous = None
+    for line in lines:
+        m = TRACE_RE.match(line.rstrip("\n"))
+        if m is None:
+            continue
+        try:
+            stamp = float(m.group(1))
+        except ValueError:
+            continue
+        if shell == "zsh":
+            stack = zsh_stack(m.group(2), m.group(3), home)
+        else:
+            stack = bash_stack(m.group(2), m.group(3), home)
+        if hidden:
+            stack = [frame for frame in stack if not frame.startswith(hidden)]
+        event = (stamp, tuple(stack), m.group(5))
+        if previous is not None:
+            attribute(previous, stamp, event[1])
+        previous = event
+    if previous is not None and end_time is not None:
+        attribute(previous, max(end_time, previous[0]), ())
+    return exclusive
+
+def aggregate(exclusive):
+    """Temps par cadre (inclusif, exclusif) et par chemin de l'arbre (inclusif) d'une exécution."""
+    inclusive = defaultdict(float)
+    own = defaultdict(float)
+    tree = defaultdict(float)
+    for path, seconds in exclusive.items():
+        if not path:
+            continue
+        own[path[-1]] += seconds
+        # Récursion : un cadre présent deux fois dans la pile n'est compté qu'une fois
+        for frame in set(path):
+            inclusive[frame] += seconds
+        for depth in range(1, len(path) + 1):
+            tree[path[:depth]] += seconds
+    return inclusive, own, tree
+
+def run_once(shell, tmpdir, home, timeout=RUN_TIMEOUT, max_trace_mb=MAX_TRACE_MB):
+    """
+    Exécute un démarrage tracé ; renvoie (temps exclusifs par pile, durée totale).
+
+    Lève ProfileError si le démarrage dépasse timeout secondes ou si sa trace
+    dépasse max_trace_mb Mo (boucle au démarrage, HOME de test…).
+    """
+    trace_path = os.path.join(tmpdir, f"trace-{shell}.log")
+    env = dict(os.environ)
+    if shell == "zsh":
+        env["_PROFILE_ZDOTDIR"] = os.environ.get("ZDOTDIR", env.get("HOME", ""))
+        env["_PROFILE_TMPDIR"] = tmpdir
+        env["ZDOTDIR"] = tmpdir
+        argv = ["zsh", "-i", "-c", "exit"]
+    else:
+        env["_PROFILE_TRACE"] = trace_path
+        argv = ["bash", "--rcfile", os.path.join(tmpdir, "bashrc"), "-i", "-c", "exit"]
+
+    with open(trace_path, "w", encoding="utf-8") as trace:
+        stderr = trace if shell == "zsh" else subprocess.DEVNULL
+        start = time.perf_counter()
+        wall_start = time.time()
+        try:
+            subprocess.run(argv, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=stderr, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ProfileError(f"{shell} : démarrage non terminé après {timeout:g} s") from None
+        elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(trace_path) / (1024 * 1024)
+    if size_mb > max_trace_mb:
+        raise ProfileError(f"{shell} : trace de {size_mb:.0f} Mo (limite {max_trace_mb:g} Mo, --max-trace-mb)")
+    with open(trace_path, encoding="utf-8", errors="replace") as f:
+        exclusive = parse_trace(f, shell, home, wall_start + elapsed, hidden=tmpdir)
+    os.unlink(trace_path)
+    return exclusive, elapsed
+
+def profile(shell, runs, home, timeout=RUN_TIMEOUT, max_trace_mb=MAX_TRACE_MB):
+    """Profil de N démarrages : {total, frames, tree, folded}."""
+    tmpdir = tempfile.mkdtemp(prefix="profile_startup_")
+    try:
+        for name, text in ((".zshenv", ZSHENV), (".zshrc", ZSHRC), ("bashrc", BASHRC)):
+            with open(os.path.join(tmpdir, name), "w", encoding="utf-8") as f:
+                f.write(text)
+        totals = []
+        per_run = []
+        for _ in range(runs):
+            exclusive, elapsed = run_once(shell, tmpdir, home, timeout, max_trace_mb)
+            totals.append(elapsed)
+            per_run.append(exclusive)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    inclusive_runs = []
+    own_runs = []
+    tree_runs = []
+    folded = defaultdict(float)
+    for exclusive in per_run:
+        inclusive, own, tree = aggregate(exclusive)
+        inclusive_runs.append(inclusive)
+        own_runs.append(own)
+        tree_runs.append(tree)
+        for path, seconds in exclusive.items():
+            folded[path] += seconds / runs
+
+    def summary(samples_by_run):
+        keys = set()
+        for samples in samples_by_run:
+            keys.update(samples)
+        # Cadre absent d'une exécution : 0 pour celle-ci
+        return {key: [samples.get(key, 0.0) for samples in samples_by_run] for key in keys}
+
+    return {
+        "runs": runs,
+        "total": totals,
+        "inclusive": summary(inclusive_runs),
+        "exclusive": summary(own_runs),
+        "tree": summary(tree_runs),
+        "folded": folded,
+    }
+
+def ms(seconds):
+    return seconds * 1000
+
+def print_report(shell, result, top, depth, min_ms):
+    totals = result["total"]
+    print("━" * 78)
+    print(f"📊 {shell} -i -c exit — {result['runs']} exécutions (sous trace) : "
+          f"médiane {ms(statistics.median(totals)):.1f} ms, p95 {ms(percentile(totals, 95)):.1f} ms")
+    print("━" * 78)
+    print(f"{'inclusif méd':>12} {'p95':>8} {'exclusif méd':>13} {'p95':>8}  fichier / fonction")
+    inclusive, exclusive = result["inclusive"], result["exclusive"]
+    ranked = sorted(inclusive, key=lambda k: statistics.median(inclusive[k]), reverse=True)
+    for frame in ranked[:top]:
+        inc = inclusive[frame]
+        exc = exclusive.get(frame, [0.0])
+        print(f"{ms(statistics.median(inc)):10.1f}ms {ms(percentile(inc, 95)):6.1f}ms "
+              f"{ms(statistics.median(exc)):11.1f}ms {ms(percentile(exc, 95)):6.1f}ms  {frame}")
+
+    print()
+    print(f"🌳 Arbre (inclusif médian, profondeur {depth}, ≥ {min_ms} ms)")
+    tree = {path: statistics.median(values) for path, values in result["tree"].items()}
+    children = defaultdict(list)
+    for path in tree:
+        if len(path) <= depth:
+            children[path[:-1]].append(path)
+
+    def walk(parent, indent):
+        for path in sorted(children.get(parent, ()), key=tree.get, reverse=True):
+            if ms(tree[path]) < min_ms:
+                continue
+            print(f"{'  ' * indent}{ms(tree[path]):8.1f} ms  {path[-1]}")
+            walk(path, indent + 1)
+    walk((), 0)
+    print()
+
+def write_folded(path, results):
+    """Piles repliées (« a;b;c µs ») : moyenne par exécution, préfixées par le shell."""
+    with open(path, "w", encoding="utf-8") as f:
+        for shell, result in results.items():
+            for stack, seconds in sorted(result["folded"].items()):
+                micros = int(round(seconds * 1e6))
+                if micros > 0 and stack:
+                    frames = [shell] + [frame.replace(";", ":").replace(" ", "_") for frame in stack]
+                    f.write(f"{';'.join(frames)} {micros}\n")
+
+def baseline_data(results):
+    data = {}
+    for shell, result in results.items():
+        data[shell] = {
+            "total": [ms(statistics.median(result["total"])), ms(percentile(result["total"], 95))],
+            "frames": {frame: [ms(statistics.median(values)), ms(percentile(values, 95))]
+                       for frame, values in result["inclusive"].items()},
+        }
+    return data
+
+def compare_baseline(results, baseline, threshold, min_delta):
+    """Affiche les régressions (médiane inclusive) ; renvoie leur nombre."""
+    current = baseline_data(results)
+    regressions = 0
+    for shell, data in current.items():
+        reference = baseline.get(shell)
+        if reference is None:
+            print(f"ℹ️  {shell} : absent de la référence")
+            continue
+        rows = [("(total)", reference["total"], data["total"])]
+        rows += [(frame, reference["frames"].get(frame, [0.0, 0.0]), values)
+                 for frame, values in data["frames"].items()]
+        print(f"🔎 {shell} : comparaison à la référence (seuil +{threshold:g} % et +{min_delta:g} ms)")
+        flagged = []
+        for frame, (old, _old_p95), (new, _new_p95) in rows:
+            delta = new - old
+            if delta >= min_delta and new > old * (1 + threshold / 100):
+                flagged.append((delta, frame, old, new))
+        for delta, frame, old, new in sorted(flagged, reverse=True):
+            print(f"  ❌ {frame:<50} {old:8.1f} → {new:8.1f} ms (+{delta:.1f})")
+        if not flagged:
+            print("  ✅ aucune régression")
+        regressions += len(flagged)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Profileur du démarrage du shell (par fichier et par fonction)")
+    parser.add_argument("--shell", choices=("zsh", "bash", "all"), default="zsh", help="shell profilé (défaut: zsh)")
+    parser.add_argument("--runs", type=int, default=10, help="démarrages par shell (défaut: 10)")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT, help=f"durée maximale d'un démarrage, en s (défaut: {RUN_TIMEOUT})")
+    parser.add_argument("--max-trace-mb", type=float, default=MAX_TRACE_MB, help=f"taille maximale d'une trace, en Mo (défaut: {MAX_TRACE_MB})")
+    parser.add_argument("--top", type=int, default=25, help="lignes du tableau (défaut: 25)")
+    parser.add_argument("--depth", type=int, default=4, help="profondeur de l'arbre (défaut: 4)")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="masquer les nœuds de l'arbre sous ce temps (défaut: 2)")
+    parser.add_argument("--folded", metavar="FICHIER", help="écrire les piles repliées (flamegraph)")
+    parser.add_argument("--save-baseline", metavar="FICHIER", help="enregistrer ce profil comme référence (JSON)")
+    parser.add_argument("--baseline", metavar="FICHIER", help="comparer à une référence ; code 1 si régression")
+    parser.add_argument("--threshold", type=float, default=20.0, help="hausse relative signalée, en %% (défaut: 20)")
+    parser.add_argument("--min-delta", type=float, default=5.0, help="hausse absolue minimale signalée, en ms (défaut: 5)")
+    args = parser.parse_args()
+
+    shells = ["zsh", "bash"] if args.shell == "all" else [args.shell]
+    home = os.path.expanduser("~")
+    results = {}
+    for shell in shells:
+        if shutil.which(shell) is None:
+            print(f"⚠️  {shell} introuvable : ignoré", file=sys.stderr)
+            continue
+        try:
+            results[shell] = profile(shell, args.runs, home, args.timeout, args.max_trace_mb)
+        except ProfileError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        print_report(shell, results[shell], args.top, args.depth, args.min_ms)
+    if not results:
+        print("❌ Aucun shell à profiler", file=sys.stderr)
+        return 2
+
+    if args.folded:
+        write_folded(args.folded, results)
+        print(f"🔥 Piles repliées : {args.folded} (flamegraph.pl {args.folded} > startup.svg)")
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline_data(results), f, ensure_ascii=False, indent=1)
+        print(f"💾 Référence enregistrée : {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare_baseline(results, baseline, args.threshold, args.min_delta):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
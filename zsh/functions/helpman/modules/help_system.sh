@@ -33,12 +33,24 @@ mkdir -p "$DOC_DIR" "$MAN_DIR"
 show_function_help() {
     local func_name="$1"
     local func_file=""
+    local python_client="$HELPMAN_DIR/utils/helpman_client.py"
     
-    # Chercher la fonction dans les fichiers sources
+    # Recherche indexée via le serveur helpman (démarré au besoin, repli ponctuel)
+    if [ -f "$python_client" ] && command -v python3 >/dev/null 2>&1; then
+        if DOTFILES_DIR="$DOTFILES_DIR" python3 -S "$python_client" lookup "$func_name" --man-dir "$MAN_DIR" 2>/dev/null; then
+            return 0
+        fi
+        echo "❌ Fonction '$func_name' non trouvée ou non documentée"
+        echo ""
+        echo "💡 Astuce: Utilisez 'help' pour lister toutes les fonctions disponibles"
+        return 1
+    fi
+    
+    # Fallback sans Python : chercher la fonction dans les fichiers sources
     if [ -n "$ZSH_VERSION" ]; then
         func_file=$(grep -r "^${func_name}()" "$DOTFILES_DIR/zsh/functions" 2>/dev/null | head -1 | cut -d: -f1)
     fi
-    
+
     # Si on trouve un fichier, extraire la documentation
     if [ -f "$func_file" ]; then
         # Extraire les commentaires DESC et USAGE
@@ -85,11 +97,13 @@ show_function_help() {
 
 # Fonction pour lister toutes les fonctions disponibles
 # DESC: Liste toutes les fonctions personnalisées disponibles avec leurs descriptions, organisées par catégories.
-# USAGE: list_functions
+# USAGE: list_functions [--search <terme>]
 # EXAMPLE: list_functions
+# EXAMPLE: list_functions --search archive
 list_functions() {
-    # Utiliser le script Python pour un affichage correct
+    # Utiliser le script Python pour un affichage correct (via le serveur helpman)
     local python_script="$HELPMAN_DIR/utils/list_functions.py"
+    local python_client="$HELPMAN_DIR/utils/helpman_client.py"
     
     # S'assurer que DOTFILES_DIR est défini
     if [ -z "$DOTFILES_DIR" ]; then
@@ -104,8 +118,12 @@ list_functions() {
     if [ -f "$python_script" ] && command -v python3 >/dev/null 2>&1; then
         # Exporter les variables nécessaires
         export DOTFILES_DIR COLUMNS
-        # Exécuter le script Python
-        python3 "$python_script" 2>&1
+        # Exécuter le script Python (client léger : même sortie que list_functions.py)
+        if [ -f "$python_client" ]; then
+            python3 -S "$python_client" "$@" 2>&1
+        else
+            python3 "$python_script" "$@" 2>&1
+        fi
     else
         # Fallback vers la version shell si Python n'est pas disponible
         echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -124,11 +142,15 @@ list_functions() {
 
 # Fonction help principale
 # DESC: Système d'aide principal. Liste toutes les fonctions ou affiche l'aide pour une fonction spécifique.
-# USAGE: help [function_name]
+# USAGE: help [function_name | --list | --search <terme>]
 # EXAMPLE: help extract
+# EXAMPLE: help --search archive
 help() {
-    if [ -z "$1" ]; then
+    if [ -z "$1" ] || [ "$1" = "--list" ]; then
         list_functions
+    elif [ "$1" = "--search" ]; then
+        shift
+        list_functions --search "$*"
     else
         show_function_help "$1"
     fi
@@ -153,6 +175,23 @@ create_man_page() {
     
     # Essayer différentes méthodes d'affichage selon les outils disponibles
     
+    # Méthode 0: page pré-rendue (make prerender-man), si plus récente que la source
+    local pages_dir="${HELPMAN_PAGES_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/dotfiles/helpman/pages}"
+    local prebuilt_roff="$pages_dir/roff/man/${func_name}.1"
+    local prebuilt_ansi="$pages_dir/ansi/man/${func_name}.ansi"
+    if [ -f "$prebuilt_roff" ] && [ "$prebuilt_roff" -nt "$man_file" ]; then
+        # man -l : man-db (Linux) ; sinon repli sur la version ANSI
+        command man -l "$prebuilt_roff" 2>/dev/null && return 0
+    fi
+    if [ -f "$prebuilt_ansi" ] && [ "$prebuilt_ansi" -nt "$man_file" ]; then
+        if command -v less >/dev/null 2>&1; then
+            LESSCHARSET=utf-8 less -R "$prebuilt_ansi"
+        else
+            cat "$prebuilt_ansi"
+        fi
+        return 0
+    fi
+    
     # Méthode 1: bat pour afficher avec coloration Markdown (MEILLEUR CHOIX)
     if command -v bat >/dev/null 2>&1; then
         # bat supporte nativement UTF-8 et Markdown avec couleurs
@@ -201,7 +240,12 @@ create_man_page() {
     # Méthode 7: Script Python personnalisé (fallback avec UTF-8 et couleurs)
     local python_viewer="$HELPMAN_DIR/utils/markdown_viewer.py"
     if [ -f "$python_viewer" ] && command -v python3 >/dev/null 2>&1; then
-        python3 "$python_viewer" "$man_file" 2>/dev/null
+        # Rendu en flux : less affiche le premier écran immédiatement
+        if command -v less >/dev/null 2>&1; then
+            python3 "$python_viewer" "$man_file" 2>/dev/null | less -R
+        else
+            python3 "$python_viewer" "$man_file" 2>/dev/null
+        fi
         return 0
     fi
     
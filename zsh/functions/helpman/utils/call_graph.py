@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Graphe d'appels statique des fonctions shell (racines de function_index)
+
+Les définitions viennent de function_scanner (le scanner de list_functions.py).
+Dans le corps d'une fonction, un appel est un nom de fonction connue en
+position de commande : début de ligne, après ;, &&, ||, |, &, $( ou `, après
+une branche de case, if/then/else/do… ; le mot qui suit command, builtin ou
+exec n'est jamais un appel de fonction. Hors fonction (alias, compdef,
+bindkey…), tout mot qui nomme une fonction compte comme une référence.
+
+Sorties :
+- le graphe (appelants / appelés)
+- les groupes fortement connexes (récursion mutuelle)
+- les fonctions injoignables : ni publiques (sans « _ » initial), ni
+  référencées hors fonction (alias, compdef…), ni appelées depuis celles-ci
+- l'ensemble de chargement transitif de chaque manager (fonctions et
+  fichiers à sourcer en plus des siens pour un chargement différé)
+
+Incrémental : les mots de chaque fichier sont mis en cache avec (mtime, taille)
+dans $XDG_CACHE_HOME/dotfiles/helpman ; seuls les fichiers modifiés sont
+relus. Export : --json / --dot.
+
+Usage: call_graph.py [--root DIR ...] [--manager NOM] [--json FICHIER|-] [--dot FICHIER]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+from collections import defaultdict
+
+from function_index import FUNC_EXTENSIONS, get_cache_dir, get_default_roots, iter_function_files
+from function_scanner import scan_bytes
+
+# Incrémenter à chaque changement du format des entrées
+GRAPH_VERSION = 3
+
+COMMENT_RE = re.compile(rb'(?:^|(?<=\s))#.*')
+QUOTED_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"|\'([^\']*)\'')
+SUBST_RE = re.compile(rb'\$\(([^()]*)\)')
+SINGLE_WORD_RE = re.compile(rb'\s*[A-Za-z_]\w*\s*$')
+# Mot isolé : ni variable ($x, ${x}), ni chemin (a/b, x.sh), ni affectation (x=), ni définition (x())
+WORD_RE = re.compile(rb'(?<![\w$\-./{])[A-Za-z_]\w*(?![\w\-./=(])')
+# Découpage en séparateurs de commandes et en mots
+TOKEN_RE = re.compile(rb';;|&&|\|\||\$\(|[;|&()`{}]|[^\s;|&()`{}]+')
+SEPARATORS = frozenset((b';;', b'&&', b'||', b'$(', b';', b'|', b'&', b'(', b')', b'`', b'{', b'}'))
+NAME_RE = re.compile(rb'[A-Za-z_]\w*$')
+ASSIGN_RE = re.compile(rb'[A-Za-z_]\w*(?:\[[^\]]*\])?\+?=')
+# Motif de branche de case en début de ligne : « install|-i) »
+CASE_PATTERN_RE = re.compile(rb'^\s*\(?[^\s()`;|&]+(?:\|[^\s()`;|&]+)*\)')
+# Mots après lesquels on reste en position de commande
+PREFIX_WORDS = frozenset(b"if then else elif while until do time noglob ! and or not".split())
+# Le mot suivant désigne une commande externe ou un builtin, pas une fonction
+BYPASS_WORDS = frozenset((b"command", b"builtin", b"exec"))
+# Début de heredoc (« <<EOF », « <<-'EOF' », pas « <<< ») : texte jusqu'au délimiteur
+HEREDOC_RE = re.compile(rb'(?<!<)<<(?!<)-?\s*([\'"]?)([A-Za-z_]\w*)\1')
+NESTED_DEF_RE = re.compile(rb'^\s+(?:function\s+)?([A-Za-z_]\w*)\s*\(\)\s*\{?')
+CLOSE_RE = re.compile(rb'^\}\s*(?:#.*)?$')
+FISH_END_RE = re.compile(rb'^end\s*(?:#.*)?$')
+
+# Mots-clés et builtins : jamais des appels de fonctions du dépôt
+SHELL_WORDS = frozenset(
+    b"if then else elif fi for in do done while until case esac function return local "
+    b"export typeset declare readonly echo printf set unset shift source eval exec test "
+    b"true false break continue read cd end not and or begin switch".split()
+)
+
+def get_dotfiles_dir():
+    return os.environ.get("DOTFILES_DIR", os.path.expanduser("~/dotfiles"))
+
+def get_cache_path(roots):
+    key = hashlib.sha1("\n".join(os.path.abspath(r) for r in roots).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(get_cache_dir(), f"call_graph-{key}.json")
+
+def _unquote(m):
+    # Chaîne d'un seul mot (table de dispatch, eval) conservée ;
+    # sinon seules les substitutions $(...) d'une chaîne "..." comptent
+    text = m.group(1) if m.group(1) is not None else m.group(2)
+    if SINGLE_WORD_RE.match(text):
+        return b' ' + text + b' '
+    if m.group(1) is None:
+        return b' '
+    return b' ' + b' '.join(b'$(' + sub + b')' for sub in SUBST_RE.findall(text)) + b' '
+
+def _clean(line):
+    return COMMENT_RE.sub(b'', QUOTED_RE.sub(_unquote, line))
+
+def _words(line, out):
+    """Tous les mots nommant potentiellement une fonction (code hors fonction)."""
+    for word in WORD_RE.findall(_clean(line)):
+        if word not in SHELL_WORDS:
+            out.add(word.decode('ascii'))
+
+def _commands(line, out):
+    """Mots en position de commande (appels possibles dans un corps de fonction)."""
+    line = CASE_PATTERN_RE.sub(b' ', _clean(line), count=1)
+    expect = True
+    bypass = False
+    for token in TOKEN_RE.findall(line):
+        if token in SEPARATORS:
+            expect = True
+            bypass = False
+            continue
+        if not expect:
+            continue
+        if bypass:
+            # « command git … » : la fonction git n'est pas appelée
+            expect = bypass = False
+            continue
+        if ASSIGN_RE.match(token) or token in PREFIX_WORDS:
+            continue
+        if token in BYPASS_WORDS:
+            bypass = True
+            continue
+        if NAME_RE.match(token) and token not in SHELL_WORDS:
+            out.add(token.decode('ascii'))
+        expect = False
+
+def analyze_bytes(data, fish=False):
+    """
+    Découpe un fichier en fonctions : {"defs": [[nom, ligne]], "nested": {nom: [noms]},
+    "words": {nom: [mots]}, "top": [mots hors fonction]}.
+
+    Une fonction court de sa définition jusqu'à une accolade fermante en
+    colonne 0 (« end » en fish), une définition sur une ligne, ou la
+    définition suivante. Les fonctions imbriquées (indentées) sont rattachées
+    à la fonction englobante.
+    """
+    lines = data.split(b'\n')
+    defs = scan_bytes(data, fish=fish)
+    starts = {func.line: func.name for func in defs}
+    close_match = FISH_END_RE.match if fish else CLOSE_RE.match
+    words = defaultdict(set)
+    nested = defaultdict(set)
+    top = set()
+    current = None
+    heredoc = None
+    for lineno, line in enumerate(lines, 1):
+        if heredoc is not None:
+            if line.strip() == heredoc:
+                heredoc = None
+            continue
+        m = HEREDOC_RE.search(COMMENT_RE.sub(b'', line)) if b'<<' in line else None
+        if m:
+            heredoc = m.group(2)
+        name = starts.get(lineno)
+        if name is not None:
+            current = name
+            body = line.split(b'{', 1)[1] if b'{' in line else b''
+            _commands(body, words[name])
+            # Définition sur une ligne : « f() { …; } »
+            if not fish and b'{' in line and line.count(b'}') >= line.count(b'{'):
+                current = None
+            continue
+        if current is None:
+            _words(line, top)
+            continue
+        if close_match(line):
+            current = None
+            continue
+        m = NESTED_DEF_RE.match(line)
+        if m and m.group(1) not in SHELL_WORDS:
+            nested[current].add(m.group(1).decode('ascii'))
+        _commands(line, words[current])
+    return {
+        "defs": [[func.name, func.line] for func in defs],
+        "nested": {name: sorted(names) for name, names in nested.items()},
+        "words": {name: sorted(found) for name, found in words.items()},
+        "top": sorted(top),
+    }
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != GRAPH_VERSION or not isinstance(data.get("files"), dict):
+        return {}
+    return data["files"]
+
+def _save_cache(cache_path, files):
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".call_graph-", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": GRAPH_VERSION, "files": files}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except (OSError, NameError):
+            pass
+
+def load_files(roots, base_dir, use_cache=True):
+    """
+    Analyse des fichiers des racines : ({chemin relatif à base_dir: entrée}, nb ré-analysés).
+
+    Les entrées dont (mtime, taille) n'ont pas changé viennent du cache.
+    """
+    cache_path = get_cache_path(roots)
+    cached = _load_cache(cache_path) if use_cache else {}
+    files = {}
+    rescanned = 0
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for rel_root, st in sorted(iter_function_files(root)):
+            path = os.path.join(root, rel_root)
+            rel_path = os.path.relpath(path, base_dir)
+            if rel_path in files:
+                continue
+            entry = cached.get(rel_path)
+            if entry is None or entry.get("mtime") != st.st_mtime_ns or entry.get("size") != st.st_size:
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                entry = dict(analyze_bytes(data, fish=path.endswith(".fish")),
+                             mtime=st.st_mtime_ns, size=st.st_size)
+                rescanned += 1
+            files[rel_path] = entry
+    if use_cache and (rescanned or len(files) != len(cached)):
+        _save_cache(cache_path, files)
+    return files, rescanned
+
+class CallGraph:
+    """Graphe nom → noms appelés, construit à partir des entrées de load_files."""
+
+    def __init__(self, files):
+        self.files = files
+        self.defined = defaultdict(list)      # nom → [(fichier, ligne)]
+        for rel_path, entry in files.items():
+            for name, line in entry["defs"]:
+                self.defined[name].append((rel_path, line))
+            for outer, names in entry["nested"].items():
+                for name in names:
+                    self.defined.setdefault(name, [])
+                    if (rel_path, 0) not in self.defined[name]:
+                        self.defined[name].append((rel_path, 0))
+
+        known = self.defined
+        self.calls = defaultdict(set)
+        self.top_refs = defaultdict(set)      # fichier → noms référencés hors fonction
+        for rel_path, entry in files.items():
+            for name, found in entry["words"].items():
+                self.calls[name].update(w for w in found if w in known and w != name)
+                if name in found:
+                    self.calls[name].add(name)
+            for outer, names in entry["nested"].items():
+                self.calls[outer].update(names)
+            self.top_refs[rel_path] = {w for w in entry["top"] if w in known}
+
+        self.callers = defaultdict(set)
+        for name, callees in self.calls.items():
+            for callee in callees:
+                if callee != name:
+                    self.callers[callee].add(name)
+
+    def closure(self, names):
+        """Fonctions atteignables depuis names (incluses)."""
+        seen = set()
+        stack = [n for n in names if n in self.defined]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.calls.get(name, ()))
+        return seen
+
+    def strongly_connected(self):
+        """Groupes fortement connexes de plus d'une fonction, ou fonctions récursives (Tarjan itératif)."""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        groups = []
+        counter = 0
+        for start in sorted(self.defined):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(self.calls.get(start, ()))))]
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.calls.get(child, ())))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in self.calls.get(node, ()):
+                        groups.append(sorted(group))
+        return sorted(groups, key=lambda g: (-len(g), g))
+
+    def roots(self, entries=()):
+        """Points d'entrée : fonctions publiques, références hors fonction, entries."""
+        result = {name for name in self.defined if not name.startswith("_")}
+        for refs in self.top_refs.values():
+            result |= refs
+        result.update(n for n in entries if n in self.defined)
+        return result
+
+    def unreachable(self, entries=()):
+        return sorted(set(self.defined) - self.closure(self.roots(entries)))
+
+    def unreferenced(self):
+        """Fonctions sans aucun appelant ni référence hors fonction."""
+        referenced = set(self.callers)
+        for refs in self.top_refs.values():
+            referenced |= refs
+        return sorted(set(self.defined) - referenced)
+
+def manager_files(files, manager):
+    """Fichiers d'un manager : zsh/functions/<m>.zsh, zsh/functions/<m>/**, core/managers/<m>/**."""
+    prefixes = (f"zsh/functions/{manager}/", f"core/managers/{manager}/")
+    singles = {f"zsh/functions/{manager}{ext}" for ext in FUNC_EXTENSIONS}
+    return sorted(p for p in files if p in singles or p.startswith(prefixes))
+
+def find_managers(files):
+    managers = set()
+    for rel_path in files:
+        parts = rel_path.split("/")
+        if parts[:2] == ["core", "managers"] and len(parts) > 3:
+            managers.add(parts[2])
+        elif parts[:2] == ["zsh", "functions"] and len(parts) == 3:
+            stem = parts[2].rsplit(".", 1)[0]
+            if stem.endswith("man"):
+                managers.add(stem)
+    return sorted(managers)
+
+def load_set(graph, manager):
+    """
+    Ensemble de chargement transitif d'un manager :
+    {"files", "functions", "closure", "external", "load_files"}.
+    """
+    own_files = manager_files(graph.files, manager)
+    own = set()
+    entries = set()
+    for rel_path in own_files:
+        entry = graph.files[rel_path]
+        own.update(name for name, _line in entry["defs"])
+        entries |= graph.top_refs.get(rel_path, set())
+    closure = graph.closure(own | entries)
+    external = sorted(closure - own)
+    needed = set()
+    for name in external:
+        defs = graph.defined.get(name) or []
+        # Première définition hors manager (ordre des racines)
+        for rel_path, _line in defs:
+            if rel_path not in own_files:
+                needed.add(rel_path)
+                break
+    return {
+        "files": own_files,
+        "functions": sorted(own),
+        "closure": sorted(closure),
+        "external": external,
+        "load_files": sorted(needed),
+    }
+
+def to_json(graph, managers, entries=()):
+    return {
+        "version": GRAPH_VERSION,
+        "functions": {
+            name: {
+                "defined": [[p, line] for p, line in graph.defined[name]],
+                "calls": sorted(graph.calls.get(name, ())),
+                "callers": sorted(graph.callers.get(name, ())),
+            }
+            for name in sorted(graph.defined)
+        },
+        "top_level_refs": {p: sorted(refs) for p, refs in sorted(graph.top_refs.items()) if refs},
+        "strongly_connected": graph.strongly_connected(),
+        "unreachable": graph.unreachable(entries),
+        "unreferenced": graph.unreferenced(),
+        "managers": {m: load_set(graph, m) for m in managers},
+    }
+
+def _dot_id(name):
+    return '"' + name.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def to_dot(graph, names=None):
+    """Graphe DOT (restreint à names si fourni) ; les groupes récursifs sont en rouge."""
+    names = set(graph.defined) if names is None else set(names)
+    cyclic = {n for group in graph.strongly_connected() for n in group}
+    lines = ["digraph calls {", "  rankdir=LR;", "  node [shape=box, fontsize=10];"]
+    for name in sorted(names):
+        attrs = ' [color=red]' if name in cyclic else ''
+        lines.append(f"  {_dot_id(name)}{attrs};")
+    for name in sorted(names):
+        for callee in sorted(graph.calls.get(name, ())):
+            if callee in names:
+                lines.append(f"  {_dot_id(name)} -> {_dot_id(callee)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def print_report(graph, managers, rescanned, entries=(), limit=20):
+    edges = sum(len(c) for c in graph.calls.values())
+    print("━" * 78)
+    print(f"🕸️  GRAPHE D'APPELS : {len(graph.defined)} fonctions, {edges} appels, "
+          f"{len(graph.files)} fichiers ({rescanned} ré-analysés)")
+    print("━" * 78)
+    print()
+
+    groups = graph.strongly_connected()
+    print(f"🔁 Groupes fortement connexes (récursion) : {len(groups)}")
+    for group in groups[:limit]:
+        print(f"  • {' ↔ '.join(group)}")
+    if len(groups) > limit:
+        print(f"  … {len(groups) - limit} autres (--json pour la liste complète)")
+    print()
+
+    unreachable = graph.unreachable(entries)
+    print(f"🪦 Fonctions injoignables (privées, jamais référencées depuis un point d'entrée) : {len(unreachable)}")
+    for name in unreachable[:limit]:
+        rel_path, line = graph.defined[name][0]
+        print(f"  • {name:<40} {rel_path}:{line}")
+    if len(unreachable) > limit:
+        print(f"  … {len(unreachable) - limit} autres")
+    print()
+
+    print("📦 Ensembles de chargement par manager")
+    print(f"  {'manager':<16} {'propres':>8} {'transitives':>12} {'externes':>9} {'fichiers':>9}")
+    for manager in managers:
+        info = load_set(graph, manager)
+        print(f"  {manager:<16} {len(info['functions']):8d} {len(info['closure']):12d} "
+              f"{len(info['external']):9d} {len(info['load_files']):9d}")
+        if len(managers) == 1:
+            for rel_path in info["load_files"]:
+                print(f"      ↳ {rel_path}")
+    print()
+
+def main(argv=None):
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    parser = argparse.ArgumentParser(description="Graphe d'appels statique des fonctions shell")
+    parser.add_argument("--root", action="append", help="racine à analyser (répétable ; défaut: racines de function_index, voir HELPMAN_ROOTS)")
+    parser.add_argument("--manager", help="limiter le rapport et le DOT à un manager (ex: gitman)")
+    parser.add_argument("--entry", action="append", default=[], help="point d'entrée supplémentaire (fonction privée appelée de l'extérieur)")
+    parser.add_argument("--json", metavar="FICHIER", help="exporter le graphe en JSON ('-' pour stdout)")
+    parser.add_argument("--dot", metavar="FICHIER", help="exporter le graphe au format DOT (Graphviz)")
+    parser.add_argument("--no-cache", action="store_true", help="ré-analyser tous les fichiers")
+    args = parser.parse_args(argv)
+
+    base_dir = get_dotfiles_dir()
+    roots = [os.path.join(base_dir, r) for r in args.root] if args.root else get_default_roots(base_dir)
+    files, rescanned = load_files(roots, base_dir, use_cache=not args.no_cache)
+    if not files:
+        print("❌ Aucun fichier de fonctions trouvé", file=sys.stderr)
+        return 1
+    graph = CallGraph(files)
+    managers = find_managers(files)
+    if args.manager:
+        if args.manager not in managers:
+            print(f"❌ Manager inconnu : {args.manager}", file=sys.stderr)
+            return 1
+        managers = [args.manager]
+
+    if args.json == "-":
+        json.dump(to_json(graph, managers, args.entry), sys.stdout, ensure_ascii=False, indent=1)
+        print()
+        return 0
+    print_report(graph, managers, rescanned, args.entry)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(to_json(graph, managers, args.entry), f, ensure_ascii=False, indent=1)
+        print(f"💾 JSON : {args.json}")
+    if args.dot:
+        names = load_set(graph, args.manager)["closure"] if args.manager else None
+        with open(args.dot, "w", encoding="utf-8") as f:
+            f.write(to_dot(graph, names))
+        print(f"🖼️  DOT : {args.dot} (dot -Tsvg {args.dot} -o calls.svg)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index persistant des fonctions shell pour helpman
+
+L'index est stocké dans $XDG_CACHE_HOME/dotfiles/helpman (défaut: ~/.cache).
+Chaque fichier est mémorisé avec (mtime, taille, catégorie, fonctions) :
+seuls les fichiers modifiés, ajoutés ou supprimés sont ré-analysés.
+
+Plusieurs racines (zsh, bash, fish, core/managers, shared) peuvent être
+indexées en parallèle puis fusionnées en un seul catalogue (load_catalog).
+
+Désactiver le cache : HELPMAN_NO_CACHE=1
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from function_scanner import FunctionDef, scan_file
+
+# Incrémenter à chaque changement du format des entrées
+INDEX_VERSION = 3
+
+FUNC_EXTENSIONS = (".sh", ".zsh", ".fish")
+
+# Racines de fonctions (relatives à DOTFILES_DIR), par ordre de priorité
+DEFAULT_ROOTS = ["zsh/functions", "core/managers", "shared/functions", "bash/functions", "fish/functions"]
+
+def get_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "dotfiles", "helpman")
+
+def get_cache_path(funcs_dir):
+    # Un fichier d'index par répertoire scanné
+    key = hashlib.sha1(os.path.abspath(funcs_dir).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(get_cache_dir(), f"function_index-{key}.json")
+
+def cache_enabled():
+    return os.environ.get("HELPMAN_NO_CACHE", "0") not in ("1", "true", "yes")
+
+def get_category_from_path(file_path, funcs_dir):
+    # Normaliser les chemins
+    funcs_dir = os.path.normpath(funcs_dir)
+    file_path = os.path.normpath(file_path)
+
+    # Obtenir le chemin relatif
+    try:
+        relative_path = os.path.relpath(file_path, funcs_dir)
+    except ValueError:
+        relative_path = file_path.replace(funcs_dir + "/", "").replace(funcs_dir + "\\", "")
+
+    # Gérer les fichiers à la racine (comme *man.zsh)
+    if "/" not in relative_path and "\\" not in relative_path:
+        if relative_path.endswith("man.zsh") or relative_path.endswith("man.sh"):
+            return "gestionnaires"
+        # Autres fichiers à la racine
+        return "utils"
+
+    # Séparer le chemin
+    parts = relative_path.replace("\\", "/").split("/")
+
+    # Si on a au moins 3 parties (ex: cyber/reconnaissance/domain_whois.sh)
+    if len(parts) >= 3:
+        return f"{parts[0]}/{parts[1]}"
+    # Si on a 2 parties (ex: misc/system/process.sh ou dev/go.sh)
+    elif len(parts) == 2:
+        # Cas spécial : fichiers dans dev/ (go.sh, docker.sh, etc.)
+        if parts[0] == "dev":
+            # Extraire le nom de la catégorie depuis le nom du fichier
+            filename = parts[1].replace(".sh", "").replace(".zsh", "")
+            # Mapping des noms de fichiers vers catégories
+            dev_mapping = {
+                "go": "dev/go",
+                "docker": "dev/docker",
+                "c": "dev/c",
+                "make": "dev/make"
+            }
+            return dev_mapping.get(filename, f"dev/{filename}")
+        # Cas spécial : fichiers dans git/ ou utils/ (un seul fichier = catégorie racine)
+        elif parts[0] in ["git", "utils"]:
+            return parts[0]
+        # Autres cas (misc/system, etc.) - sous-dossiers
+        return f"{parts[0]}/{parts[1]}"
+    # Sinon, utils par défaut
+    else:
+        return "utils"
+
+def iter_function_files(funcs_dir):
+    """Parcourt récursivement funcs_dir et renvoie (chemin relatif, stat) des fichiers shell."""
+    stack = [funcs_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(FUNC_EXTENSIONS) and entry.is_file():
+                    yield os.path.relpath(entry.path, funcs_dir), entry.stat()
+            except OSError:
+                continue
+
+def _load_cache(cache_path, funcs_dir):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION or data.get("root") != os.path.abspath(funcs_dir):
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+def _save_cache(cache_path, funcs_dir, files):
+    # Écriture atomique : un index partiel ne doit jamais être relu
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".function_index-", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "root": os.path.abspath(funcs_dir), "files": files},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache non inscriptible (HOME en lecture seule, etc.) : on continue sans
+        try:
+            os.unlink(tmp_path)
+        except (OSError, NameError):
+            pass
+
+def _collect_root(funcs_dir, use_cache, previous=None):
+    """Phase 1 (I/O) : parcours + stat d'une racine, réutilisation des entrées en cache."""
+    if previous is not None:
+        cached = previous
+    else:
+        cached = _load_cache(get_cache_path(funcs_dir), funcs_dir) if use_cache else {}
+    files = {}
+    todo = []
+    for rel_path, st in iter_function_files(funcs_dir):
+        entry = cached.get(rel_path)
+        if entry is not None and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            files[rel_path] = entry
+        else:
+            todo.append((rel_path, st))
+    # Fichiers supprimés depuis le dernier passage
+    removed = len(files) + len(todo) != len(cached)
+    return cached, files, todo, removed
+
+def _new_entry(funcs_dir, rel_path, st):
+    category = get_category_from_path(os.path.join(funcs_dir, rel_path), funcs_dir)
+    category = category.replace(".zsh", "").replace(".sh", "").replace(".fish", "")
+    return {
+        "mtime": st.st_mtime_ns,
+        "size": st.st_size,
+        "category": category,
+        "functions": scan_file(os.path.join(funcs_dir, rel_path)),
+    }
+
+def load_indexes(roots, use_cache=None, max_workers=None, previous=None):
+    """
+    Charge l'index de chaque racine ; renvoie une liste de dicts dans l'ordre de roots.
+
+    Le parcours des racines puis l'analyse des fichiers modifiés sont répartis
+    sur un pool de threads (travail dominé par les E/S : stat, open, read).
+    previous (un index par racine, déjà en mémoire) remplace la lecture du
+    cache disque ; les entrées inchangées sont réutilisées telles quelles.
+    """
+    if use_cache is None:
+        use_cache = cache_enabled()
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+
+    # Import local : markdown_viewer.py n'utilise que les chemins du cache
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        previous = previous or [None] * len(roots)
+        collected = list(pool.map(lambda job: _collect_root(job[0], use_cache, job[1]), zip(roots, previous)))
+
+        todo = [(i, rel_path, st) for i, (_c, _f, pending, _r) in enumerate(collected) for rel_path, st in pending]
+        parsed = pool.map(lambda job: _new_entry(roots[job[0]], job[1], job[2]), todo)
+        for (i, rel_path, _st), entry in zip(todo, parsed):
+            collected[i][1][rel_path] = entry
+
+    indexes = []
+    for root, (_cached, files, pending, removed) in zip(roots, collected):
+        # Ordre stable : chemins triés
+        files = {rel_path: files[rel_path] for rel_path in sorted(files)}
+        if use_cache and (pending or removed):
+            _save_cache(get_cache_path(root), root, files)
+        indexes.append(files)
+    return indexes
+
+def load_index(funcs_dir, use_cache=None):
+    """
+    Renvoie l'index {chemin relatif: entrée} des fonctions de funcs_dir.
+
+    Chaque entrée contient mtime (ns), size, category et functions
+    (liste de FunctionDef, sérialisés en listes dans le cache).
+    Seuls les fichiers dont (mtime, taille) a changé sont relus.
+    """
+    return load_indexes([funcs_dir], use_cache=use_cache)[0]
+
+def get_default_roots(dotfiles_dir):
+    """
+    Racines scannées par défaut, dans l'ordre de priorité.
+
+    HELPMAN_ROOTS (séparées par ':', relatives à dotfiles_dir ou absolues)
+    remplace DEFAULT_ROOTS.
+    """
+    configured = os.environ.get("HELPMAN_ROOTS", "")
+    names = [r for r in configured.split(":") if r] if configured else DEFAULT_ROOTS
+    return [os.path.join(dotfiles_dir, name) for name in names]
+
+def existing_roots(roots):
+    """Racines normalisées, sans doublon, limitées aux répertoires existants."""
+    return [r for r in dict.fromkeys(os.path.normpath(r) for r in roots) if os.path.isdir(r)]
+
+def category_prefix(root_label):
+    """Préfixe des catégories d'une racine secondaire (core/managers → managers, fish/functions → fish)."""
+    parts = [part for part in root_label.split("/") if part not in ("", ".", "..")]
+    if len(parts) > 1 and parts[-1] == "functions":
+        parts.pop()
+    return parts[-1] if parts else root_label
+
+def merge_indexes(roots, indexes, base_dir):
+    """
+    Fusionne les index de plusieurs racines en un catalogue unique.
+
+    Les clés sont relatives à base_dir (ex: zsh/functions/misc/files.sh) et
+    chaque entrée indique sa racine ("root"). L'ordre des racines est conservé :
+    la première racine l'emporte pour l'aide d'un nom défini plusieurs fois.
+    Les catégories des racines suivantes sont préfixées par leur racine
+    (managers/aliaman/core, fish/git…) pour ne pas se mêler à celles de la première.
+    """
+    catalog = {}
+    for i, (root, files) in enumerate(zip(roots, indexes)):
+        root_label = os.path.relpath(root, base_dir)
+        prefix = f"{category_prefix(root_label)}/" if i else ""
+        for rel_path, entry in files.items():
+            key = os.path.normpath(os.path.join(root_label, rel_path))
+            catalog[key] = dict(entry, root=root_label, category=prefix + entry["category"])
+    return catalog
+
+def load_catalog(roots, base_dir, use_cache=None, max_workers=None):
+    """Indexe les racines existantes en parallèle puis les fusionne (voir merge_indexes)."""
+    roots = existing_roots(roots)
+    return merge_indexes(roots, load_indexes(roots, use_cache, max_workers), base_dir)
+
+def iter_functions(index):
+    """Parcourt l'index dans son ordre (racines puis chemins triés) : (chemin relatif, catégorie, FunctionDef)."""
+    for rel_path, entry in index.items():
+        for func in entry["functions"]:
+            yield rel_path, entry["category"], FunctionDef._make(func)
+
+def build_name_index(index):
+    """
+    Renvoie {nom: [(chemin relatif, catégorie, FunctionDef), ...]}.
+
+    Pour chaque nom, les définitions documentées (DESC) passent en premier.
+    """
+    by_name = {}
+    for rel_path, category, func in iter_functions(index):
+        by_name.setdefault(func.name, []).append((rel_path, category, func))
+    for definitions in by_name.values():
+        if len(definitions) > 1:
+            definitions.sort(key=lambda d: not d[2].desc)
+    return by_name
+
+def primary_definitions(name_index):
+    """Définition retenue pour chaque nom (celle qu'affiche lookup) : [(chemin relatif, catégorie, FunctionDef)]."""
+    return [definitions[0] for definitions in name_index.values()]
+
+def find_duplicates(index):
+    """
+    Repère les noms définis dans plusieurs fichiers.
+
+    Renvoie (masquées, dupliquées) : {nom: [(chemin relatif, ligne), ...]}.
+    - masquées   : plusieurs définitions dans une même racine (la dernière
+                   chargée écrase les autres dans le shell)
+    - dupliquées : même nom dans plusieurs racines (portage zsh/bash/fish...)
+    """
+    by_name = {}
+    for rel_path, entry in index.items():
+        root = entry.get("root", "")
+        for func in entry["functions"]:
+            by_name.setdefault(func[0], []).append((root, rel_path, func[1]))
+
+    shadowed = {}
+    duplicated = {}
+    for name, definitions in by_name.items():
+        if len(definitions) < 2:
+            continue
+        roots = [d[0] for d in definitions]
+        if len(set(roots)) < len(roots):
+            shadowed[name] = [(d[1], d[2]) for d in definitions]
+        else:
+            duplicated[name] = [(d[1], d[2]) for d in definitions]
+    return shadowed, duplicated
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scanner des définitions de fonctions shell (passe unique par fichier)
+
+Le fichier est lu en binaire et parcouru une seule fois, vers l'avant :
+le dernier bloc de commentaires DESC/USAGE/EXAMPLE rencontré est conservé
+puis rattaché à la prochaine définition de fonction.
+
+Format de documentation reconnu :
+    # DESC: Description de la fonction
+    # USAGE: nom_fonction <arg1> [arg2]
+    # EXAMPLE: nom_fonction exemple1
+    nom_fonction() { ... }
+
+Les fichiers .fish utilisent la syntaxe « function nom [--description "..."] » ;
+la description fish sert de DESC quand aucun commentaire n'en fournit.
+"""
+import re
+from collections import namedtuple
+
+# Un bloc de documentation n'est rattaché qu'aux fonctions définies
+# dans les DOC_WINDOW lignes qui suivent sa dernière ligne
+DOC_WINDOW = 20
+
+IGNORED_NAMES = frozenset((b'if', b'for', b'while', b'case', b'function'))
+
+FUNC_RE = re.compile(rb'(?:function\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*\(')
+# Définition réelle : FUNC_RE accepte aussi « Mot ( » en colonne 0 (texte d'un heredoc…)
+STRICT_DEF_RE = re.compile(rb'(?:function\s+[A-Za-z_][\w-]*|[A-Za-z_]\w*\s*\(\s*\))')
+FISH_FUNC_RE = re.compile(rb'function\s+([A-Za-z_][A-Za-z0-9_-]*)(.*)')
+FISH_DESC_RE = re.compile(rb'(?:--description|-d)[=\s]+(?:"([^"]*)"|\'([^\']*)\')')
+DOC_RE = re.compile(rb'#\s*(DESC|USAGE|EXAMPLE):\s*(.*)')
+
+# Rejet rapide sur le premier octet : une ligne qui ne commence ni par une
+# lettre / '_' (définition) ni par '#' (documentation) n'est jamais analysée
+_CANDIDATE_FIRST_BYTES = frozenset(
+    b'#_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+)
+
+# line : numéro de ligne (1-based) de la définition
+# examples : tuple des lignes EXAMPLE du bloc
+FunctionDef = namedtuple("FunctionDef", "name line desc usage examples")
+
+def _decode(raw):
+    return raw.decode('utf-8', 'ignore').strip()
+
+def scan_bytes(data, fish=False):
+    """Analyse le contenu binaire d'un fichier shell et renvoie la liste des FunctionDef."""
+    functions = []
+    candidates = _CANDIDATE_FIRST_BYTES
+    func_match = FISH_FUNC_RE.match if fish else FUNC_RE.match
+    strict_match = STRICT_DEF_RE.match
+    doc_match = DOC_RE.match
+
+    # État courant : bloc de documentation en attente
+    desc = None
+    usage = None
+    examples = []
+    doc_line = 0
+
+    for lineno, line in enumerate(data.split(b'\n'), 1):
+        if not line or line[0] not in candidates:
+            continue
+
+        if line[0] == 0x23:  # '#'
+            m = doc_match(line)
+            if m is None:
+                continue
+            # Un bloc expiré est remplacé par le nouveau
+            if doc_line and lineno - doc_line > DOC_WINDOW:
+                desc, usage, examples = None, None, []
+            kind = m.group(1)
+            if kind == b'DESC':
+                # Comme l'ancien parcours : la première DESC du bloc l'emporte
+                if desc is None:
+                    desc = _decode(m.group(2))
+            elif kind == b'USAGE':
+                if usage is None:
+                    usage = _decode(m.group(2))
+            else:
+                examples.append(_decode(m.group(2)))
+            doc_line = lineno
+            continue
+
+        m = func_match(line)
+        if m is None:
+            continue
+        name = m.group(1)
+        if name in IGNORED_NAMES or (not fish and strict_match(line) is None):
+            continue
+        # Bloc trop éloigné : il ne documente pas cette fonction
+        if doc_line and lineno - doc_line > DOC_WINDOW:
+            desc, usage, examples = None, None, []
+        if fish and not desc:
+            fish_desc = FISH_DESC_RE.search(m.group(2))
+            if fish_desc:
+                desc = _decode(fish_desc.group(1) or fish_desc.group(2) or b'')
+
+        functions.append(FunctionDef(name.decode('ascii'), lineno, desc or "", usage or "", tuple(examples)))
+        # Le bloc est consommé par la fonction qui le suit
+        desc, usage, examples = None, None, []
+        doc_line = 0
+
+    return functions
+
+def scan_file(file_path):
+    """Analyse un fichier shell ; renvoie [] si le fichier est illisible."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return []
+    return scan_bytes(data, fish=file_path.endswith('.fish'))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche de fonctions pour helpman (index inversé + classement)
+
+Index inversé sur les noms de fonctions (nom complet et segments séparés
+par '_'), les mots des descriptions (DESC) et les catégories.
+
+Correspondances, de la plus forte à la plus faible :
+- exacte      : le terme est un jeton indexé
+- préfixe     : recherche dichotomique dans le vocabulaire trié
+- sous-chaîne : balayage du vocabulaire (termes de 3 caractères et plus)
+- floue       : similarité de trigrammes (Dice), seulement si rien d'autre
+                ne correspond au terme (fautes de frappe) ; pour les termes
+                courts, aussi une seule opération d'édition (substitution,
+                insertion, suppression ou inversion de deux lettres voisines),
+                que les trigrammes ratent (« dcoker » : 0.43 contre « docker »)
+"""
+import bisect
+import re
+import unicodedata
+from collections import defaultdict
+
+# Poids des champs dans le score
+FULL_NAME_WEIGHT = 4.0
+NAME_WEIGHT = 3.0
+CATEGORY_WEIGHT = 2.0
+DESC_WEIGHT = 1.0
+
+# Qualité de la correspondance d'un terme
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+SUBSTRING_MATCH = 0.6
+FUZZY_MATCH = 0.5
+
+FUZZY_THRESHOLD = 0.5
+MIN_PARTIAL_LEN = 3
+# Longueur maximale d'un terme pour la distance d'édition bornée à 1
+MAX_EDIT_TERM_LEN = 6
+
+_TOKEN_RE = re.compile(r'[a-z0-9_]+')
+
+def normalize(text):
+    """Minuscules sans accents (« Système » → « systeme »)."""
+    if text.isascii():
+        return text.lower()
+    # Les accents décomposés (NFKD) disparaissent à l'encodage ASCII ; les
+    # autres caractères non ASCII ne produisent de toute façon aucun jeton
+    return unicodedata.normalize('NFKD', text.lower()).encode('ascii', 'ignore').decode('ascii')
+
+def tokenize(text):
+    """Jetons d'un texte libre ; les mots composés a_b donnent aussi a et b."""
+    tokens = []
+    for token in _TOKEN_RE.findall(normalize(text)):
+        tokens.append(token)
+        if '_' in token:
+            tokens.extend(part for part in token.split('_') if part)
+    return tokens
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def within_one_edit(a, b):
+    """Distance de Damerau-Levenshtein (inversions voisines) entre a et b ≤ 1."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    # Premier caractère différent
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    # Inversion de deux lettres voisines
+    return (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i]
+            and a[i + 2:] == b[i + 2:])
+
+class SearchIndex:
+    """Index inversé construit à partir de (chemin relatif, catégorie, FunctionDef)."""
+
+    def __init__(self, entries):
+        self.entries = []
+        # jeton -> {id de fonction: poids du meilleur champ}
+        self.postings = defaultdict(dict)
+        seen = set()
+        category_tokens = {}
+        for rel_path, category, func in entries:
+            # Même règle que l'affichage : un nom par catégorie
+            key = (func.name, category)
+            if key in seen:
+                continue
+            seen.add(key)
+            doc_id = len(self.entries)
+            self.entries.append((rel_path, category, func))
+            self._add(tokenize(func.name), doc_id, NAME_WEIGHT)
+            self._add((normalize(func.name),), doc_id, FULL_NAME_WEIGHT)
+            if category not in category_tokens:
+                category_tokens[category] = tokenize(category.replace('/', ' '))
+            self._add(category_tokens[category], doc_id, CATEGORY_WEIGHT)
+            if func.desc:
+                self._add(tokenize(func.desc), doc_id, DESC_WEIGHT)
+        self.postings = dict(self.postings)
+        self.vocabulary = sorted(self.postings)
+        self._trigram_index = None
+
+    def _add(self, tokens, doc_id, weight):
+        for token in tokens:
+            posting = self.postings[token]
+            if posting.get(doc_id, 0) < weight:
+                posting[doc_id] = weight
+
+    def _fuzzy_tokens(self, term):
+        # Index des trigrammes construit à la demande (premier terme mal orthographié)
+        if self._trigram_index is None:
+            index = defaultdict(list)
+            for token in self.vocabulary:
+                if len(token) >= MIN_PARTIAL_LEN:
+                    for gram in trigrams(token):
+                        index[gram].append(token)
+            self._trigram_index = index
+        term_grams = trigrams(term)
+        shared = defaultdict(int)
+        for gram in term_grams:
+            for token in self._trigram_index.get(gram, ()):
+                shared[token] += 1
+        matches = {}
+        for token, count in shared.items():
+            similarity = 2.0 * count / (len(term_grams) + len(token) + 1)
+            if similarity >= FUZZY_THRESHOLD:
+                matches[token] = FUZZY_MATCH * similarity
+        if len(term) <= MAX_EDIT_TERM_LEN:
+            for token in self.vocabulary:
+                if abs(len(token) - len(term)) <= 1 and within_one_edit(term, token):
+                    matches[token] = FUZZY_MATCH
+        return matches
+
+    def match_term(self, term):
+        """Renvoie {jeton du vocabulaire: qualité} pour un terme de recherche."""
+        matches = {}
+        if term in self.postings:
+            matches[term] = EXACT_MATCH
+
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(token, PREFIX_MATCH)
+
+        if len(term) >= MIN_PARTIAL_LEN:
+            for token in self.vocabulary:
+                if token not in matches and term in token:
+                    matches[token] = SUBSTRING_MATCH
+            if not matches:
+                matches = self._fuzzy_tokens(term)
+        return matches
+
+    def search(self, query, limit=50):
+        """
+        Renvoie [(score, chemin relatif, catégorie, FunctionDef)] triés par pertinence.
+
+        Les fonctions qui correspondent à tous les termes passent avant celles
+        qui n'en couvrent qu'une partie.
+        """
+        terms = list(dict.fromkeys(_TOKEN_RE.findall(normalize(query))))
+        if not terms:
+            return []
+
+        scores = defaultdict(float)
+        covered = defaultdict(int)
+        for term in terms:
+            best = {}
+            for token, quality in self.match_term(term).items():
+                for doc_id, weight in self.postings[token].items():
+                    score = quality * weight
+                    if score > best.get(doc_id, 0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] += score
+                covered[doc_id] += 1
+
+        query_name = '_'.join(terms)
+        for doc_id in scores:
+            name = self.entries[doc_id][2].name.lower()
+            if name == query_name:
+                scores[doc_id] += 10.0
+            elif name.startswith(query_name):
+                scores[doc_id] += 3.0
+
+        ranked = sorted(scores, key=lambda d: (-covered[d], -scores[d], self.entries[d][2].name))
+        results = []
+        for doc_id in ranked[:limit]:
+            rel_path, category, func = self.entries[doc_id]
+            results.append((scores[doc_id], rel_path, category, func))
+        return results
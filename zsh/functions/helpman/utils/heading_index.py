@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index des titres d'un document Markdown (offsets en octets)
+
+Pour chaque titre : niveau, texte, ancre GitHub, début et fin de la
+section en octets (la section s'arrête au titre suivant de niveau égal ou
+supérieur). Le fichier est parcouru en mmap par une seule expression
+régulière ; les blocs de code (``` / ~~~) sont ignorés.
+
+L'index est gardé dans $XDG_CACHE_HOME/dotfiles/helpman/headings, par
+fichier et clé (mtime, taille) : afficher une section ne coûte ensuite que
+la lecture de cette section.
+"""
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+from collections import namedtuple
+
+from function_index import cache_enabled, get_cache_dir
+from function_search import normalize
+
+# Incrémenter à chaque changement du format de l'index
+HEADINGS_VERSION = 1
+
+# start : offset du début de la ligne de titre ; end : offset de fin de section
+Heading = namedtuple("Heading", "level title anchor start end line")
+
+_BLOCK_RE = re.compile(rb'^(?:(?P<fence>[ \t]*(?:```|~~~))|(?P<hashes>#{1,6})[ \t]+(?P<title>[^\r\n]*))', re.M)
+_CLOSING_HASHES_RE = re.compile(r'\s+#+\s*$')
+_ANCHOR_DROP_RE = re.compile(r'[^\w\- ]')
+_MARKUP_RE = re.compile(r'[`*_~]|\[([^\]]*)\]\([^)]*\)')
+
+def github_anchor(title):
+    """Ancre GitHub d'un titre : minuscules, ponctuation supprimée, espaces → '-'."""
+    return _ANCHOR_DROP_RE.sub('', title.strip().lower()).replace(' ', '-')
+
+def plain_title(raw):
+    title = _CLOSING_HASHES_RE.sub('', raw.strip())
+    return _MARKUP_RE.sub(lambda m: m.group(1) or '', title).strip()
+
+def scan_headings(data):
+    """Analyse un contenu binaire (bytes ou mmap) ; renvoie la liste des Heading."""
+    headings = []
+    fence = None
+    seen_anchors = {}
+    # (niveau, indice) des sections encore ouvertes
+    open_sections = []
+    line = 1
+    last_pos = 0
+    for m in _BLOCK_RE.finditer(data):
+        if m.group('fence') is not None:
+            marker = m.group('fence').strip()
+            if fence is None:
+                fence = marker
+            elif marker == fence:
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        start = m.start()
+        line += data[last_pos:start].count(b'\n')
+        last_pos = start
+        level = len(m.group('hashes'))
+        title = plain_title(m.group('title').decode('utf-8', 'replace'))
+        anchor = github_anchor(title)
+        # Titres identiques : ancre-1, ancre-2… comme GitHub
+        count = seen_anchors.get(anchor, 0)
+        seen_anchors[anchor] = count + 1
+        if count:
+            anchor = f"{anchor}-{count}"
+
+        while open_sections and open_sections[-1][0] >= level:
+            _level, index = open_sections.pop()
+            headings[index][4] = start
+        open_sections.append((level, len(headings)))
+        headings.append([level, title, anchor, start, None, line])
+
+    for _level, index in open_sections:
+        headings[index][4] = len(data)
+    return [Heading._make(h) for h in headings]
+
+def _cache_path(file_path):
+    key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(get_cache_dir(), "headings", f"{key}.json")
+
+def _map(f, size):
+    # mmap refuse les fichiers vides
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+def load_headings(file_path, use_cache=None):
+    """Index des titres de file_path (cache disque si à jour) ; lève OSError si illisible."""
+    if use_cache is None:
+        use_cache = cache_enabled()
+    st = os.stat(file_path)
+    stamp = [HEADINGS_VERSION, st.st_mtime_ns, st.st_size]
+    cache_path = _cache_path(file_path)
+    if use_cache:
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("stamp") == stamp and data.get("path") == os.path.abspath(file_path):
+                return [Heading._make(h) for h in data["headings"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    with open(file_path, 'rb') as f:
+        buf = _map(f, st.st_size)
+        try:
+            headings = scan_headings(buf)
+        finally:
+            if buf:
+                buf.close()
+
+    if use_cache:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix=".tmp-")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"stamp": stamp, "path": os.path.abspath(file_path),
+                           "headings": [list(h) for h in headings]}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return headings
+
+def find_section(headings, query):
+    """
+    Titre correspondant à query (ancre ou texte du titre) ; None si aucun.
+
+    Ordre : ancre exacte, titre exact, début de titre, titre contenant
+    query (sans casse ni accents) ; le premier titre du document l'emporte.
+    """
+    anchor = query.lstrip('#').strip().lower()
+    wanted = normalize(query.lstrip('#').strip())
+    for h in headings:
+        if h.anchor == anchor:
+            return h
+    titles = [(normalize(h.title), h) for h in headings]
+    for match in (str.__eq__, str.startswith, str.__contains__):
+        for title, h in titles:
+            if match(title, wanted):
+                return h
+    return None
+
+def read_section(file_path, heading):
+    """Octets de la section (titre compris), lus via mmap sans charger le reste du fichier."""
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return buf[heading.start:min(heading.end, size)]
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client léger du serveur helpman (mêmes arguments que list_functions.py)
+
+Interroge helpman_server.py via sa socket Unix. Si le serveur ne répond
+pas, il est démarré en arrière-plan et la requête courante est servie en
+mode ponctuel par list_functions.py : le résultat est toujours le même.
+
+Imports réduits au minimum : lancer avec « python3 -S ».
+Désactiver le serveur : HELPMAN_SERVER=0
+"""
+import json
+import os
+import socket
+import sys
+import time
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+FORWARDED_ENV = ("DOTFILES_DIR", "COLUMNS", "HELPMAN_ROOTS", "HELPMAN_NO_CACHE")
+# Options de list_functions.py : chemins, et options suivies d'une valeur
+PATH_OPTIONS = ("--root", "--man-dir")
+VALUE_OPTIONS = ("--search", "--limit", "--format")
+# Marqueur de démarrage (répertoire de la socket) : pas de nouveau lancement
+# pendant START_BACKOFF secondes si le serveur précédent n'a pas répondu
+START_MARKER = "helpman.starting"
+START_BACKOFF = 10.0
+
+def get_socket_path():
+    # Doit rester identique à helpman_server.get_socket_path()
+    if os.environ.get("HELPMAN_SOCKET"):
+        return os.environ["HELPMAN_SOCKET"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "dotfiles", "helpman.sock")
+    return os.path.join("/tmp", f"dotfiles-{os.getuid()}", "helpman.sock")
+
+def is_private_dir(path):
+    """Vrai si path est un vrai répertoire (pas un lien), à nous, en mode 0700."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (st.st_mode & 0o170000) == 0o040000 and st.st_uid == os.getuid() and (st.st_mode & 0o777) == 0o700
+
+def socket_is_trusted(socket_path):
+    """
+    Socket par défaut : son répertoire (/tmp/dotfiles-<uid>…) doit être privé,
+    sinon un autre utilisateur a pu le créer et y placer sa propre socket.
+    Une socket explicite (HELPMAN_SOCKET) relève de l'utilisateur.
+    """
+    if os.environ.get("HELPMAN_SOCKET"):
+        return True
+    return is_private_dir(os.path.dirname(socket_path))
+
+def absolute_paths(argv):
+    """Rend absolus les chemins (racine positionnelle, --root, --man-dir) : le serveur a son propre cwd."""
+    out = list(argv)
+    i = 2 if out and out[0] == "lookup" else 0
+    positional_seen = False
+    while i < len(out):
+        arg = out[i]
+        if arg in PATH_OPTIONS and i + 1 < len(out):
+            out[i + 1] = os.path.abspath(out[i + 1])
+            i += 2
+            continue
+        option, eq, value = arg.partition("=")
+        if eq and option in PATH_OPTIONS:
+            out[i] = f"{option}={os.path.abspath(value)}"
+        elif arg in VALUE_OPTIONS:
+            i += 1
+        elif not arg.startswith("-") and not positional_seen:
+            out[i] = os.path.abspath(arg)
+            positional_seen = True
+        i += 1
+    return out
+
+def query(argv):
+    """Renvoie (code, sortie) depuis le serveur, ou None s'il est injoignable."""
+    socket_path = get_socket_path()
+    if not socket_is_trusted(socket_path):
+        return None
+    request = {"argv": absolute_paths(argv), "env": {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ}}
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(10)
+    try:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        conn.close()
+    header, _sep, output = b"".join(chunks).partition(b"\n")
+    if not header.isdigit():
+        return None
+    return int(header), output
+
+def start_server():
+    """Lance le serveur en arrière-plan, au plus une fois par START_BACKOFF secondes."""
+    socket_path = get_socket_path()
+    marker = os.path.join(os.path.dirname(socket_path), START_MARKER)
+    try:
+        os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+        if not socket_is_trusted(socket_path):
+            return
+        try:
+            if time.time() - os.stat(marker).st_mtime < START_BACKOFF:
+                # Lancement récent sans réponse (serveur en échec ou en démarrage)
+                return
+        except FileNotFoundError:
+            pass
+        with open(marker, "w"):
+            pass
+    except OSError:
+        return
+
+    import subprocess
+    try:
+        # cwd=/ : le serveur ne retient pas le répertoire courant de l'appelant
+        subprocess.Popen(
+            [sys.executable, os.path.join(UTILS_DIR, "helpman_server.py"), "serve"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, close_fds=True, cwd="/",
+        )
+    except OSError:
+        pass
+
+def run_oneshot(argv):
+    script = os.path.join(UTILS_DIR, "list_functions.py")
+    os.execv(sys.executable, [sys.executable, script] + argv)
+
+def main():
+    argv = sys.argv[1:]
+    if os.environ.get("HELPMAN_SERVER", "1") in ("0", "false", "no"):
+        run_oneshot(argv)
+
+    result = query(argv)
+    if result is None:
+        start_server()
+        run_oneshot(argv)
+
+    code, output = result
+    try:
+        sys.stdout.buffer.write(output)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Pager fermé avant la fin : sortie silencieuse
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serveur résident helpman (socket Unix par utilisateur)
+
+Garde en mémoire le catalogue des fonctions, ses index (recherche, noms)
+et les pages déjà rendues : un appel « help » ne paie plus le démarrage de
+Python, les imports ni la relecture de l'index.
+
+Le serveur est démarré automatiquement par helpman_client.py au premier
+appel et s'arrête seul après HELPMAN_SERVER_IDLE secondes sans requête
+(défaut: 900).
+
+Usage:
+    helpman_server.py serve     # premier plan (utilisé par le client)
+    helpman_server.py status    # afficher l'état du serveur
+    helpman_server.py stop      # arrêter le serveur
+"""
+import contextlib
+import fcntl
+import io
+import json
+import os
+import socket
+import sys
+import time
+from collections import OrderedDict
+
+import list_functions
+from function_index import cache_enabled, existing_roots, load_indexes, merge_indexes
+from helpman_client import START_MARKER, socket_is_trusted
+
+# Intervalle minimal entre deux vérifications (stat) des fichiers sources
+REVALIDATE_INTERVAL = 1.0
+# Nombre maximal de pages rendues gardées en mémoire
+MAX_RENDERED = 256
+# Variables d'environnement du client prises en compte pour le rendu
+FORWARDED_ENV = ("DOTFILES_DIR", "COLUMNS", "HELPMAN_ROOTS", "HELPMAN_NO_CACHE")
+
+def get_runtime_dir():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "dotfiles")
+    return os.path.join("/tmp", f"dotfiles-{os.getuid()}")
+
+def get_socket_path():
+    return os.environ.get("HELPMAN_SOCKET") or os.path.join(get_runtime_dir(), "helpman.sock")
+
+def get_idle_timeout():
+    try:
+        return float(os.environ.get("HELPMAN_SERVER_IDLE", 900))
+    except ValueError:
+        return 900.0
+
+class ResidentCatalogs:
+    """Catalogues en mémoire, un par jeu de racines, revalidés par stat."""
+
+    def __init__(self):
+        # (base_dir, racines) -> [Catalog, index par racine, dernière vérification]
+        self.states = {}
+
+    def load(self, funcs_dir=None, roots=None):
+        base_dir = list_functions.get_dotfiles_dir()
+        selected = existing_roots(list_functions.get_roots(funcs_dir, roots))
+        key = (base_dir, tuple(selected))
+        state = self.states.get(key)
+        now = time.monotonic()
+        if state is not None and now - state[2] < REVALIDATE_INTERVAL:
+            return state[0]
+
+        previous = state[1] if state is not None else None
+        indexes = load_indexes(selected, use_cache=cache_enabled(), previous=previous)
+        if state is not None and not _changed(previous, indexes):
+            state[2] = now
+            return state[0]
+
+        catalog = list_functions.Catalog(merge_indexes(selected, indexes, base_dir), base_dir)
+        # Numéro de version du catalogue, utilisé dans la clé des pages rendues
+        catalog.generation = state[0].generation + 1 if state is not None else 0
+        self.states[key] = [catalog, indexes, now]
+        return catalog
+
+def _changed(previous, indexes):
+    # Les entrées inchangées sont réutilisées à l'identique par load_indexes
+    for old, new in zip(previous, indexes):
+        if len(old) != len(new):
+            return True
+        for rel_path, entry in new.items():
+            if old.get(rel_path) is not entry:
+                return True
+    return False
+
+class HelpmanServer:
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.catalogs = ResidentCatalogs()
+        # Pages rendues, de la moins à la plus récemment servie (LRU)
+        self.rendered = OrderedDict()
+        self.started = time.time()
+        self.requests = 0
+        self.hits = 0
+
+    def handle(self, request):
+        """Traite une requête ; renvoie (code de sortie, sortie en octets)."""
+        command = request.get("cmd", "run")
+        if command == "status":
+            status = {
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "rendered_hits": self.hits,
+                "rendered_pages": len(self.rendered),
+                "catalogs": len(self.catalogs.states),
+            }
+            return 0, (json.dumps(status) + "\n").encode("utf-8")
+
+        argv = [str(arg) for arg in request.get("argv", [])]
+        env = {k: v for k, v in request.get("env", {}).items() if k in FORWARDED_ENV}
+        self.requests += 1
+
+        with _patched_environ(env):
+            # La génération change dès qu'un fichier source a changé : le rendu
+            # mémorisé n'est alors plus réutilisé
+            catalog_key = None
+            try:
+                catalog_key = self.catalogs.load(*_roots_args(argv)).generation
+            except SystemExit:
+                pass
+            key = (tuple(argv), tuple(sorted(env.items())), catalog_key, _man_page_stamp(argv))
+            if catalog_key is not None and key in self.rendered:
+                self.hits += 1
+                self.rendered.move_to_end(key)
+                return self.rendered[key]
+
+            result = _capture(argv, self.catalogs.load)
+            if catalog_key is not None:
+                if len(self.rendered) >= MAX_RENDERED:
+                    self.rendered.popitem(last=False)
+                self.rendered[key] = result
+            return result
+
+    def serve_forever(self):
+        idle_timeout = get_idle_timeout()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(16)
+        # Serveur joignable : le client peut de nouveau en lancer un s'il disparaît
+        with contextlib.suppress(OSError):
+            os.unlink(os.path.join(os.path.dirname(self.socket_path), START_MARKER))
+        listener.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    conn, _addr = listener.accept()
+                except socket.timeout:
+                    # Inactif depuis idle_timeout secondes
+                    break
+                with conn:
+                    conn.settimeout(10)
+                    try:
+                        request = json.loads(_read_line(conn) or b"{}")
+                    except ValueError:
+                        continue
+                    if request.get("cmd") == "stop":
+                        conn.sendall(b"0\n")
+                        break
+                    code, output = self.handle(request)
+                    try:
+                        conn.sendall(f"{code}\n".encode("ascii") + output)
+                    except OSError:
+                        # Client parti (pager quitté, Ctrl-C)
+                        pass
+        finally:
+            listener.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.socket_path)
+
+def _roots_args(argv):
+    """Extrait (funcs_dir, roots) d'une ligne de commande list_functions sans l'exécuter."""
+    args = argv[2:] if argv and argv[0] == "lookup" else argv
+    funcs_dir = None
+    roots = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--root" and i + 1 < len(args):
+            roots.append(args[i + 1])
+            i += 2
+            continue
+        if arg.startswith("--root="):
+            roots.append(arg.split("=", 1)[1])
+        elif arg in ("--search", "--limit", "--format", "--man-dir"):
+            i += 1
+        elif not arg.startswith("-") and funcs_dir is None:
+            funcs_dir = arg
+        i += 1
+    return funcs_dir, roots or None
+
+def _man_page_stamp(argv):
+    """
+    (mtime, taille) de la page man d'un « lookup NOM », None si absente ou
+    sans objet : la sortie de lookup mentionne la page dès qu'elle existe.
+    """
+    if len(argv) < 2 or argv[0] != "lookup":
+        return None
+    man_dir = None
+    for i, arg in enumerate(argv[2:], 2):
+        if arg == "--man-dir" and i + 1 < len(argv):
+            man_dir = argv[i + 1]
+        elif arg.startswith("--man-dir="):
+            man_dir = arg.split("=", 1)[1]
+    if man_dir is None:
+        man_dir = os.path.join(list_functions.get_dotfiles_dir(), "docs", "man")
+    try:
+        st = os.stat(os.path.join(man_dir, f"{argv[1]}.md"))
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _capture(argv, loader):
+    out = io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            code = list_functions.run(argv, loader)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except Exception as exc:  # le serveur ne doit jamais tomber sur une requête
+            print(f"❌ helpman_server: {exc}")
+            code = 1
+    return code, out.getvalue().encode("utf-8")
+
+@contextlib.contextmanager
+def _patched_environ(env):
+    saved = {k: os.environ.get(k) for k in FORWARDED_ENV}
+    try:
+        for k in FORWARDED_ENV:
+            if k in env:
+                os.environ[k] = env[k]
+            else:
+                os.environ.pop(k, None)
+        yield
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+def _read_line(conn):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data.strip()
+
+def send(request, socket_path=None, timeout=5.0):
+    """Envoie une requête au serveur ; renvoie (code, sortie) ou lève OSError."""
+    socket_path = socket_path or get_socket_path()
+    if not socket_is_trusted(socket_path):
+        raise OSError(f"répertoire de la socket non privé : {os.path.dirname(socket_path)}")
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(timeout)
+    try:
+        conn.connect(socket_path)
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        conn.close()
+    header, _sep, output = b"".join(chunks).partition(b"\n")
+    return int(header or 1), output
+
+def serve(socket_path=None):
+    socket_path = socket_path or get_socket_path()
+    runtime_dir = os.path.dirname(socket_path)
+    os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+    if not socket_is_trusted(socket_path):
+        print(f"❌ helpman_server: {runtime_dir} n'est pas un répertoire privé (propriétaire, mode 0700) : refusé",
+              file=sys.stderr)
+        return 1
+
+    # Un seul serveur par socket : verrou exclusif tenu pendant toute la durée de vie
+    lock_file = open(socket_path + ".lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return 0
+    with contextlib.suppress(OSError):
+        os.unlink(socket_path)
+    HelpmanServer(socket_path).serve_forever()
+    return 0
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if command == "serve":
+        sys.exit(serve())
+    if command in ("status", "stop"):
+        try:
+            code, output = send({"cmd": command})
+        except OSError:
+            print("⚪ Serveur helpman arrêté")
+            sys.exit(1 if command == "status" else 0)
+        if command == "status":
+            sys.stdout.write(output.decode("utf-8"))
+        else:
+            print("✅ Serveur helpman arrêté")
+        sys.exit(code)
+    print("Usage: helpman_server.py serve|status|stop")
+    sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manifeste de chargement différé des fonctions zsh (zsh/zshrc_custom, étape 4)
+
+Au lieu de sourcer chaque fichier de $FUNCTIONS_DIR à chaque démarrage, le
+shell lit un seul fichier généré :
+- pour un fichier qui ne contient que des définitions de fonctions (et des
+  commentaires), une fonction d'amorce par fonction : le fichier n'est
+  sourcé qu'au premier appel de l'une d'elles
+- un fichier avec du code exécuté au chargement (alias, export, compdef,
+  appel de fonction…) reste sourcé au démarrage, à sa place dans l'ordre
+- la liste des fonctions et descriptions pour la complétion
+  (DOTFILES_FUNCTION_COMPLETIONS, utilisée par zsh/completions/_help)
+
+Les noms viennent de function_scanner ; un fichier n'est différé que si
+l'analyse de ses lignes de premier niveau trouve exactement les mêmes
+fonctions. Un nom redéfini par un fichier chargé plus tard rend le fichier
+précédent non différable (le sourcer à la demande écraserait la définition).
+
+Sortie : $XDG_CACHE_HOME/dotfiles/zsh/functions_manifest.zsh (réécrite
+seulement si son contenu change, sinon seule sa date est mise à jour) ;
+analyse par fichier mémorisée à côté, par clé (mtime, taille).
+
+Usage: lazy_manifest.py [FUNCTIONS_DIR] [--output FICHIER] [--list]
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+
+from function_scanner import scan_bytes
+
+# Incrémenter à chaque changement du format du manifeste ou de l'analyse
+MANIFEST_VERSION = 3
+
+# Définition de premier niveau : « nom() {», « function nom {», « nom()» seul
+DEF_RE = re.compile(rb'^(?:function\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(\s*\))?|([A-Za-z_][A-Za-z0-9_]*)\s*\(\s*\))\s*(\{)?\s*(.*)$')
+CLOSE_RE = re.compile(rb'^\}\s*(?:;\s*)?(?:#.*)?$')
+OPEN_RE = re.compile(rb'^\{\s*(?:#.*)?$')
+
+def get_manifest_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "dotfiles", "zsh", "functions_manifest.zsh")
+
+def is_loaded(rel_path):
+    """Mêmes exclusions que la boucle de chargement de zshrc_custom."""
+    path = "/" + rel_path
+    name = os.path.basename(rel_path)
+    return not (
+        name.endswith("man.zsh")
+        or "backup" in rel_path
+        or ("/cyber/" in path and name.endswith(".zsh"))
+        or name in ("alias_utils.zsh", "update_system.sh", "install-tool.zsh", "installman.zsh", "configman.zsh")
+        or "/install/" in path
+        or "/configman/modules/" in path
+        or "/fileman/modules/" in path
+    )
+
+def iter_loaded_files(funcs_dir):
+    """Fichiers sourcés par zshrc_custom, dans l'ordre de « **/*.sh **/*.zsh »."""
+    found = {".sh": [], ".zsh": []}
+    for dirpath, dirnames, filenames in os.walk(funcs_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            ext = os.path.splitext(name)[1]
+            if ext in found and not name.startswith("."):
+                rel_path = os.path.relpath(os.path.join(dirpath, name), funcs_dir)
+                if is_loaded(rel_path):
+                    found[ext].append(rel_path)
+    return sorted(found[".sh"]) + sorted(found[".zsh"])
+
+def top_level_functions(data):
+    """
+    Fonctions définies au premier niveau, si le fichier ne contient rien d'autre.
+
+    Renvoie (noms, None) ou (None, raison). Le corps d'une fonction s'étend
+    jusqu'à la première ligne « } » en colonne 0 (ou tient sur la ligne de
+    définition) ; toute autre ligne non vide hors commentaire est du code
+    exécuté au chargement.
+    """
+    names = []
+    in_body = False
+    pending = None
+    for lineno, line in enumerate(data.split(b'\n'), 1):
+        if in_body:
+            if CLOSE_RE.match(line):
+                in_body = False
+            continue
+        stripped = line.strip()
+        if pending is not None:
+            # « nom() » puis « { » sur la ligne suivante
+            if not stripped:
+                continue
+            if OPEN_RE.match(line):
+                names.append(pending)
+                pending = None
+                in_body = True
+                continue
+            return None, f"ligne {lineno}: définition sans corps"
+        if not stripped or stripped.startswith(b'#'):
+            continue
+        m = DEF_RE.match(line)
+        if m is None:
+            return None, f"ligne {lineno}: code au chargement"
+        name = (m.group(1) or m.group(2)).decode('ascii')
+        if m.group(3) is None:
+            if m.group(4):
+                return None, f"ligne {lineno}: corps de fonction non reconnu"
+            pending = name
+            continue
+        names.append(name)
+        rest = m.group(4).rstrip()
+        # Définition sur une ligne : « nom() { ...; } »
+        if not rest.endswith(b'}'):
+            in_body = True
+    if in_body or pending is not None:
+        return None, "fin de fichier dans une fonction"
+    return names, None
+
+def analyze_file(path):
+    """Entrée d'analyse d'un fichier : fonctions (nom, desc), différable ou raison."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    functions = scan_bytes(data)
+    names, reason = top_level_functions(data)
+    if names is not None and sorted(names) != sorted(func.name for func in functions):
+        names, reason = None, "définitions hors du premier niveau"
+    if names is not None and not names:
+        reason = "aucune fonction"
+    # Tous les noms définis en colonne 0 (même hors de la syntaxe reconnue
+    # par function_scanner) : sert à repérer les redéfinitions
+    defines = {func.name for func in functions}
+    for line in data.split(b'\n'):
+        m = DEF_RE.match(line)
+        if m:
+            defines.add((m.group(1) or m.group(2)).decode('ascii'))
+    return {
+        "functions": [[func.name, func.desc] for func in functions],
+        "defines": sorted(defines),
+        "lazy": bool(names),
+        "reason": reason,
+    }
+
+def _state_path(manifest_path):
+    return os.path.splitext(manifest_path)[0] + ".json"
+
+def _load_state(path, funcs_dir):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION and data.get("root") == funcs_dir:
+            return data.get("files", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def analyze_tree(funcs_dir, state=None, files=None):
+    """
+    Analyse des fichiers chargés ; renvoie [(chemin relatif, entrée)] dans l'ordre de chargement.
+
+    state : analyses mémorisées (réutilisées si (mtime, taille) n'a pas changé) ;
+    files (dict) reçoit les analyses par fichier, avant décision globale.
+    """
+    state = state or {}
+    files = {} if files is None else files
+    entries = []
+    for rel_path in iter_loaded_files(funcs_dir):
+        path = os.path.join(funcs_dir, rel_path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entry = state.get(rel_path)
+        if entry is None or entry.get("stamp") != [st.st_mtime_ns, st.st_size]:
+            try:
+                entry = analyze_file(path)
+            except OSError:
+                continue
+            entry["stamp"] = [st.st_mtime_ns, st.st_size]
+        files[rel_path] = entry
+        entries.append((rel_path, entry))
+
+    # Un fichier différé ne doit pas écraser, une fois sourcé, une fonction
+    # redéfinie par un fichier chargé après lui
+    last_definition = {}
+    for i, (_rel, entry) in enumerate(entries):
+        for name in entry["defines"]:
+            last_definition[name] = i
+    for i, (rel_path, entry) in enumerate(entries):
+        if entry["lazy"] and any(last_definition[name] != i for name in entry["defines"]):
+            # Copie : l'analyse mémorisée du fichier reste valable seule
+            entries[i] = (rel_path, dict(entry, lazy=False, reason="fonction redéfinie par un fichier chargé après"))
+    return entries
+
+def _quote(text):
+    return "'" + text.replace("'", "'\\''") + "'"
+
+def render_manifest(entries):
+    """Texte du manifeste (zsh, compatible bash)."""
+    lines = [
+        "# Généré par zsh/functions/helpman/utils/lazy_manifest.py — ne pas modifier",
+        f"# manifeste v{MANIFEST_VERSION}",
+        "",
+        "# Amorce : source le fichier de la fonction puis l'appelle",
+        "_dotfiles_autoload() {",
+        "    local _file=\"$1\" _fn=\"$2\"",
+        "    shift 2",
+        "    unset -f \"$_fn\"",
+        "    source \"${FUNCTIONS_DIR%/}/$_file\" 2>/dev/null",
+        "    if ! typeset -f \"$_fn\" >/dev/null; then",
+        "        echo \"❌ $_fn : fonction absente de $_file (relancer lazy_manifest.py)\" >&2",
+        "        return 127",
+        "    fi",
+        "    \"$_fn\" \"$@\"",
+        "}",
+        "",
+    ]
+    lazy_files = eager_files = 0
+    completions = {}
+    for rel_path, entry in entries:
+        if entry["lazy"]:
+            lazy_files += 1
+            quoted = _quote(rel_path)
+            for name, _desc in entry["functions"]:
+                lines.append(f"{name}() {{ _dotfiles_autoload {quoted} {name} \"$@\"; }}")
+        else:
+            eager_files += 1
+            lines.append(f"source \"${{FUNCTIONS_DIR%/}}/\"{_quote(rel_path)} 2>/dev/null")
+        for name, desc in entry["functions"]:
+            completions[name] = desc
+
+    lines.append("")
+    lines.append("# Complétion (nom:description)")
+    lines.append("typeset -ga DOTFILES_FUNCTION_COMPLETIONS")
+    lines.append("DOTFILES_FUNCTION_COMPLETIONS=(")
+    for name in sorted(completions):
+        desc = completions[name].replace("\\", "").replace(":", "\\:").replace("\n", " ")
+        lines.append(f"    {_quote(f'{name}:{desc}' if desc else name)}")
+    lines.append(")")
+    lines.append(f"DOTFILES_LAZY_STATS=({lazy_files} {eager_files} {len(completions)})")
+    return "\n".join(lines) + "\n"
+
+def update_manifest(funcs_dir, manifest_path=None):
+    """Met à jour le manifeste ; renvoie (entrées, manifeste réécrit ?)."""
+    funcs_dir = os.path.abspath(funcs_dir)
+    manifest_path = manifest_path or get_manifest_path()
+    state_path = _state_path(manifest_path)
+    previous = _load_state(state_path, funcs_dir)
+    files = {}
+    entries = analyze_tree(funcs_dir, previous, files)
+
+    text = render_manifest(entries)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            changed = f.read() != text
+    except OSError:
+        changed = True
+    if changed:
+        _write_atomic(manifest_path, text)
+    else:
+        # zshrc_custom ne relance ce script que si un fichier est plus récent
+        # que le manifeste : le marquer comme à jour même sans réécriture
+        with contextlib.suppress(OSError):
+            os.utime(manifest_path)
+    if files != previous:
+        _write_atomic(state_path, json.dumps({"version": MANIFEST_VERSION, "root": funcs_dir, "files": files},
+                                             ensure_ascii=False, separators=(",", ":")))
+    return entries, changed
+
+def print_report(entries):
+    lazy = [(rel, e) for rel, e in entries if e["lazy"]]
+    eager = [(rel, e) for rel, e in entries if not e["lazy"]]
+    print(f"💤 Différés ({len(lazy)} fichiers, {sum(len(e['functions']) for _r, e in lazy)} fonctions)")
+    for rel_path, entry in lazy:
+        print(f"  • {rel_path} ({len(entry['functions'])})")
+    print()
+    print(f"⚡ Sourcés au démarrage ({len(eager)} fichiers)")
+    for rel_path, entry in eager:
+        print(f"  • {rel_path:<50} {entry['reason'] or ''}")
+
+def main():
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    dotfiles_dir = os.environ.get("DOTFILES_DIR", os.path.expanduser("~/dotfiles"))
+    parser = argparse.ArgumentParser(description="Génère le manifeste de chargement différé des fonctions zsh")
+    parser.add_argument("funcs_dir", nargs="?", default=os.path.join(dotfiles_dir, "zsh", "functions"),
+                        help="répertoire des fonctions (défaut: $DOTFILES_DIR/zsh/functions)")
+    parser.add_argument("--output", help="manifeste à écrire (défaut: %s)" % get_manifest_path())
+    parser.add_argument("--list", action="store_true", help="afficher les fichiers différés et sourcés")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.funcs_dir):
+        print(f"❌ Répertoire des fonctions introuvable : {args.funcs_dir}", file=sys.stderr)
+        return 1
+    entries, changed = update_manifest(args.funcs_dir, args.output)
+    if args.list:
+        print_report(entries)
+        print()
+    lazy = sum(1 for _rel, e in entries if e["lazy"])
+    state = "mis à jour" if changed else "inchangé"
+    print(f"✅ Manifeste {state} : {lazy} fichiers différés, {len(entries) - lazy} sourcés au démarrage")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
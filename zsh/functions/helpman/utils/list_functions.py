@@ -1,226 +1,334 @@
 #!/usr/bin/env python3
+import argparse
+import json
 import os
-import re
+import signal
 import sys
 from collections import defaultdict
 
+from function_index import build_name_index, find_duplicates, get_default_roots, load_catalog, primary_definitions
+from function_search import SearchIndex
+
 def truncate_desc(text, max_len):
     if len(text) > max_len:
         return text[:max_len-3] + "..."
     return text
 
-def get_category_from_path(file_path, funcs_dir):
-    # Normaliser les chemins
-    funcs_dir = os.path.normpath(funcs_dir)
-    file_path = os.path.normpath(file_path)
-    
-    # Obtenir le chemin relatif
-    try:
-        relative_path = os.path.relpath(file_path, funcs_dir)
-    except:
-        relative_path = file_path.replace(funcs_dir + "/", "").replace(funcs_dir + "\\", "")
-    
-    # Gérer les fichiers à la racine (comme *man.zsh)
-    if "/" not in relative_path and "\\" not in relative_path:
-        if relative_path.endswith("man.zsh") or relative_path.endswith("man.sh"):
-            return "gestionnaires"
-        # Autres fichiers à la racine
-        return "utils"
-    
-    # Séparer le chemin
-    parts = relative_path.replace("\\", "/").split("/")
-    
-    # Si on a au moins 3 parties (ex: cyber/reconnaissance/domain_whois.sh)
-    if len(parts) >= 3:
-        return f"{parts[0]}/{parts[1]}"
-    # Si on a 2 parties (ex: misc/system/process.sh ou dev/go.sh)
-    elif len(parts) == 2:
-        # Cas spécial : fichiers dans dev/ (go.sh, docker.sh, etc.)
-        if parts[0] == "dev":
-            # Extraire le nom de la catégorie depuis le nom du fichier
-            filename = parts[1].replace(".sh", "").replace(".zsh", "")
-            # Mapping des noms de fichiers vers catégories
-            dev_mapping = {
-                "go": "dev/go",
-                "docker": "dev/docker",
-                "c": "dev/c",
-                "make": "dev/make"
-            }
-            return dev_mapping.get(filename, f"dev/{filename}")
-        # Cas spécial : fichiers dans git/ ou utils/ (un seul fichier = catégorie racine)
-        elif parts[0] in ["git", "utils"]:
-            return parts[0]
-        # Autres cas (misc/system, etc.) - sous-dossiers
-        return f"{parts[0]}/{parts[1]}"
-    # Sinon, utils par défaut
-    else:
-        return "utils"
-
-def main():
-    dotfiles_dir = os.environ.get("DOTFILES_DIR", os.path.expanduser("~/dotfiles"))
-    funcs_dir = f"{dotfiles_dir}/zsh/functions"
-    
-    if not os.path.exists(funcs_dir):
-        print("❌ Répertoire des fonctions introuvable")
-        sys.exit(1)
-    
+def get_desc_max_width():
     # Obtenir la largeur du terminal
     try:
         term_width = int(os.environ.get("COLUMNS", 80))
-    except:
+    except ValueError:
         term_width = 80
     if term_width < 60:
         term_width = 80
-    desc_max_width = term_width - 45
-    
-    # Collecter toutes les fonctions par catégorie
-    categories = defaultdict(list)
-    
-    for root, dirs, files in os.walk(funcs_dir):
-        for filename in files:
-            if not (filename.endswith(".sh") or filename.endswith(".zsh")):
-                continue
-            
-            file_path = os.path.join(root, filename)
-            category = get_category_from_path(file_path, funcs_dir)
-            category = category.replace(".zsh", "").replace(".sh", "")
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    
-                    for i, line in enumerate(lines):
-                        # Chercher les définitions de fonctions
-                        func_match = re.match(r'^(function\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', line)
-                        if func_match:
-                            func_name = func_match.group(2)
-                            if func_name in ['if', 'for', 'while', 'case', 'function']:
-                                continue
-                            
-                            # Chercher la description dans les lignes précédentes
-                            desc = ""
-                            for j in range(max(0, i-20), i):
-                                desc_match = re.match(r'^#\s*DESC:\s*(.*)', lines[j])
-                                if desc_match:
-                                    desc = desc_match.group(1).strip()
-                                    break
-                            
-                            if func_name:
-                                categories[category].append((func_name, desc))
-            except Exception as e:
-                continue
-    
-    # Supprimer les doublons
-    for cat in categories:
-        seen = set()
-        unique_funcs = []
-        for func_name, desc in categories[cat]:
-            if func_name not in seen:
-                seen.add(func_name)
-                unique_funcs.append((func_name, desc))
-        categories[cat] = sorted(unique_funcs, key=lambda x: x[0])
+    return term_width - 45
+
+def get_dotfiles_dir():
+    return os.environ.get("DOTFILES_DIR", os.path.expanduser("~/dotfiles"))
+
+def get_roots(funcs_dir=None, roots=None):
+    """
+    Racines à indexer : --root explicites, sinon funcs_dir seul, sinon les
+    racines par défaut (voir function_index.DEFAULT_ROOTS).
+    """
+    if roots:
+        selected = list(roots)
+    elif funcs_dir:
+        selected = [funcs_dir]
+    else:
+        selected = get_default_roots(get_dotfiles_dir())
     
-    # Définir l'ordre d'affichage
-    category_order = [
-        "gestionnaires",
-        "misc/system",
-        "misc/clipboard",
-        "misc/files",
-        "misc/backup",
-        "misc/security",
-        "dev/go",
-        "dev/docker",
-        "dev/c",
-        "dev/make",
-        "dev/projects",
-        "cyber/reconnaissance",
-        "cyber/scanning",
-        "cyber/vulnerability",
-        "cyber/attacks",
-        "cyber/analysis",
-        "cyber/privacy",
-        "git",
-        "utils"
+    if not any(os.path.isdir(root) for root in selected):
+        print("❌ Répertoire des fonctions introuvable")
+        sys.exit(1)
+    return selected
+
+class Catalog:
+    """
+    Catalogue fusionné + index dérivés (recherche, noms) construits à la demande.
+
+    Liste et recherche ne montrent qu'une définition par nom (definitions) ;
+    les autres restent visibles avec --duplicates.
+    """
+
+    def __init__(self, index, base_dir):
+        self.index = index
+        self.base_dir = base_dir
+        self._search_index = None
+        self._name_index = None
+        self._definitions = None
+
+    @property
+    def definitions(self):
+        if self._definitions is None:
+            self._definitions = primary_definitions(self.name_index)
+        return self._definitions
+
+    @property
+    def search_index(self):
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.definitions)
+        return self._search_index
+
+    @property
+    def name_index(self):
+        if self._name_index is None:
+            self._name_index = build_name_index(self.index)
+        return self._name_index
+
+def load(funcs_dir=None, roots=None):
+    """Charge le catalogue fusionné des racines (mode ponctuel, cache disque)."""
+    base_dir = get_dotfiles_dir()
+    return Catalog(load_catalog(get_roots(funcs_dir, roots), base_dir), base_dir)
+
+def print_duplicates(index):
+    shadowed, duplicated = find_duplicates(index)
+
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print("🔁 DÉFINITIONS MULTIPLES")
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print()
+    for title, groups in (("⚠️  MASQUÉES (plusieurs définitions dans une même racine)", shadowed),
+                          ("ℹ️  DUPLIQUÉES (même nom dans plusieurs racines)", duplicated)):
+        print(f"{title} : {len(groups)}")
+        print("──────────────────────────────────────────────────────────────────────────")
+        for name in sorted(groups):
+            print(f"  • {name}")
+            for rel_path, line in groups[name]:
+                print(f"      {rel_path}:{line}")
+        print()
+
+def print_search(catalog, query, limit, desc_max_width):
+    results = catalog.search_index.search(query, limit=limit)
+
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print(f"🔍 RÉSULTATS POUR '{query}' ({len(results)})")
+    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    print()
+
+    if not results:
+        print("❌ Aucune fonction trouvée")
+        print()
+        print("💡 Utilisez 'help' pour lister toutes les fonctions disponibles")
+        print()
+        return
+
+    for _score, _rel_path, category, func in results:
+        short_desc = truncate_desc(func.desc, desc_max_width) if func.desc else ""
+        if short_desc:
+            print(f"  • {func.name:<30} - {short_desc}  [{category}]")
+        else:
+            print(f"  • {func.name:<30} [{category}]")
+    print()
+    print("💡 Utilisez 'help <nom_fonction>' pour obtenir l'aide détaillée")
+    print()
+
+# Ordre d'affichage des catégories (les autres suivent, triées)
+CATEGORY_ORDER = [
+    "gestionnaires",
+    "misc/system",
+    "misc/clipboard",
+    "misc/files",
+    "misc/backup",
+    "misc/security",
+    "dev/go",
+    "dev/docker",
+    "dev/c",
+    "dev/make",
+    "dev/projects",
+    "cyber/reconnaissance",
+    "cyber/scanning",
+    "cyber/vulnerability",
+    "cyber/attacks",
+    "cyber/analysis",
+    "cyber/privacy",
+    "git",
+    "utils"
+]
+
+# Mapper les noms d'affichage
+DISPLAY_NAMES = {
+    "gestionnaires": "🎛️  GESTIONNAIRES (Managers)",
+    "misc/system": "💻 SYSTÈME (System)",
+    "misc/clipboard": "📋 PRESSE-PAPIER (Clipboard)",
+    "misc/files": "📁 FICHIERS (Files)",
+    "misc/backup": "💾 SAUVEGARDE (Backup)",
+    "misc/security": "🔒 SÉCURITÉ (Security)",
+    "dev/go": "🐹 GO (Go Language)",
+    "dev/docker": "🐳 DOCKER (Docker)",
+    "dev/c": "⚙️  C/C++ (C/C++)",
+    "dev/make": "🔨 MAKE (Make)",
+    "dev/projects": "📦 PROJETS (Projects)",
+    "cyber/reconnaissance": "🛡️  CYBER / RECONNAISSANCE",
+    "cyber/scanning": "🛡️  CYBER / SCANNING",
+    "cyber/vulnerability": "🛡️  CYBER / VULNERABILITY",
+    "cyber/attacks": "🛡️  CYBER / ATTACKS",
+    "cyber/analysis": "🛡️  CYBER / ANALYSIS",
+    "cyber/privacy": "🛡️  CYBER / PRIVACY",
+    "git": "🔀 GIT (Git)",
+    "utils": "🛠️  UTILITAIRES (Utils)"
+}
+
+def iter_category_blocks(definitions, desc_max_width):
+    """
+    Produit le texte de chaque catégorie, dans l'ordre d'affichage.
+
+    definitions : une définition par nom (Catalog.definitions). Seul le
+    regroupement par catégorie est fait à l'avance : les fonctions d'une
+    catégorie ne sont triées et mises en forme qu'au moment de l'afficher, ce
+    qui permet d'écrire la première catégorie sans attendre les suivantes.
+    """
+    funcs_by_category = defaultdict(dict)
+    for _rel_path, category, func in definitions:
+        funcs_by_category[category][func.name] = func.desc
+
+    ordered = [cat for cat in CATEGORY_ORDER if cat in funcs_by_category]
+    ordered += sorted(set(funcs_by_category) - set(CATEGORY_ORDER))
+    for cat in ordered:
+        funcs = funcs_by_category[cat]
+
+        lines = [
+            DISPLAY_NAMES.get(cat, f"📂 {cat.replace('/', ' / ').upper()}"),
+            "──────────────────────────────────────────────────────────────────────────",
+        ]
+        for func_name in sorted(funcs):
+            desc = funcs[func_name]
+            short_desc = truncate_desc(desc, desc_max_width) if desc else ""
+            if short_desc:
+                lines.append(f"  • {func_name:<30} - {short_desc}")
+            else:
+                lines.append(f"  • {func_name:<30}")
+        # Ligne vide après chaque catégorie
+        lines.append("")
+        yield "\n".join(lines) + "\n"
+
+def print_catalog(definitions, desc_max_width, out=None):
+    # Une écriture par catégorie dans un flux tamponné par blocs (plus de
+    # flush par ligne) ; seul le premier écran est vidé immédiatement
+    out = out or sys.stdout
+    out.write(
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        "📋 FONCTIONS DISPONIBLES (organisées par catégories)\n"
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        "\n"
+    )
+    for i, block in enumerate(iter_category_blocks(definitions, desc_max_width)):
+        out.write(block)
+        if i == 0:
+            out.flush()
+
+    out.write(
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+        "\n"
+        "💡 Utilisez 'help <nom_fonction>' pour obtenir l'aide détaillée\n"
+        "💡 Utilisez 'man <nom_fonction>' pour la documentation complète\n"
+        "\n"
+    )
+    out.flush()
+
+def format_lookup(name, definitions, base_dir, output_format, man_dir):
+    """Met en forme la définition principale d'une fonction (text, json ou tsv)."""
+    rel_path, category, func = definitions[0]
+    file_path = os.path.join(base_dir, rel_path)
+
+    if output_format == "json":
+        return json.dumps({
+            "name": name,
+            "file": file_path,
+            "line": func.line,
+            "category": category,
+            "desc": func.desc,
+            "usage": func.usage,
+            "examples": list(func.examples),
+            "others": [{"file": os.path.join(base_dir, d[0]), "line": d[2].line} for d in definitions[1:]],
+        }, ensure_ascii=False)
+
+    if output_format == "tsv":
+        # nom, fichier, ligne, catégorie, desc, usage, puis un champ par exemple
+        fields = [name, file_path, str(func.line), category, func.desc, func.usage]
+        fields.extend(func.examples)
+        return "\t".join(field.replace("\t", " ") for field in fields)
+
+    lines = [
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+        f"📖 AIDE: {name}",
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+        "",
     ]
-    
-    # Mapper les noms d'affichage
-    display_names = {
-        "gestionnaires": "🎛️  GESTIONNAIRES (Managers)",
-        "misc/system": "💻 SYSTÈME (System)",
-        "misc/clipboard": "📋 PRESSE-PAPIER (Clipboard)",
-        "misc/files": "📁 FICHIERS (Files)",
-        "misc/backup": "💾 SAUVEGARDE (Backup)",
-        "misc/security": "🔒 SÉCURITÉ (Security)",
-        "dev/go": "🐹 GO (Go Language)",
-        "dev/docker": "🐳 DOCKER (Docker)",
-        "dev/c": "⚙️  C/C++ (C/C++)",
-        "dev/make": "🔨 MAKE (Make)",
-        "dev/projects": "📦 PROJETS (Projects)",
-        "cyber/reconnaissance": "🛡️  CYBER / RECONNAISSANCE",
-        "cyber/scanning": "🛡️  CYBER / SCANNING",
-        "cyber/vulnerability": "🛡️  CYBER / VULNERABILITY",
-        "cyber/attacks": "🛡️  CYBER / ATTACKS",
-        "cyber/analysis": "🛡️  CYBER / ANALYSIS",
-        "cyber/privacy": "🛡️  CYBER / PRIVACY",
-        "git": "🔀 GIT (Git)",
-        "utils": "🛠️  UTILITAIRES (Utils)"
-    }
-    
-    # Forcer le flush pour un affichage immédiat
-    import sys
-    sys.stdout.reconfigure(line_buffering=True) if hasattr(sys.stdout, 'reconfigure') else None
-    
-    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", flush=True)
-    print("📋 FONCTIONS DISPONIBLES (organisées par catégories)", flush=True)
-    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", flush=True)
-    print(flush=True)
-    
-    # Afficher les catégories dans l'ordre défini
-    displayed_cats = set()
-    for cat in category_order:
-        # Vérifier que la catégorie existe ET a des fonctions
-        if cat in categories and len(categories[cat]) > 0:
-            displayed_cats.add(cat)
-            display_name = display_names.get(cat, f"📂 {cat.replace('/', ' / ').upper()}")
-            
-            # Afficher l'en-tête de catégorie
-            print(display_name, flush=True)
-            print("──────────────────────────────────────────────────────────────────────────", flush=True)
-            
-            # Afficher TOUTES les fonctions de cette catégorie immédiatement
-            for func_name, desc in categories[cat]:
-                short_desc = truncate_desc(desc, desc_max_width) if desc else ""
-                if short_desc:
-                    print(f"  • {func_name:<30} - {short_desc}", flush=True)
-                else:
-                    print(f"  • {func_name:<30}", flush=True)
-            
-            # Ligne vide après chaque catégorie
-            print(flush=True)
-    
-    # Afficher les catégories restantes
-    for cat in sorted(categories.keys()):
-        if cat not in displayed_cats and len(categories[cat]) > 0:
-            display_name = f"📂 {cat.replace('/', ' / ').upper()}"
-            print(display_name, flush=True)
-            print("──────────────────────────────────────────────────────────────────────────", flush=True)
-            
-            for func_name, desc in categories[cat]:
-                short_desc = truncate_desc(desc, desc_max_width) if desc else ""
-                if short_desc:
-                    print(f"  • {func_name:<30} - {short_desc}", flush=True)
-                else:
-                    print(f"  • {func_name:<30}", flush=True)
-            
-            print(flush=True)
-    
-    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━", flush=True)
-    print(flush=True)
-    print("💡 Utilisez 'help <nom_fonction>' pour obtenir l'aide détaillée", flush=True)
-    print("💡 Utilisez 'man <nom_fonction>' pour la documentation complète", flush=True)
-    print(flush=True)
+    if func.desc:
+        lines += ["📝 Description:", f"   {func.desc}", ""]
+    if func.usage:
+        lines += ["💻 Usage:", f"   {func.usage}", ""]
+    if func.examples:
+        lines.append("📚 Exemples:")
+        lines += [f"   {example}" for example in func.examples]
+        lines.append("")
+    if man_dir and os.path.isfile(os.path.join(man_dir, f"{name}.md")):
+        lines += [f"📄 Documentation complète disponible via: man {name}", ""]
+    lines.append(f"📁 Défini dans: {rel_path}:{func.line}")
+    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    return "\n".join(lines)
+
+def run(argv, loader=load):
+    """
+    Exécute une commande list_functions (argv sans le nom du script) ; renvoie le code de sortie.
+
+    loader(funcs_dir, roots) fournit le Catalog : chargement ponctuel par défaut,
+    catalogue résident pour helpman_server.py.
+    """
+    # Mode « lookup NOM » : aide d'une fonction précise (utilisé par show_function_help)
+    if argv and argv[0] == "lookup":
+        return run_lookup(argv[1:], loader)
+
+    parser = argparse.ArgumentParser(prog="list_functions.py",
+                                     description="Liste et recherche des fonctions shell documentées")
+    parser.add_argument("funcs_dir", nargs="?", help="seul répertoire à indexer (défaut: racines par défaut, voir HELPMAN_ROOTS)")
+    parser.add_argument("--root", action="append", metavar="DIR", help="racine à indexer (répétable, remplace les racines par défaut)")
+    parser.add_argument("--search", metavar="TERME", help="rechercher une fonction (nom, description, catégorie)")
+    parser.add_argument("--limit", type=int, default=50, help="nombre maximal de résultats de recherche (défaut: 50)")
+    parser.add_argument("--duplicates", action="store_true", help="lister les fonctions définies plusieurs fois")
+    args = parser.parse_args(argv)
+
+    catalog = loader(args.funcs_dir, args.root)
+    if args.duplicates:
+        print_duplicates(catalog.index)
+    elif args.search is not None:
+        print_search(catalog, args.search, args.limit, get_desc_max_width())
+    else:
+        print_catalog(catalog.definitions, get_desc_max_width())
+    return 0
+
+def run_lookup(argv, loader=load):
+    parser = argparse.ArgumentParser(prog="list_functions.py lookup",
+                                     description="Affiche l'aide d'une fonction depuis l'index")
+    parser.add_argument("name", help="nom de la fonction")
+    parser.add_argument("funcs_dir", nargs="?", help="seul répertoire à indexer (défaut: racines par défaut, voir HELPMAN_ROOTS)")
+    parser.add_argument("--root", action="append", metavar="DIR", help="racine à indexer (répétable, remplace les racines par défaut)")
+    parser.add_argument("--format", choices=("text", "json", "tsv"), default="text", help="format de sortie (défaut: text)")
+    parser.add_argument("--man-dir", help="répertoire des pages man Markdown (défaut: $DOTFILES_DIR/docs/man)")
+    args = parser.parse_args(argv)
+
+    catalog = loader(args.funcs_dir, args.root)
+    definitions = catalog.name_index.get(args.name)
+    if not definitions:
+        # Code de retour seul : le message d'erreur reste côté shell
+        return 1
+
+    man_dir = args.man_dir
+    if man_dir is None:
+        man_dir = os.path.join(get_dotfiles_dir(), "docs", "man")
+    print(format_lookup(args.name, definitions, catalog.base_dir, args.format, man_dir))
+    return 0
+
+def main():
+    # Pager quitté avant la fin (less, head) : sortie silencieuse, sans trace
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    # Sortie tamponnée par blocs même vers un terminal (vidée par print_catalog)
+    sys.stdout.reconfigure(line_buffering=False)
+    code = run(sys.argv[1:])
+    sys.stdout.flush()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()
-
@@ -3,96 +3,544 @@
 """
 Visualiseur Markdown simple avec support UTF-8 et couleurs basiques
 Utilisé comme fallback si aucun autre outil n'est disponible
+
+Le fichier est lu et rendu ligne par ligne (générateurs) : la mémoire reste
+constante et la première ligne sort immédiatement, même pour un gros
+document. La sortie s'arrête dès que le pager (less) ferme le tube.
+
+Éléments rendus : titres 1 à 6, listes (puces, numérotées, cases à cocher),
+citations, séparateurs, blocs de code, tableaux alignés sur la largeur du
+terminal ; en ligne : code, liens, gras, italique, barré (imbriqués compris).
+
+Les pages rendues sont mises en cache (voir render_cache.py) : un second
+affichage du même fichier est une simple copie.
+
+Usage: markdown_viewer.py [--no-cache] <file.md>
+       markdown_viewer.py --section <titre|#ancre> | --toc <file.md>   # voir heading_index.py
+       markdown_viewer.py --clear-cache | --stats
+       markdown_viewer.py --build [--jobs N] [--force]   # voir page_builder.py
 """
+import argparse
+import contextlib
+import hashlib
 import sys
 import os
 import re
+import shutil
+import unicodedata
+
+from function_index import cache_enabled
+from render_cache import RenderCache
+
+# Codes ANSI pour les couleurs
+HEADER = '\033[1;36m'  # Cyan bold
+TITLE = '\033[1;33m'    # Yellow bold
+SUBTITLE = '\033[1;35m' # Magenta bold
+BOLD = '\033[1m'        # Bold
+CODE = '\033[0;32m'     # Green
+ITALIC = '\033[3m'      # Italic
+LINK = '\033[4;34m'     # Blue underline
+STRIKE = '\033[9m'      # Strikethrough
+DIM = '\033[2m'         # Dim
+RESET = '\033[0m'       # Reset
+
+# Titres de niveau 1 à 6
+HEADING_STYLES = (HEADER, TITLE, SUBTITLE, BOLD, '\033[1;34m', BOLD + ITALIC)
+
+# Incrémenter à chaque changement du rendu (invalide le cache)
+RENDER_VERSION = 2
+# Thème : version du rendu + palette, partie de la clé du cache
+THEME = hashlib.sha1("\0".join(
+    (str(RENDER_VERSION), CODE, ITALIC, LINK, STRIKE, DIM, RESET) + HEADING_STYLES
+).encode("utf-8")).hexdigest()[:12]
+
+# Éléments en ligne, reconnus en un seul balayage (l'ordre des alternatives
+# fixe la priorité : échappement, code, lien, gras, barré, italique). Le
+# préfixe (?=…) laisse le moteur sauter directement au prochain caractère
+# pouvant ouvrir un élément au lieu d'essayer chaque alternative à chaque position
+INLINE_RE = re.compile(r"""
+    (?=[\\`*_!\[~])
+    (?:
+    \\(?P<escaped>[\\`*_\[\]~#|])
+  | (?P<ticks>`+)(?P<code>.+?)(?P=ticks)
+  | !?\[(?P<link_text>[^\]]*)\]\((?P<link_url>[^)\s]*)(?:\s+"[^"]*")?\)
+  | \*\*(?P<strong>\S(?:.*?\S)?)\*\*
+  | (?<![A-Za-z0-9])__(?P<ustrong>\S(?:.*?\S)?)__(?![A-Za-z0-9])
+  | ~~(?P<strike>\S(?:.*?\S)?)~~
+  | \*(?P<em>[^\s*](?:[^*]*[^\s*])?)\*
+  | (?<![A-Za-z0-9])_(?P<uem>[^\s_](?:[^_]*[^\s_])?)_(?![A-Za-z0-9])
+    )
+""", re.X)
+# Une ligne sans aucun de ces caractères est rendue telle quelle
+INLINE_TRIGGER_RE = re.compile(r'[\\`*_\[~]')
+# Premiers caractères pouvant ouvrir un bloc (titre, liste, citation, tableau,
+# code, séparateur, indentation) : les autres lignes sans balisage en ligne
+# sont recopiées sans autre analyse
+BLOCK_FIRST_CHARS = frozenset(' \t#-*+>_|~`0123456789')
+EMPHASIS_STYLES = {"strong": BOLD, "ustrong": BOLD, "strike": STRIKE, "em": ITALIC, "uem": ITALIC}
+
+HEADING_RE = re.compile(r'(#{1,6}) ')
+LIST_RE = re.compile(r'(\s*)([-*+]|\d+[.)]) (?:\[([ xX])\] )?')
+QUOTE_RE = re.compile(r'\s*> ?')
+RULE_RE = re.compile(r' {0,3}([-*_])(?: *\1){2,} *$')
+TABLE_ALIGN_RE = re.compile(r':?-+:?$')
+TABLE_SPLIT_RE = re.compile(r'(?<!\\)\|')
+ANSI_RE = re.compile(r'\033\[[0-9;]*m')
+# Caractères pouvant ne pas occuper exactement une colonne (combinants, CJK, emoji…)
+WIDE_OR_COMBINING_RE = re.compile('[\u0300-\u036f\u1100-\U0010ffff]')
+
+def render_inline(text, base=''):
+    """
+    Rend les éléments en ligne d'un texte en séquences ANSI (un seul balayage).
+
+    base : séquence du style englobant, rétablie après chaque élément pour
+    que l'emphase imbriquée (« **gras _et italique_** ») reste correcte.
+    """
+    if not INLINE_TRIGGER_RE.search(text):
+        return text
+    out = []
+    pos = 0
+    for m in INLINE_RE.finditer(text):
+        out.append(text[pos:m.start()])
+        pos = m.end()
+        kind = m.lastgroup
+        style = EMPHASIS_STYLES.get(kind)
+        if style is not None:
+            inner = m.group(kind)
+            # Récursion seulement si le contenu contient lui-même du balisage
+            if INLINE_TRIGGER_RE.search(inner):
+                inner = render_inline(inner, base + style)
+            out.append(f"{style}{inner}{RESET}{base}")
+        elif kind == "escaped":
+            out.append(m.group("escaped"))
+        elif kind == "code":
+            out.append(f"{CODE}{m.group('code')}{RESET}{base}")
+        elif kind == "link_url":
+            label = m.group("link_text")
+            url = m.group("link_url")
+            out.append(f"{LINK}{render_inline(label, base + LINK)}{RESET}{base}")
+            # Seules les adresses externes sont affichées (ancres et liens
+            # relatifs n'apportent rien à l'écran)
+            if ('://' in url or url.startswith('mailto:')) and url != label:
+                out.append(f" {DIM}({url}){RESET}{base}")
+    out.append(text[pos:])
+    return ''.join(out)
+
+def char_width(char):
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+
+def display_width(text):
+    """Largeur à l'écran (caractères larges = 2 colonnes, combinants = 0)."""
+    # Latin, accents précomposés compris : un caractère = une colonne
+    special = WIDE_OR_COMBINING_RE.findall(text)
+    if not special:
+        return len(text)
+    return len(text) - len(special) + sum(map(char_width, special))
+
+def truncate_to_width(text, width):
+    if not WIDE_OR_COMBINING_RE.search(text):
+        # Un caractère = une colonne : simple découpage
+        return text if len(text) <= width else text[:max(0, width - 1)] + '…'
+    if display_width(text) <= width:
+        return text
+    out = []
+    used = 0
+    for char in text:
+        used += char_width(char)
+        if used > width - 1:
+            break
+        out.append(char)
+    return ''.join(out) + '…'
+
+def split_table_row(line):
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip() for cell in TABLE_SPLIT_RE.split(line)]
 
-def print_markdown_colored(file_path):
-    """Affiche un fichier Markdown avec coloration basique et support UTF-8"""
+def shrink_widths(widths, available, minimum=3):
+    """
+    Plafonne les colonnes les plus larges pour tenir dans available colonnes.
+
+    Même résultat qu'en retirant une colonne à la plus large (la première en
+    cas d'égalité) tant que le total dépasse, sans jamais descendre sous
+    minimum : les colonnes réduites finissent au plafond L ou L + 1, les
+    L + 1 étant les plus à droite.
+    """
+    if sum(widths) <= available or max(widths) <= minimum:
+        return widths
+    # Plus grand plafond qui tient (recherche dichotomique), au moins minimum
+    lo, hi = minimum, max(widths)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if sum(min(w, mid) for w in widths) <= available:
+            lo = mid
+        else:
+            hi = mid - 1
+    cap = lo
+    extra = available - sum(min(w, cap) for w in widths)
+    shrunk = [min(w, cap) for w in widths]
+    if extra > 0:
+        for col in [i for i, w in enumerate(widths) if w > cap][-extra:]:
+            shrunk[col] = cap + 1
+    return shrunk
+
+def render_table(rows, width):
+    """Aligne un tableau Markdown (liste de lignes brutes) sur la largeur du terminal."""
+    cells = [split_table_row(row) for row in rows]
+    aligns = []
+    if len(cells) > 1 and all(TABLE_ALIGN_RE.match(c) for c in cells[1] if c):
+        for c in cells[1]:
+            if c.startswith(':') and c.endswith(':'):
+                aligns.append('^')
+            elif c.endswith(':'):
+                aligns.append('>')
+            else:
+                aligns.append('<')
+        header = cells[0]
+        body = cells[2:]
+    else:
+        header = None
+        body = cells
+
+    ncols = max(len(row) for row in cells)
+    aligns += ['<'] * (ncols - len(aligns))
+    table = ([header] if header else []) + body
+    # (texte rendu, texte visible, largeur visible) par cellule
+    rendered = []
+    for i, row in enumerate(table):
+        base = BOLD if header and i == 0 else ''
+        line = []
+        for cell in row + [''] * (ncols - len(row)):
+            text = render_inline(cell, base)
+            plain = ANSI_RE.sub('', text) if text is not cell else cell
+            line.append((text, plain, display_width(plain)))
+        rendered.append(line)
+
+    widths = [max(row[col][2] for row in rendered) for col in range(ncols)]
+    widths = shrink_widths(widths, width - 2 - 3 * (ncols - 1))
+
+    lines = []
+    for i, row in enumerate(rendered):
+        base = BOLD if header and i == 0 else ''
+        parts = []
+        for col, (text, plain, cell_width) in enumerate(row):
+            if cell_width > widths[col]:
+                # Cellule tronquée : le style en ligne est abandonné
+                text = truncate_to_width(plain, widths[col])
+                cell_width = display_width(text)
+            pad = widths[col] - cell_width
+            if aligns[col] == '>':
+                text = ' ' * pad + text
+            elif aligns[col] == '^':
+                text = ' ' * (pad // 2) + text + ' ' * (pad - pad // 2)
+            else:
+                text = text + ' ' * pad
+            parts.append(f"{base}{text}{RESET if base else ''}")
+        lines.append(('  ' + ' │ '.join(parts)).rstrip())
+        if header and i == 0:
+            lines.append('  ' + '─┼─'.join('─' * w for w in widths))
+    return lines
+
+# Lignes écrites avant le premier vidage explicite (premier écran du pager)
+FIRST_SCREEN_LINES = 60
+
+def decode_line(raw):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Codes ANSI pour les couleurs
-        HEADER = '\033[1;36m'  # Cyan bold
-        TITLE = '\033[1;33m'    # Yellow bold
-        SUBTITLE = '\033[1;35m' # Magenta bold
-        BOLD = '\033[1m'        # Bold
-        CODE = '\033[0;32m'     # Green
-        ITALIC = '\033[3m'      # Italic
-        RESET = '\033[0m'       # Reset
-        
-        lines = content.split('\n')
-        in_code = False
-        in_list = False
-        
-        for line in lines:
-            # Détection des blocs de code
-            if line.strip().startswith('```'):
-                in_code = not in_code
-                print(f"{CODE}{line}{RESET}")
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+def iter_lines(file_path):
+    """
+    Lit un fichier ligne par ligne et décode chaque ligne à la volée.
+
+    Stratégie d'encodage unique : UTF-8, puis latin-1 pour une ligne qui
+    n'est pas de l'UTF-8 valide (latin-1 décode toujours). Une fin de ligne
+    ne tombe jamais au milieu d'un caractère UTF-8 : le découpage sur b'\\n'
+    avant décodage est sûr.
+    """
+    last = b'\n'
+    with open(file_path, 'rb') as f:
+        for raw in f:
+            last = raw
+            if raw.endswith(b'\n'):
+                raw = raw[:-1]
+            yield decode_line(raw)
+    # Comme l'ancien content.split('\n') : ligne vide finale après un '\n'
+    if last.endswith(b'\n'):
+        yield ''
+
+def render_lines(lines, width=80):
+    """Colore un flux de lignes Markdown ; renvoie un générateur de lignes ANSI."""
+    fence = None
+    table = []
+
+    trigger = INLINE_TRIGGER_RE.search
+    for line in lines:
+        # Voie rapide : ligne ordinaire, ni bloc ni balisage en ligne
+        if fence is None:
+            if not table and line[:1] not in BLOCK_FIRST_CHARS and not trigger(line):
+                yield line
                 continue
-            
-            if in_code:
-                print(f"{CODE}{line}{RESET}")
+        elif fence not in line:
+            # Dans un bloc de code, seule une ligne contenant la clôture compte
+            yield f"{CODE}{line}{RESET}"
+            continue
+        stripped = line.strip()
+        # Un tableau est rendu d'un bloc, une fois sa dernière ligne lue
+        if fence is None and stripped[:1] == '|':
+            table.append(line)
+            continue
+        if table:
+            yield from render_table(table, width)
+            table = []
+
+        # Détection des blocs de code (``` ou ~~~)
+        if fence is None and stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+            yield f"{CODE}{line}{RESET}"
+            continue
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+            yield f"{CODE}{line}{RESET}"
+            continue
+
+        first = stripped[:1]
+        # Titres (niveaux 1 à 6)
+        if first == '#' and line[0] == '#':
+            m = HEADING_RE.match(line)
+            if m:
+                style = HEADING_STYLES[len(m.group(1)) - 1]
+                yield f"\n{style}{render_inline(line, style)}{RESET}"
                 continue
-            
-            # Titres
-            if line.startswith('# '):
-                print(f"\n{HEADER}{line}{RESET}")
-            elif line.startswith('## '):
-                print(f"\n{TITLE}{line}{RESET}")
-            elif line.startswith('### '):
-                print(f"\n{SUBTITLE}{line}{RESET}")
-            elif line.startswith('#### '):
-                print(f"\n{BOLD}{line}{RESET}")
-            # Listes
-            elif line.strip().startswith('- ') or line.strip().startswith('* '):
-                in_list = True
-                # Remplacer les puces par des caractères Unicode
-                line = re.sub(r'^(\s*)[-*] ', r'\1• ', line)
-                # Gras dans les listes
-                line = re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
-                print(f"  {line}")
-            # Code inline
-            elif '`' in line:
-                line = re.sub(r'`([^`]+)`', f'{CODE}\\1{RESET}', line)
-                # Gras
-                line = re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
-                print(line)
-            # Gras
-            elif '**' in line:
-                line = re.sub(r'\*\*(.*?)\*\*', f'{BOLD}\\1{RESET}', line)
-                print(line)
-            # Lignes vides
-            elif line.strip() == '':
-                if in_list:
-                    in_list = False
-                print()
-            else:
-                print(line)
-                
-    except UnicodeDecodeError:
-        # Essayer avec latin-1 si UTF-8 échoue
-        try:
-            with open(file_path, 'r', encoding='latin-1') as f:
-                print(f.read())
-        except:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                print(f.read())
-    except Exception as e:
-        # En cas d'erreur, afficher simplement avec UTF-8
+
+        # Séparateurs horizontaux
+        if first in ('-', '*', '_') and RULE_RE.match(line):
+            yield f"{DIM}{'─' * min(width - 2, 76)}{RESET}"
+            continue
+
+        # Listes (puces, numérotées, cases à cocher)
+        if first in ('-', '*', '+') or first.isdigit():
+            m = LIST_RE.match(line)
+            if m:
+                indent, marker, check = m.groups()
+                if not marker[0].isdigit():
+                    marker = '•'
+                if check is not None:
+                    marker += ' ☑' if check in 'xX' else ' ☐'
+                yield f"  {indent}{marker} {render_inline(line[m.end():])}"
+                continue
+
+        # Citations
+        if first == '>':
+            m = QUOTE_RE.match(line)
+            yield f"{DIM}│{RESET} {ITALIC}{render_inline(line[m.end():], ITALIC)}{RESET}"
+            continue
+
+        # Lignes vides
+        if not stripped:
+            yield ''
+        else:
+            yield render_inline(line)
+
+    if table:
+        yield from render_table(table, width)
+
+def print_markdown_colored(file_path, out=None, copy=None, width=None):
+    """
+    Affiche un fichier Markdown avec coloration basique et support UTF-8
+
+    copy : fichier binaire optionnel recevant la même sortie (encodée en UTF-8).
+    Une erreur d'écriture de la copie (cache plein…) l'abandonne sans
+    interrompre l'affichage.
+    width : largeur utilisée pour les tableaux (défaut: get_columns()).
+    Renvoie False si le fichier n'a pas pu être lu entièrement ou si la copie
+    est incomplète.
+    """
+    out = out or sys.stdout
+    write = out.write
+    copy_write = copy.write if copy is not None else None
+    copy_complete = True
+    if width is None:
+        width = get_columns()
+    try:
+        for count, line in enumerate(render_lines(iter_lines(file_path), width), 1):
+            write(line)
+            write('\n')
+            if copy_write is not None:
+                try:
+                    copy_write(line.encode('utf-8'))
+                    copy_write(b'\n')
+                except OSError:
+                    copy_write = None
+                    copy_complete = False
+            if count == FIRST_SCREEN_LINES:
+                out.flush()
+    except BrokenPipeError:
+        raise
+    except OSError as e:
+        print(f"❌ Erreur lors de la lecture du fichier: {e}")
+        return False
+    finally:
+        out.flush()
+    return copy_complete
+
+def get_columns():
+    """Largeur du terminal : COLUMNS, sinon stderr/stdin (stdout est souvent un tube vers less)."""
+    try:
+        return max(40, int(os.environ["COLUMNS"]))
+    except (KeyError, ValueError):
+        pass
+    for fd in (2, 0, 1):
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                print(f.read())
-        except:
-            print(f"❌ Erreur lors de la lecture du fichier: {e}")
+            return max(40, os.get_terminal_size(fd).columns)
+        except OSError:
+            continue
+    return 80
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
+def view(file_path, cache=None):
+    """Affiche file_path en passant par le cache des pages rendues (si fourni)."""
+    width = get_columns()
+    entry_path = cache.key_path(file_path, width, THEME) if cache else None
+    if entry_path is None:
+        print_markdown_colored(file_path, width=width)
+        return
+
+    cached = cache.open_entry(entry_path)
+    if cached is not None:
+        cache.record(hit=True)
+        with cached:
+            sys.stdout.flush()
+            # Copie brute : la couche texte de stdout est contournée
+            shutil.copyfileobj(cached, sys.stdout.buffer, 1 << 16)
+        sys.stdout.buffer.flush()
+        return
+
+    cache.record(hit=False)
+    try:
+        tmp_path, f = cache.create_temp()
+    except OSError:
+        # Cache non inscriptible (HOME en lecture seule…) : rendu direct
+        print_markdown_colored(file_path, width=width)
+        return
+    try:
+        complete = print_markdown_colored(file_path, copy=f, width=width)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            f.close()
+        cache.discard(tmp_path)
+        raise
+    try:
+        f.close()
+    except OSError:
+        # Dernier bloc non écrit (cache plein) : entrée abandonnée
+        complete = False
+    if not complete:
+        cache.discard(tmp_path)
+        return
+    try:
+        cache.publish(tmp_path, entry_path)
+    except OSError:
+        # Entrée non publiée ; l'affichage a déjà eu lieu
+        pass
+
+def view_section(file_path, query):
+    """Affiche une seule section (titre ou ancre) ; renvoie le code de sortie."""
+    from heading_index import find_section, load_headings, read_section
+    try:
+        headings = load_headings(file_path)
+    except OSError as e:
+        print(f"❌ Erreur lors de la lecture du fichier: {e}")
+        return 1
+    heading = find_section(headings, query)
+    if heading is None:
+        print(f"❌ Section '{query}' introuvable (voir --toc)")
+        return 1
+    data = read_section(file_path, heading)
+    width = get_columns()
+    for line in render_lines(map(decode_line, data.rstrip(b'\n').split(b'\n')), width):
+        sys.stdout.write(line)
+        sys.stdout.write('\n')
+    sys.stdout.flush()
+    return 0
+
+def print_toc(file_path):
+    """Affiche la table des matières (index des titres), sans rendre le corps."""
+    from heading_index import load_headings
+    try:
+        headings = load_headings(file_path)
+    except OSError as e:
+        print(f"❌ Erreur lors de la lecture du fichier: {e}")
+        return 1
+    for h in headings:
+        style = HEADING_STYLES[h.level - 1]
+        sys.stdout.write(f"{'  ' * (h.level - 1)}{style}{h.title}{RESET}  {DIM}#{h.anchor} (l.{h.line}){RESET}\n")
+    sys.stdout.flush()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(prog="markdown_viewer.py",
+                                     description="Affiche un fichier Markdown en couleurs (fallback helpman)")
+    parser.add_argument("file", nargs="?", help="fichier Markdown à afficher")
+    parser.add_argument("--no-cache", action="store_true", help="ne pas utiliser le cache des pages rendues")
+    parser.add_argument("--clear-cache", action="store_true", help="vider le cache des pages rendues")
+    parser.add_argument("--stats", action="store_true", help="afficher les compteurs du cache (hits/misses)")
+    parser.add_argument("--section", metavar="TITRE", help="n'afficher qu'une section (titre ou #ancre)")
+    parser.add_argument("--toc", action="store_true", help="afficher la table des matières du fichier")
+    parser.add_argument("--build", action="store_true", help="pré-rendre docs/man (ANSI + roff)")
+    parser.add_argument("--docs-dir", help="répertoire docs/ pour --build (défaut: $DOTFILES_DIR/docs)")
+    parser.add_argument("--jobs", type=int, help="processus pour --build (défaut: nombre de cœurs)")
+    parser.add_argument("--force", action="store_true", help="avec --build : tout re-rendre")
+    args = parser.parse_args()
+
+    if args.build:
+        # Import local : le pré-rendu n'est pas sur le chemin interactif
+        from page_builder import build_pages, get_pages_dir
+        docs_dir = args.docs_dir or os.path.join(
+            os.environ.get("DOTFILES_DIR", os.path.expanduser("~/dotfiles")), "docs")
+        result = build_pages(docs_dir, jobs=args.jobs, force=args.force)
+        print(f"✅ Pages pré-rendues dans {get_pages_dir()} : {result['rendered']} rendues, "
+              f"{result['unchanged']} inchangées, {result['removed']} fichiers supprimés "
+              f"({result['seconds'] * 1000:.0f} ms)")
+        return 0
+
+    cache = RenderCache()
+    if args.clear_cache:
+        cache.clear()
+        print(f"✅ Cache des pages rendues vidé ({cache.cache_dir})")
+        if not args.file:
+            return 0
+    if args.stats:
+        stats = cache.stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = f"{100.0 * stats['hits'] / total:.1f}%" if total else "-"
+        print(f"📦 Cache des pages rendues : {stats['dir']}")
+        print(f"   hits: {stats['hits']}  misses: {stats['misses']}  taux: {ratio}")
+        print(f"   entrées: {stats['entries']}  taille: {stats['bytes']} / {stats['max_bytes']} octets")
+        return 0
+    if not args.file:
         print("Usage: python3 markdown_viewer.py <file.md>")
-        sys.exit(1)
-    
-    print_markdown_colored(sys.argv[1])
+        return 1
 
+    # Un seul flux UTF-8 tamponné par blocs, y compris vers un terminal
+    sys.stdout.reconfigure(encoding='utf-8', line_buffering=False)
+    use_cache = not args.no_cache and cache_enabled()
+    try:
+        if args.toc:
+            return print_toc(args.file)
+        if args.section:
+            return view_section(args.file, args.section)
+        view(args.file, cache if use_cache else None)
+    except BrokenPipeError:
+        # Pager quitté : arrêt immédiat et silencieux (rendu en cours abandonné)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pré-rendu des pages de documentation helpman (ANSI + roff)
+
+Rend docs/man/*.md à l'avance, une fois à l'installation (make
+prerender-man) : « man <fn> » (create_man_page dans help_system.sh) n'a
+plus qu'à afficher un fichier déjà prêt (man -l pour le roff, less -R /
+cat pour l'ANSI).
+
+Les pages sont rendues dans un pool de processus. manifest.json garde
+(mtime, taille) de chaque source : seules les pages modifiées sont
+re-rendues. Toute page sans source (supprimée, ou d'un ancien format) est
+effacée, même après --force. Un changement de thème, de version du rendu
+ou de largeur invalide toutes les pages.
+
+Sortie : $XDG_CACHE_HOME/dotfiles/helpman/pages (HELPMAN_PAGES_DIR)
+    ansi/man/extract.ansi     roff/man/extract.1
+"""
+import contextlib
+import glob
+import json
+import os
+import tempfile
+import time
+
+from function_index import get_cache_dir
+from markdown_viewer import (
+    ANSI_RE, HEADING_RE, INLINE_RE, INLINE_TRIGGER_RE, LIST_RE, QUOTE_RE, RULE_RE, THEME,
+    iter_lines, render_lines, render_table,
+)
+
+# Incrémenter à chaque changement du rendu roff ou du format du manifeste
+PAGES_VERSION = 2
+
+# Sources relatives à docs/, et section man associée (seules les pages lues
+# par create_man_page sont pré-rendues)
+PAGE_SOURCES = (("man/*.md", "1"),)
+
+# Largeur fixe des pages pré-rendues (tableaux), indépendante du terminal d'installation
+DEFAULT_WIDTH = 100
+
+ROFF_FONTS = {"": "R", "B": "B", "I": "I", "BI": "BI"}
+
+def get_pages_dir():
+    return os.environ.get("HELPMAN_PAGES_DIR") or os.path.join(get_cache_dir(), "pages")
+
+def roff_escape(text):
+    # « \- » : vrai signe moins (options copiables depuis la page man)
+    return text.replace('\\', '\\e').replace('-', '\\-')
+
+def _quoted(text):
+    return '"' + text.replace('"', '\\(dq') + '"'
+
+def _font(styles):
+    name = ROFF_FONTS["".join(sorted(set(styles), key="BI".index))]
+    return f"\\f({name}" if len(name) == 2 else f"\\f{name}"
+
+def render_inline_roff(text, styles=""):
+    """
+    Équivalent roff de markdown_viewer.render_inline (\\fB gras, \\fI italique).
+
+    styles : police englobante, rétablie après chaque élément. Elle n'est ni
+    ouverte ni refermée ici : voir roff_line pour une ligne complète.
+    """
+    if not INLINE_TRIGGER_RE.search(text):
+        return roff_escape(text)
+    out = []
+    pos = 0
+    base = _font(styles)
+    for m in INLINE_RE.finditer(text):
+        out.append(roff_escape(text[pos:m.start()]))
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "escaped":
+            out.append(roff_escape(m.group("escaped")))
+        elif kind == "code":
+            out.append(f"{_font(styles + 'B')}{roff_escape(m.group('code'))}{base}")
+        elif kind == "link_url":
+            out.append(render_inline_roff(m.group("link_text"), styles))
+            url = m.group("link_url")
+            if '://' in url or url.startswith('mailto:'):
+                out.append(f" <{roff_escape(url)}>")
+        elif kind == "strike":
+            # Pas de barré en roff : texte seul
+            out.append(render_inline_roff(m.group(kind), styles))
+        else:
+            style = "B" if kind in ("strong", "ustrong") else "I"
+            out.append(f"{_font(styles + style)}{render_inline_roff(m.group(kind), styles + style)}{base}")
+    out.append(roff_escape(text[pos:]))
+    return "".join(out)
+
+def roff_line(text, styles=""):
+    """Ligne complète dans la police styles : ouverte au début, \\fR à la fin."""
+    if not styles:
+        return render_inline_roff(text)
+    return f"{_font(styles)}{render_inline_roff(text, styles)}\\fR"
+
+def _request_safe(line):
+    # Une ligne commençant par '.' ou "'" serait lue comme une requête roff
+    return "\\&" + line if line[:1] in (".", "'") else line
+
+def render_roff_lines(lines, name, section="1"):
+    """Convertit un flux de lignes Markdown en page man (roff, macros an)."""
+    yield f'.TH "{name.upper()}" "{section}" "" "dotfiles" "helpman"'
+    fence = None
+    table = []
+    paragraph = False
+
+    for line in lines:
+        stripped = line.strip()
+        if fence is None and stripped.startswith('|'):
+            table.append(line)
+            continue
+        if table:
+            yield ".PP"
+            yield ".nf"
+            for row in render_table(table, DEFAULT_WIDTH):
+                yield _request_safe(roff_escape(ANSI_RE.sub('', row)))
+            yield ".fi"
+            table = []
+            paragraph = False
+
+        if fence is None and stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+            yield ".PP"
+            yield ".RS 4"
+            yield ".nf"
+            continue
+        if fence is not None:
+            if stripped.startswith(fence):
+                fence = None
+                yield ".fi"
+                yield ".RE"
+                paragraph = False
+            else:
+                yield _request_safe(roff_escape(line))
+            continue
+
+        if not stripped:
+            paragraph = False
+            continue
+
+        m = HEADING_RE.match(line)
+        if m:
+            level = len(m.group(1))
+            # Titres en gras (.SH/.SS le sont déjà) : le gras est rétabli après chaque élément
+            title = roff_line(line[m.end():].strip(), "B")
+            if level <= 2:
+                yield f'.SH {_quoted(title)}'
+            elif level == 3:
+                yield f'.SS {_quoted(title)}'
+            else:
+                yield ".PP"
+                yield _request_safe(title)
+            paragraph = level > 3
+            continue
+
+        if RULE_RE.match(line):
+            paragraph = False
+            continue
+
+        m = LIST_RE.match(line)
+        if m:
+            indent, marker, check = m.groups()
+            if check is not None:
+                marker = "[x]" if check in "xX" else "[ ]"
+            elif not marker[0].isdigit():
+                marker = "\\(bu"
+            yield f'.IP "{marker}" {4 + len(indent.expandtabs(4))}'
+            yield _request_safe(render_inline_roff(line[m.end():]))
+            paragraph = True
+            continue
+
+        m = QUOTE_RE.match(line)
+        if m:
+            yield ".RS 4"
+            yield _request_safe(roff_line(line[m.end():], "I"))
+            yield ".RE"
+            paragraph = False
+            continue
+
+        if not paragraph:
+            yield ".PP"
+            paragraph = True
+        yield _request_safe(render_inline_roff(stripped))
+
+    if table:
+        yield ".PP"
+        yield ".nf"
+        for row in render_table(table, DEFAULT_WIDTH):
+            yield _request_safe(roff_escape(ANSI_RE.sub('', row)))
+        yield ".fi"
+
+def iter_sources(docs_dir):
+    """(chemin relatif à docs/ sans extension, chemin source, section man)."""
+    for pattern, section in PAGE_SOURCES:
+        for path in sorted(glob.glob(os.path.join(docs_dir, pattern), recursive=True)):
+            rel = os.path.splitext(os.path.relpath(path, docs_dir))[0]
+            yield rel, path, section
+
+def page_paths(pages_dir, rel, section):
+    return (os.path.join(pages_dir, "ansi", rel + ".ansi"),
+            os.path.join(pages_dir, "roff", f"{rel}.{section}"))
+
+def _write_atomic(path, lines):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+                f.write("\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+def render_page(job):
+    """Rend une source en ANSI et en roff (exécuté dans un processus du pool)."""
+    rel, path, section, pages_dir, width = job
+    ansi_path, roff_path = page_paths(pages_dir, rel, section)
+    _write_atomic(ansi_path, render_lines(iter_lines(path), width))
+    _write_atomic(roff_path, render_roff_lines(iter_lines(path), os.path.basename(rel), section))
+    return rel
+
+def _load_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_pages(docs_dir, pages_dir=None, jobs=None, force=False, width=None):
+    """
+    Pré-rend les pages dont la source a changé ; renvoie un dict de compteurs
+    (rendered, unchanged, removed, seconds).
+    """
+    pages_dir = pages_dir or get_pages_dir()
+    width = width or DEFAULT_WIDTH
+    manifest_path = os.path.join(pages_dir, "manifest.json")
+    manifest = _load_manifest(manifest_path)
+    settings = {"version": PAGES_VERSION, "theme": THEME, "width": width}
+    known = manifest.get("pages", {}) if not force and manifest.get("settings") == settings else {}
+
+    start = time.perf_counter()
+    pages = {}
+    expected = set()
+    todo = []
+    for rel, path, section in iter_sources(docs_dir):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        pages[rel] = [st.st_mtime_ns, st.st_size]
+        paths = page_paths(pages_dir, rel, section)
+        expected.update(paths)
+        if known.get(rel) != pages[rel] or not all(map(os.path.exists, paths)):
+            todo.append((rel, path, section, pages_dir, width))
+
+    if len(todo) > 1 and (jobs is None or jobs > 1):
+        # Import local : inutile pour l'affichage d'une page
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(render_page, todo, chunksize=max(1, len(todo) // (4 * (jobs or os.cpu_count() or 1)))))
+    else:
+        for job in todo:
+            render_page(job)
+
+    # Pages orphelines : parcours du disque, le manifeste peut être absent,
+    # ignoré (--force, réglages changés) ou d'un ancien format
+    removed = 0
+    for kind in ("ansi", "roff"):
+        for dirpath, _dirnames, filenames in os.walk(os.path.join(pages_dir, kind)):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if path not in expected:
+                    with contextlib.suppress(OSError):
+                        os.unlink(path)
+                        removed += 1
+
+    os.makedirs(pages_dir, exist_ok=True)
+    _write_atomic(manifest_path, [json.dumps({"settings": settings, "pages": pages}, sort_keys=True)])
+    return {
+        "rendered": len(todo),
+        "unchanged": len(pages) - len(todo),
+        "removed": removed,
+        "seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache des pages rendues (sortie ANSI de markdown_viewer.py)
+
+Une page est stockée par clé (chemin, mtime, taille, COLUMNS, thème) dans
+$XDG_CACHE_HOME/dotfiles/helpman/render (défaut: ~/.cache). Un affichage
+déjà rendu se résume à une copie du fichier vers la sortie.
+
+Éviction LRU : chaque lecture rafraîchit le mtime de l'entrée ; au-delà de
+HELPMAN_RENDER_CACHE_MAX octets (défaut: 32 Mo), les entrées les plus
+anciennes sont supprimées.
+
+Les compteurs hits/misses sont gardés dans stats.json (--stats).
+"""
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from function_index import get_cache_dir
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Fichiers temporaires abandonnés (rendu interrompu) supprimés après ce délai
+STALE_TMP_SECONDS = 600
+
+ENTRY_SUFFIX = ".ansi"
+TMP_PREFIX = ".tmp-"
+
+def get_render_cache_dir():
+    return os.path.join(get_cache_dir(), "render")
+
+def get_max_bytes():
+    try:
+        return int(os.environ.get("HELPMAN_RENDER_CACHE_MAX", DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+class RenderCache:
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or get_render_cache_dir()
+        self.max_bytes = get_max_bytes() if max_bytes is None else max_bytes
+        self.stats_path = os.path.join(self.cache_dir, "stats.json")
+
+    def key_path(self, file_path, columns, theme):
+        """Chemin de l'entrée pour l'état actuel du fichier ; None si le fichier est illisible."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = "\0".join((os.path.abspath(file_path), str(st.st_mtime_ns), str(st.st_size),
+                         str(columns), theme))
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name + ENTRY_SUFFIX)
+
+    def open_entry(self, entry_path):
+        """Ouvre une entrée en lecture (et la marque comme récente) ; None si absente."""
+        try:
+            f = open(entry_path, "rb")
+        except OSError:
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(entry_path)
+        return f
+
+    def create_temp(self):
+        """
+        Ouvre un fichier binaire temporaire dans le cache ; renvoie (chemin, fichier).
+
+        Lève OSError si le cache n'est pas inscriptible (HOME en lecture seule…).
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=TMP_PREFIX)
+        return tmp_path, os.fdopen(fd, "wb")
+
+    def publish(self, tmp_path, entry_path):
+        """Publie atomiquement un fichier de create_temp (fermé) sous entry_path."""
+        try:
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            self.discard(tmp_path)
+            raise
+        self.evict()
+
+    def discard(self, tmp_path):
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+
+    def _entries(self):
+        entries = []
+        try:
+            scan = os.scandir(self.cache_dir)
+        except OSError:
+            return entries
+        now = time.time()
+        with scan:
+            for entry in scan:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                elif entry.name.startswith(TMP_PREFIX) and now - st.st_mtime > STALE_TMP_SECONDS:
+                    with contextlib.suppress(OSError):
+                        os.unlink(entry.path)
+        return entries
+
+    def evict(self):
+        """Supprime les entrées les moins récemment lues au-delà de max_bytes."""
+        entries = self._entries()
+        total = sum(size for _mtime, size, _path in entries)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _load_stats(self):
+        try:
+            with open(self.stats_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+        return {"hits": int(data.get("hits", 0)), "misses": int(data.get("misses", 0))}
+
+    def record(self, hit):
+        """Incrémente le compteur hits ou misses (au mieux : une écriture concurrente peut se perdre)."""
+        stats = self._load_stats()
+        stats["hits" if hit else "misses"] += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=TMP_PREFIX)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(stats, f)
+            os.replace(tmp_path, self.stats_path)
+        except OSError:
+            pass
+
+    def stats(self):
+        stats = self._load_stats()
+        entries = self._entries()
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(size for _mtime, size, _path in entries)
+        stats["max_bytes"] = self.max_bytes
+        stats["dir"] = self.cache_dir
+        return stats